@@ -0,0 +1,143 @@
+# Local HTTP stand-in for every enabled source: the RemoteOK, Remotive and Arbeitnow
+# APIs, Greenhouse boards, Lever postings, the three RSS feeds and the job pages they link
+# to, all served from one threaded server on 127.0.0.1. Adapters are pointed at it with
+# the "base_url" source option (sources_config()). Latency, payload size (via the corpus'
+# description size) and injected errors are configurable.
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from benchmarks import synthetic
+
+BOARDS = ["acme", "globex"]
+COMPANIES = ["initech", "umbrella"]
+CRAIGSLIST_CATEGORY = "sof"
+
+
+@dataclass(slots=True)
+class StandInOptions:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # share of requests answered with error_status instead
+    error_rate: float = 0.0
+    error_status: int = 503
+    retry_after: int | None = None
+    seed: int = 0
+
+
+# (source key, path, renderer, content type); the corpus is dealt round-robin over these feeds
+FEEDS: list[tuple[str, str, Callable[[list[dict], str], bytes], str]] = [
+    ("remoteok_api", "/api", synthetic.remoteok_body, "application/json"),
+    ("remotive_api", "/api/remote-jobs", synthetic.remotive_body, "application/json"),
+    ("arbeitnow_api", "/api/job-board-api", synthetic.arbeitnow_body, "application/json"),
+    *[("greenhouse_api", f"/v1/boards/{b}/jobs", synthetic.greenhouse_body, "application/json") for b in BOARDS],
+    *[("lever_api", f"/v0/postings/{c}", synthetic.lever_body, "application/json") for c in COMPANIES],
+    ("weworkremotely_rss", "/categories/remote-programming-jobs.rss", synthetic.rss_body, "application/rss+xml"),
+    ("remoteok_rss", "/remote-dev-jobs.rss", synthetic.rss_body, "application/rss+xml"),
+    ("craigslist_rss", f"/search/{CRAIGSLIST_CATEGORY}", synthetic.rss_body, "application/rss+xml"),
+]
+
+
+class StandIn:
+    def __init__(self, items: list[dict], options: StandInOptions | None = None, host: str = "127.0.0.1") -> None:
+        self.items = items
+        self.options = options or StandInOptions()
+        self.host = host
+        self.routes: dict[str, tuple[bytes, str]] = {}
+        self.pages = {item["path"].split("?")[0]: item for item in items}
+        self.served: Counter[str] = Counter()
+        self._rng = random.Random(self.options.seed)
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "start() first"
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def feed_items(self, index: int) -> list[dict]:
+        return self.items[index :: len(FEEDS)]
+
+    def sources_config(self) -> dict[str, dict[str, Any]]:
+        base = self.base_url
+        cfg: dict[str, dict[str, Any]] = {key: {"enabled": True, "base_url": base} for key, *_ in FEEDS}
+        cfg["greenhouse_api"]["boards"] = list(BOARDS)
+        cfg["lever_api"]["companies"] = list(COMPANIES)
+        cfg["craigslist_rss"].update(city="bench", category=CRAIGSLIST_CATEGORY)
+        return cfg
+
+    def start(self) -> "StandIn":
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                stand_in.handle(self)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, 0), Handler)
+        self._server.daemon_threads = True
+        for i, (_, path, render, content_type) in enumerate(FEEDS):
+            self.routes[path] = (render(self.feed_items(i), self.base_url), content_type)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StandIn":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _delay_and_fault(self) -> bool:
+        opts = self.options
+        with self._lock:
+            delay = opts.latency_ms + (self._rng.uniform(0, opts.jitter_ms) if opts.jitter_ms else 0.0)
+            fault = opts.error_rate > 0 and self._rng.random() < opts.error_rate
+        if delay:
+            time.sleep(delay / 1000)
+        return fault
+
+    def handle(self, request: BaseHTTPRequestHandler) -> None:
+        path = request.path.split("?")[0]
+        fault = self._delay_and_fault()
+        with self._lock:
+            self.served["error" if fault else "ok"] += 1
+        if fault:
+            headers = {"Retry-After": str(self.options.retry_after)} if self.options.retry_after is not None else {}
+            return self._send(request, self.options.error_status, b"unavailable", "text/plain", headers)
+        if path in self.routes:
+            body, content_type = self.routes[path]
+            return self._send(request, 200, body, content_type)
+        item = self.pages.get(path)
+        if item is not None:
+            return self._send(request, 200, synthetic.job_page(item).encode("utf-8"), "text/html; charset=utf-8")
+        self._send(request, 404, b"not found", "text/plain")
+
+    @staticmethod
+    def _send(
+        request: BaseHTTPRequestHandler, status: int, body: bytes, content_type: str, headers: dict[str, str] | None = None
+    ) -> None:
+        request.send_response(status)
+        request.send_header("Content-Type", content_type)
+        request.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(body)
@@ -0,0 +1,59 @@
+# CLI start-up benchmark: python benchmarks/startup.py [runs] [--budget-ms 400]
+# Starts a fresh interpreter per run with -X importtime and reports the cumulative import
+# time of jobpipeline.core.cli and the modules that cost the most on their own. With a
+# budget the exit status is 1 when the median import time exceeds it.
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+TARGET = "jobpipeline.core.cli"
+
+
+def import_profile(module: str = TARGET) -> dict[str, tuple[int, int]]:
+    # module -> (self us, cumulative us) from one cold interpreter
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        rows[name] = (int(own), int(cumulative))
+    return rows
+
+
+def main(runs: int = 10, budget_ms: float | None = None) -> int:
+    totals: list[float] = []
+    own: dict[str, list[int]] = defaultdict(list)
+    for _ in range(runs):
+        rows = import_profile()
+        totals.append(rows[TARGET][1] / 1000)
+        for name, (self_us, _) in rows.items():
+            own[name].append(self_us)
+    median = statistics.median(totals)
+    print(f"{TARGET}: median {median:.1f} ms, min {min(totals):.1f} ms over {runs} runs")
+    print("largest self times (median ms):")
+    ranked = sorted(own.items(), key=lambda kv: -statistics.median(kv[1]))
+    for name, samples in ranked[:15]:
+        print(f"  {statistics.median(samples) / 1000:7.2f}  {name}")
+    if budget_ms is not None and median > budget_ms:
+        print(f"over budget: {median:.1f} ms > {budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="benchmarks/startup.py")
+    parser.add_argument("runs", nargs="?", type=int, default=10)
+    # the CLI imported in ~360 ms before heavy imports were deferred
+    parser.add_argument("--budget-ms", type=float, help="fail when the median import time exceeds this")
+    args = parser.parse_args()
+    sys.exit(main(args.runs, args.budget_ms))
@@ -0,0 +1,282 @@
+# Benchmark suite: python benchmarks/suite.py [--sizes 1000,10000,100000] [--out results.json]
+#                                            [--baseline baseline.json] [--tolerance 0.25]
+# Times the hot paths on synthetic corpora: source search against the local stand-in,
+# page parsing, dedupe, scoring, SQLite upserts, the Excel sync and a full pipeline run.
+# Results are written as JSON; given a baseline (an earlier results file) every case that
+# got slower by more than the tolerance is reported and the exit status is 1.
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks import synthetic  # noqa: E402
+from benchmarks.standin import StandIn, StandInOptions  # noqa: E402
+from jobpipeline.core.models import SearchProfile  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+# the end-to-end run fetches one page per job from the stand-in; beyond this it only measures the server
+PIPELINE_MAX_SIZE = 10_000
+# corpus of the untimed warm-up pass
+WARMUP_SIZE = 50
+# differences below this are timer noise, whatever the ratio
+NOISE_FLOOR_SECONDS = 0.005
+BENCH_COLLECTOR = {
+    "retries": 2,
+    "backoff_seconds": 0.05,
+    "throttle_seconds": 0,
+    "timeout_seconds": 60,
+    "source_deadline_seconds": 600,
+    "max_concurrency": 16,
+    "per_domain_concurrency": 16,
+    "fetch_details": True,
+    "detail_workers": 16,
+}
+
+
+def bench_profile() -> SearchProfile:
+    return SearchProfile(
+        name="Bench",
+        target_titles=["Network Engineer", "NOC Engineer"],
+        adjacent_titles=["Systems Engineer", "Infrastructure Engineer"],
+        location_mode="USA",
+        city=None,
+        radius_km=None,
+        experience_range="1-3",
+        must_have_keywords=["tcp/ip", "routing switching", "ad"],
+        nice_to_have_keywords=["firewall", "palo alto", "vpn"],
+        exclude_keywords=["principal"],
+        time_window_hours=24,
+    )
+
+
+class Corpus:
+    def __init__(self, size: int, seed: int, description_size: int, options: StandInOptions) -> None:
+        self.size = size
+        self.items = synthetic.postings(size, seed, description_size)
+        self.options = options
+
+    def records(self) -> list:
+        # fresh objects every time: dedupe and scoring change them in place
+        return synthetic.job_records(self.items)
+
+    def stand_in(self) -> StandIn:
+        return StandIn(self.items, self.options)
+
+
+Case = Callable[[Corpus, Path], ContextManager[Callable[[], Any]]]
+
+
+@contextmanager
+def source_search(corpus: Corpus, tmp: Path) -> Iterator[Callable[[], Any]]:
+    from jobpipeline.sources.manager import SourceManager
+
+    with corpus.stand_in() as server:
+        manager = SourceManager({"sources": server.sources_config(), "collector": BENCH_COLLECTOR})
+        try:
+            yield lambda: manager.search(bench_profile())
+        finally:
+            manager.transport.close()
+
+
+@contextmanager
+def parse_job_html(corpus: Corpus, tmp: Path) -> Iterator[Callable[[], Any]]:
+    from jobpipeline.collectors.parser import parse_job_html
+
+    pages = [synthetic.job_page(item) for item in corpus.items]
+    yield lambda: [parse_job_html(page) for page in pages]
+
+
+@contextmanager
+def dedupe_jobs(corpus: Corpus, tmp: Path) -> Iterator[Callable[[], Any]]:
+    from jobpipeline.dedupe.engine import NearDuplicateIndex, dedupe_jobs
+
+    records = corpus.records()
+    yield lambda: dedupe_jobs(records, NearDuplicateIndex())
+
+
+@contextmanager
+def score_job(corpus: Corpus, tmp: Path) -> Iterator[Callable[[], Any]]:
+    from jobpipeline.scoring.engine import score_job
+
+    records, profile = corpus.records(), bench_profile()
+    yield lambda: [score_job(record, profile) for record in records]
+
+
+@contextmanager
+def upsert_job(corpus: Corpus, tmp: Path) -> Iterator[Callable[[], Any]]:
+    from jobpipeline.storage.sqlite_repo import SQLiteRepo
+
+    repo, records = SQLiteRepo(str(tmp / "upsert.sqlite")), corpus.records()
+    try:
+        yield lambda: [repo.upsert_job(record) for record in records]
+    finally:
+        repo.close()
+
+
+@contextmanager
+def upsert_jobs(corpus: Corpus, tmp: Path) -> Iterator[Callable[[], Any]]:
+    from jobpipeline.storage.sqlite_repo import SQLiteRepo
+
+    repo, records = SQLiteRepo(str(tmp / "upsert_batch.sqlite")), corpus.records()
+    try:
+        yield lambda: repo.upsert_jobs(records)
+    finally:
+        repo.close()
+
+
+@contextmanager
+def sync_excel(corpus: Corpus, tmp: Path) -> Iterator[Callable[[], Any]]:
+    from jobpipeline.export.excel_sync import sync_excel
+
+    records = corpus.records()
+    yield lambda: sync_excel(str(tmp / "tracker.xlsx"), records)
+
+
+@contextmanager
+def pipeline(corpus: Corpus, tmp: Path) -> Iterator[Callable[[], Any]]:
+    from jobpipeline.core.pipeline import PipelineService
+
+    with corpus.stand_in() as server:
+        service = PipelineService({
+            # anything derived from output_dir stays in the case's temp dir
+            "output_dir": str(tmp),
+            "storage": {"sqlite_path": str(tmp / "pipeline.sqlite")},
+            "excel_path": str(tmp / "pipeline.xlsx"),
+            "sources": server.sources_config(),
+            "collector": BENCH_COLLECTOR,
+            "dedupe": {"near_duplicates": True},
+        })
+        try:
+            yield lambda: service.run_profiles([bench_profile()])
+        finally:
+            service.repo.close()
+            service.close()
+
+
+CASES: dict[str, Case] = {
+    "source_search": source_search,
+    "parse_job_html": parse_job_html,
+    "dedupe_jobs": dedupe_jobs,
+    "score_job": score_job,
+    "upsert_job": upsert_job,
+    "upsert_jobs": upsert_jobs,
+    "sync_excel": sync_excel,
+    "pipeline": pipeline,
+}
+MAX_SIZE = {"pipeline": PIPELINE_MAX_SIZE}
+
+
+def run_case(case: Case, corpus: Corpus, repeat: int) -> list[float]:
+    # setup and teardown are outside the timing; every repeat starts from a fresh directory
+    runs: list[float] = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="jobpipeline-bench-") as tmp:
+            with case(corpus, Path(tmp)) as work:
+                start = time.perf_counter()
+                work()
+                runs.append(time.perf_counter() - start)
+    return runs
+
+
+def run_suite(
+    sizes: list[int], cases: list[str], repeat: int = 3, seed: int = 0, description_size: int = 1200,
+    options: StandInOptions | None = None, log: Callable[[str], None] = print,
+) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    # imports and first-call caches would otherwise be billed to the first size
+    warmup = Corpus(WARMUP_SIZE, seed, description_size, options or StandInOptions())
+    for name in cases:
+        run_case(CASES[name], warmup, 1)
+    for size in sizes:
+        corpus = Corpus(size, seed, description_size, options or StandInOptions())
+        for name in cases:
+            if size > MAX_SIZE.get(name, size):
+                log(f"{name:>15} {size:>7}  skipped (max {MAX_SIZE[name]})")
+                continue
+            runs = run_case(CASES[name], corpus, repeat)
+            median = statistics.median(runs)
+            results.append({
+                "case": name, "size": size, "runs": runs, "median_s": median, "min_s": min(runs),
+                "items_per_s": size / median if median else None,
+            })
+            log(f"{name:>15} {size:>7}  median {median:8.3f}s  min {min(runs):8.3f}s  {size / median:10.0f} items/s")
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "seed": seed,
+            "description_size": description_size,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.25) -> list[dict[str, Any]]:
+    # one row per case and size present in both files; "regression" when the median grew
+    # by more than the tolerance and by more than the noise floor
+    before = {(r["case"], r["size"]): r["median_s"] for r in baseline.get("results", [])}
+    rows: list[dict[str, Any]] = []
+    for r in current.get("results", []):
+        base = before.get((r["case"], r["size"]))
+        if base is None:
+            continue
+        ratio = r["median_s"] / base if base else float("inf")
+        regressed = ratio > 1 + tolerance and r["median_s"] - base > NOISE_FLOOR_SECONDS
+        rows.append({"case": r["case"], "size": r["size"], "baseline_s": base, "median_s": r["median_s"],
+                     "ratio": ratio, "regression": regressed})
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks/suite.py")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated corpus sizes")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"comma-separated subset of {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--description-size", type=int, default=1200, help="characters per job description")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stand-in latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra random latency, 0..N ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of stand-in requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=int, help="Retry-After seconds sent with injected errors")
+    parser.add_argument("--out", default="benchmark-results.json", help="where to write the results")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a case counts as regressed")
+    args = parser.parse_args(argv)
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown case {', '.join(unknown)}")
+    options = StandInOptions(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, args.retry_after, args.seed)
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    current = run_suite(sizes, cases, args.repeat, args.seed, args.description_size, options)
+    current["meta"]["stand_in"] = {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate}
+    Path(args.out).write_text(json.dumps(current, indent=2), encoding="utf-8")
+    print(f"results written to {args.out}")
+    if not args.baseline:
+        return 0
+    rows = compare(current, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.tolerance)
+    for row in rows:
+        mark = "REGRESSION" if row["regression"] else ""
+        print(f"{row['case']:>15} {row['size']:>7}  {row['baseline_s']:8.3f}s -> {row['median_s']:8.3f}s  x{row['ratio']:.2f} {mark}")
+    regressions = [row for row in rows if row["regression"]]
+    print(f"{len(regressions)} regressions out of {len(rows)} compared cases (tolerance {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# Synthetic job corpora for the benchmarks: postings with realistic titles, companies,
+# descriptions and posting times, plus a share of reposts (near-duplicate text under a
+# new URL) and tracking-parameter copies (the same canonical URL), so dedupe and scoring
+# see the kind of input the real sources produce. Everything is seeded and reproducible.
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+
+from jobpipeline.core.models import JobLink, JobRecord
+
+ROLES = [
+    "Network Engineer", "NOC Engineer", "Systems Engineer", "Infrastructure Engineer", "Site Reliability Engineer",
+    "DevOps Engineer", "Cloud Engineer", "Network Administrator", "Security Engineer", "Platform Engineer",
+    "Data Engineer", "Backend Developer", "Support Engineer", "IT Specialist", "Solutions Architect",
+]
+LEVELS = ["", "", "", "Junior ", "Senior ", "Lead ", "Principal "]
+COMPANY_HEADS = ["Blue", "North", "Quantum", "Bright", "Iron", "Silver", "Red", "Open", "Deep", "Swift", "Atlas", "Nova"]
+COMPANY_TAILS = ["Networks", "Systems", "Labs", "Cloud", "Data", "Logic", "Works", "Dynamics", "Telecom", "Security"]
+LOCATIONS = [
+    "Remote", "Remote - USA", "New York, NY", "Austin, TX", "Seattle, WA", "Denver, CO", "Chicago, IL",
+    "San Francisco, CA", "Boston, MA", "Atlanta, GA", "Toronto, ON", "Berlin, Germany", "London, UK",
+]
+SKILLS = [
+    "tcp/ip", "routing switching", "bgp", "ospf", "firewall", "palo alto", "vpn", "ad", "dns", "dhcp", "linux",
+    "python", "ansible", "terraform", "aws", "azure", "kubernetes", "cisco", "juniper", "monitoring", "sql",
+]
+FILLER = (
+    "You will work with a small team that owns the network and the services built on it. "
+    "We value clear writing, careful change management and a calm on-call rotation. "
+    "The role includes planning capacity, reviewing designs and improving our runbooks. "
+    "We offer flexible hours, a learning budget and a hardware allowance of your choice. "
+)
+# share of postings that repeat an earlier one
+REPOST_RATE = 0.08
+TRACKING_COPY_RATE = 0.04
+
+
+def _description(rng: random.Random, title: str, company: str, years: int, size: int) -> str:
+    skills = rng.sample(SKILLS, 6)
+    parts = [
+        f"{company} is hiring a {title}. You have {years}+ years of experience with {', '.join(skills[:3])}.",
+        f"Nice to have: {', '.join(skills[3:])}.",
+    ]
+    text = " ".join(parts)
+    while len(text) < size:
+        text += " " + FILLER[: max(40, size - len(text))]
+    return text
+
+
+def postings(count: int, seed: int = 0, description_size: int = 1200, now: datetime | None = None) -> list[dict]:
+    # plain dicts, independent of any source format; job_url paths are served by the stand-in
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    out: list[dict] = []
+    for i in range(count):
+        if out and rng.random() < REPOST_RATE:
+            item = dict(rng.choice(out))
+            item["description"] = item["description"].replace("small team", "growing team", 1)
+        elif out and rng.random() < TRACKING_COPY_RATE:
+            item = dict(rng.choice(out))
+            item["path"] = f"{item['path'].split('?')[0]}?utm_source=feed{i}"
+            out.append(item | {"id": i})
+            continue
+        else:
+            title = rng.choice(LEVELS) + rng.choice(ROLES)
+            company = f"{rng.choice(COMPANY_HEADS)} {rng.choice(COMPANY_TAILS)}"
+            years = rng.randint(1, 8)
+            item = {
+                "title": title,
+                "company": company,
+                "location": rng.choice(LOCATIONS),
+                "salary": f"${rng.randrange(60, 180, 5)}k - ${rng.randrange(185, 260, 5)}k",
+                "tags": rng.sample(SKILLS, 4),
+                "description": _description(rng, title, company, years, description_size),
+            }
+        item["id"] = i
+        item["path"] = f"/jobs/{i}"
+        item["posted"] = now - timedelta(minutes=rng.randint(1, 11 * 60))
+        out.append(item)
+    return out
+
+
+def job_links(items: list[dict], base_url: str = "https://jobs.example.test") -> list[JobLink]:
+    return [
+        JobLink(
+            base_url + p["path"], "Synthetic", "jobs.example.test",
+            {"position": p["title"], "company": p["company"], "location": p["location"],
+             "date": p["posted"].isoformat(), "tags": p["tags"]},
+        )
+        for p in items
+    ]
+
+
+def job_records(items: list[dict], base_url: str = "https://jobs.example.test") -> list[JobRecord]:
+    return [
+        JobRecord.from_link(
+            link, title=p["title"], company=p["company"], location_text=p["location"],
+            description_raw=p["description"], posted_date=p["posted"].isoformat(), salary_text=p["salary"],
+        )
+        for link, p in zip(job_links(items, base_url), items)
+    ]
+
+
+def job_page(item: dict) -> str:
+    posting = {
+        "@context": "https://schema.org", "@type": "JobPosting", "title": item["title"],
+        "hiringOrganization": {"@type": "Organization", "name": item["company"]},
+        "jobLocation": {"@type": "Place", "address": item["location"]},
+        "datePosted": item["posted"].isoformat(), "description": escape(item["description"]),
+    }
+    nav = "".join(f"<li><a href='/jobs?tag={t}'>{t}</a></li>" for t in item["tags"])
+    return (
+        f"<!doctype html><html><head><title>{escape(item['title'])} at {escape(item['company'])}</title>"
+        f"<script type='application/ld+json'>{json.dumps(posting)}</script></head>"
+        f"<body><nav><ul>{nav}</ul></nav><main><h1>{escape(item['title'])}</h1>"
+        f"<p class='company'>{escape(item['company'])} - {escape(item['location'])}</p>"
+        f"<div class='description'><p>{escape(item['description'])}</p></div>"
+        "<a class='apply' href='#apply'>Apply now</a></main><footer>Powered by greenhouse</footer></body></html>"
+    )
+
+
+# one renderer per source format, each returning the response body bytes
+
+
+def remoteok_body(items: list[dict], base_url: str) -> bytes:
+    rows: list[dict] = [{"legal": "API terms of service"}]
+    rows += [
+        {"id": str(p["id"]), "slug": f"job-{p['id']}", "url": base_url + p["path"], "position": p["title"],
+         "company": p["company"], "location": p["location"], "tags": p["tags"], "date": p["posted"].isoformat(),
+         "salary_min": 0, "salary_max": 0, "description": p["description"]}
+        for p in items
+    ]
+    return json.dumps(rows).encode("utf-8")
+
+
+def remotive_body(items: list[dict], base_url: str) -> bytes:
+    jobs = [
+        {"id": p["id"], "url": base_url + p["path"], "title": p["title"], "company_name": p["company"],
+         "category": "DevOps / Sysadmin", "job_type": "full_time", "publication_date": p["posted"].isoformat(),
+         "candidate_required_location": p["location"], "salary": p["salary"], "description": p["description"]}
+        for p in items
+    ]
+    return json.dumps({"job-count": len(jobs), "jobs": jobs}).encode("utf-8")
+
+
+def arbeitnow_body(items: list[dict], base_url: str) -> bytes:
+    data = [
+        {"slug": f"job-{p['id']}", "url": base_url + p["path"], "title": p["title"], "company_name": p["company"],
+         "location": p["location"], "remote": p["location"].startswith("Remote"), "job_types": ["full time"],
+         "tags": p["tags"], "created_at": int(p["posted"].timestamp()), "description": p["description"]}
+        for p in items
+    ]
+    return json.dumps({"data": data, "links": {}, "meta": {}}).encode("utf-8")
+
+
+def greenhouse_body(items: list[dict], base_url: str) -> bytes:
+    jobs = [
+        {"id": p["id"], "title": p["title"], "absolute_url": base_url + p["path"],
+         "location": {"name": p["location"]}, "updated_at": p["posted"].isoformat(), "company_name": p["company"]}
+        for p in items
+    ]
+    return json.dumps({"jobs": jobs, "meta": {"total": len(jobs)}}).encode("utf-8")
+
+
+def lever_body(items: list[dict], base_url: str) -> bytes:
+    return json.dumps([
+        {"id": str(p["id"]), "text": p["title"], "hostedUrl": base_url + p["path"],
+         "categories": {"location": p["location"], "team": "Infrastructure"},
+         "createdAt": int(p["posted"].timestamp() * 1000), "descriptionPlain": p["description"]}
+        for p in items
+    ]).encode("utf-8")
+
+
+def rss_body(items: list[dict], base_url: str) -> bytes:
+    entries = "".join(
+        f"<item><title>{escape(p['company'])}: {escape(p['title'])}</title><link>{base_url}{escape(p['path'])}</link>"
+        f"<guid>{base_url}{escape(p['path'])}</guid><pubDate>{format_datetime(p['posted'])}</pubDate>"
+        f"<description>{escape(p['description'])}</description></item>"
+        for p in items
+    )
+    return (
+        "<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel><title>Jobs</title>"
+        f"{entries}</channel></rss>"
+    ).encode("utf-8")
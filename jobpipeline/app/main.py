@@ -3,13 +3,16 @@ from __future__ import annotations
 import sys
 import webbrowser
 
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QPushButton,
-    QLabel, QTableWidget, QTableWidgetItem, QTextEdit, QSplitter
+    QLabel, QLineEdit, QTableView, QTextEdit, QSplitter
 )
 
+from jobpipeline.app.results_model import JobsTableModel
+from jobpipeline.app.worker import PipelineRunner
 from jobpipeline.core.models import SearchProfile
-from jobpipeline.core.pipeline import PipelineService
+from jobpipeline.storage.sqlite_repo import SQLiteRepo
 from jobpipeline.utils.config import load_config
 
 
@@ -18,18 +21,27 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("JobPipeline")
         self.cfg = load_config()
-        self.pipeline = PipelineService(self.cfg)
-        self.jobs = []
+        # read-only use on the GUI thread; runs write through their own connection
+        self.repo = SQLiteRepo.from_config(self.cfg)
+        self.runner: PipelineRunner | None = None
         tabs = QTabWidget()
         self.setCentralWidget(tabs)
 
         self.dashboard = QWidget()
         d_layout = QVBoxLayout(self.dashboard)
         self.summary = QLabel("Last run: none")
-        run_btn = QPushButton("Run now")
-        run_btn.clicked.connect(self.run_pipeline)
+        self.live = QLabel("")
+        self.timings = QLabel("")
+        self.run_btn = QPushButton("Run now")
+        self.run_btn.clicked.connect(self.run_pipeline)
+        self.cancel_btn = QPushButton("Cancel run")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_run)
         d_layout.addWidget(self.summary)
-        d_layout.addWidget(run_btn)
+        d_layout.addWidget(self.live)
+        d_layout.addWidget(self.timings)
+        d_layout.addWidget(self.run_btn)
+        d_layout.addWidget(self.cancel_btn)
         tabs.addTab(self.dashboard, "Dashboard")
 
         tabs.addTab(QLabel("Profiles managed via config.yaml"), "Profiles")
@@ -37,9 +49,21 @@ class MainWindow(QMainWindow):
 
         self.results_widget = QWidget()
         r_layout = QVBoxLayout(self.results_widget)
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Search title, company, location and description")
+        self.search.returnPressed.connect(lambda: self.model.set_search(self.search.text()))
+        r_layout.addWidget(self.search)
+        self.count = QLabel("")
+        r_layout.addWidget(self.count)
         splitter = QSplitter()
-        self.table = QTableWidget(0, 6)
-        self.table.setHorizontalHeaderLabels(["Company", "Title", "Grade", "Score", "Source", "Link"])
+        self.model = JobsTableModel(self.repo)
+        self.model.countChanged.connect(self.show_count)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(3, Qt.SortOrder.DescendingOrder)
+        self.table.selectionModel().currentRowChanged.connect(self.show_detail)
         self.detail = QTextEdit()
         self.detail.setReadOnly(False)
         splitter.addWidget(self.table)
@@ -51,23 +75,75 @@ class MainWindow(QMainWindow):
         tabs.addTab(self.results_widget, "Results")
         tabs.addTab(QLabel("Settings in config.yaml: excel path, discovery, js fetch, throttle, hours"), "Settings")
 
+    def show_count(self) -> None:
+        matching = f' matching "{self.model.search}"' if self.model.search else ""
+        self.count.setText(f"{self.model.total} jobs{matching}")
+
     def run_pipeline(self) -> None:
-        p = SearchProfile(**self.cfg["profiles"][0])
-        self.jobs = self.pipeline.run(p)
-        self.summary.setText(f"Last run collected: {len(self.jobs)}")
-        self.table.setRowCount(len(self.jobs))
-        for row, job in enumerate(self.jobs):
-            self.table.setItem(row, 0, QTableWidgetItem(job.company))
-            self.table.setItem(row, 1, QTableWidgetItem(job.title))
-            self.table.setItem(row, 2, QTableWidgetItem(job.fit_grade))
-            self.table.setItem(row, 3, QTableWidgetItem(str(job.fit_score)))
-            self.table.setItem(row, 4, QTableWidgetItem(job.source_name))
-            self.table.setItem(row, 5, QTableWidgetItem(job.job_url))
+        if self.runner is not None:
+            return
+        profiles = [SearchProfile(**p) for p in self.cfg["profiles"]]
+        self.runner = PipelineRunner(self.cfg, profiles, self)
+        self.runner.progress.connect(self.on_progress)
+        self.runner.succeeded.connect(self.on_succeeded)
+        self.runner.failed.connect(lambda message: self.summary.setText(f"Last run failed: {message}"))
+        self.runner.cancelled.connect(lambda: self.summary.setText("Last run cancelled"))
+        self.runner.finished.connect(self.on_finished)
+        self.runner.finished.connect(self.runner.deleteLater)
+        self.sources_done, self.links_found, self.stage_times = 0, 0, []
+        self.live.setText("Starting run...")
+        self.timings.setText("")
+        self.run_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.runner.start()
+
+    def cancel_run(self) -> None:
+        if self.runner is not None:
+            self.live.setText("Cancelling...")
+            self.runner.cancel()
+
+    def on_progress(self, kind: str, data: dict) -> None:
+        if kind == "source":
+            self.sources_done += 1
+            self.links_found += data["links"]
+            failed = f" ({data['name']} failed)" if data["error"] else ""
+            self.live.setText(f"Sources {self.sources_done}/{data['total']}: {self.links_found} links{failed}")
+        elif kind == "found":
+            self.live.setText(f"Found {data['found']} links: {data['new']} new, {data['changed']} changed")
+        elif kind == "details":
+            self.live.setText(f"Fetched {data['done']}/{data['total']} job pages")
+        elif kind == "jobs":
+            self.live.setText(f"Saved {data['written']}/{data['total']} jobs")
+            self.model.add_jobs([job.job_id for job in data["jobs"]])
+        elif kind == "stage" and data["state"] == "finished":
+            self.stage_times.append(f"{data['name']} {data['seconds']:.1f}s")
+            self.timings.setText(" | ".join(self.stage_times))
+
+    def on_succeeded(self, stats, counts: dict) -> None:
+        per_profile = ", ".join(f"{name}: {n}" for name, n in counts.items())
+        self.summary.setText(f"Last run collected: {stats.exported} ({per_profile})")
+        self.live.setText(f"new={stats.new} changed={stats.changed} unchanged={stats.unchanged} failed={stats.failed}")
+
+    def on_finished(self) -> None:
+        self.runner = None
+        self.run_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+
+    def closeEvent(self, event) -> None:
+        if self.runner is not None:
+            self.runner.cancel()
+            self.runner.wait()
+        self.repo.close()
+        super().closeEvent(event)
+
+    def show_detail(self, current, previous=None) -> None:
+        if current.isValid():
+            self.detail.setPlainText(self.repo.description(self.model.job_id(current.row())))
 
     def open_selected(self) -> None:
-        row = self.table.currentRow()
-        if row >= 0:
-            webbrowser.open(self.table.item(row, 5).text())
+        row = self.table.currentIndex().row()
+        if row >= 0 and self.model.job_url(row):
+            webbrowser.open(self.model.job_url(row))
 
 
 def main() -> None:
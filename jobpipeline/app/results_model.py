@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Any
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QPersistentModelIndex, Qt, Signal
+
+from jobpipeline.storage.sqlite_repo import SQLiteRepo
+
+# (header, jobs column)
+RESULT_COLUMNS = [
+    ("Company", "company"),
+    ("Title", "title"),
+    ("Grade", "fit_grade"),
+    ("Score", "fit_score"),
+    ("Source", "source_name"),
+    ("Link", "job_url"),
+]
+PAGE_SIZE = 200
+
+
+class JobsTableModel(QAbstractTableModel):
+    # Results table over the jobs table. Rows arrive a page at a time as the view scrolls
+    # (canFetchMore/fetchMore); sorting and the search filter are SQL and restart paging.
+    # `total` changed; emitted by reload() and by add_jobs() as a run saves rows
+    countChanged = Signal()
+
+    def __init__(self, repo: SQLiteRepo, page_size: int = PAGE_SIZE, parent: Any = None) -> None:
+        super().__init__(parent)
+        self.repo = repo
+        self.page_size = page_size
+        self.columns = [column for _, column in RESULT_COLUMNS]
+        self.sort_column = "fit_score"
+        self.descending = True
+        self.search = ""
+        self.rows: list[tuple] = []
+        self.exhausted = False
+        # rows matching the current search, loaded or not
+        self.total = 0
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(RESULT_COLUMNS)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        value = self.rows[index.row()][index.column()]
+        return "" if value is None else str(value)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return RESULT_COLUMNS[section][0]
+        return None
+
+    def canFetchMore(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> None:
+        if parent.isValid() or self.exhausted:
+            return
+        page = self._page(self.rows[-1][-2:] if self.rows else None)
+        self.exhausted = len(page) < self.page_size
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
+
+    def _page(self, after: tuple | None) -> list[tuple]:
+        return self.repo.page_jobs(
+            self.columns, self.sort_column, self.descending, after, self.page_size, self.search
+        )
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        self.sort_column = self.columns[column]
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        self.reload()
+
+    def set_search(self, text: str) -> None:
+        self.search = text.strip()
+        self.reload()
+
+    def reload(self) -> None:
+        # drops every loaded page and reads the first one again; the view pulls the rest
+        self.beginResetModel()
+        self.rows = []
+        self.exhausted = False
+        self.total = self.repo.count_jobs(self.search)
+        self.endResetModel()
+        self.countChanged.emit()
+        self.fetchMore()
+
+    def add_jobs(self, job_ids: list[str]) -> None:
+        # Rows a running pipeline has just saved. Loaded rows are updated in place (or moved
+        # when their sort key changed) and new ones inserted at their sort position; a row
+        # that sorts past the loaded pages comes with fetchMore. Unlike reload() this keeps
+        # the view's scroll position and selection.
+        if not job_ids:
+            return
+        fresh = self.repo.page_jobs(
+            self.columns, self.sort_column, self.descending, None, len(job_ids), self.search, job_ids
+        )
+        for row in fresh:
+            at = next((i for i, r in enumerate(self.rows) if r[-1] == row[-1]), None)
+            if at is not None and self.rows[at][-2] == row[-2]:
+                self.rows[at] = row
+                self.dataChanged.emit(self.index(at, 0), self.index(at, len(self.columns) - 1))
+                continue
+            if at is not None:
+                self.beginRemoveRows(QModelIndex(), at, at)
+                del self.rows[at]
+                self.endRemoveRows()
+            pos = next((i for i, r in enumerate(self.rows) if self._before(row, r)), len(self.rows))
+            if pos == len(self.rows) and not self.exhausted:
+                continue
+            self.beginInsertRows(QModelIndex(), pos, pos)
+            self.rows.insert(pos, row)
+            self.endInsertRows()
+        self.total = self.repo.count_jobs(self.search)
+        self.countChanged.emit()
+
+    def _before(self, a: tuple, b: tuple) -> bool:
+        # the ORDER BY of page_jobs: (sort key, job_id) in the current direction
+        return a[-2:] > b[-2:] if self.descending else a[-2:] < b[-2:]
+
+    def job_id(self, row: int) -> str:
+        return self.rows[row][-1]
+
+    def job_url(self, row: int) -> str:
+        return self.rows[row][self.columns.index("job_url")] or ""
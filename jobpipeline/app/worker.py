@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Any
+
+from PySide6.QtCore import QThread, Signal
+
+from jobpipeline.core.control import RunCancelled, RunControl
+from jobpipeline.core.models import SearchProfile
+from jobpipeline.core.pipeline import PipelineService
+
+
+class PipelineRunner(QThread):
+    # Runs one pipeline pass off the GUI thread. The service (and so its SQLite connection
+    # and HTTP clients) is created inside run(), on the worker thread that uses it; RunControl
+    # events are re-emitted as Qt signals and reach the window through queued connections.
+    progress = Signal(str, object)
+    succeeded = Signal(object, object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, cfg: dict, profiles: list[SearchProfile], parent: Any = None) -> None:
+        super().__init__(parent)
+        self.cfg = cfg
+        self.profiles = profiles
+        self.control = RunControl(on_event=self.progress.emit)
+
+    def cancel(self) -> None:
+        self.control.cancel()
+
+    def run(self) -> None:
+        service: PipelineService | None = None
+        try:
+            service = PipelineService(self.cfg)
+            views = service.run_profiles(self.profiles, control=self.control)
+        except RunCancelled:
+            self.cancelled.emit()
+        except Exception as exc:
+            self.failed.emit(f"{type(exc).__name__}: {exc}")
+        else:
+            self.succeeded.emit(service.last_stats, {name: len(jobs) for name, jobs in views.items()})
+        finally:
+            if service is not None:
+                service.close()
+                service.repo.close()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import html
+from collections import Counter
+from dataclasses import dataclass
+from itertools import zip_longest
+from typing import Any
+from urllib.parse import urlparse
+
+import httpx
+
+from jobpipeline.collectors.fetch import fetch_page
+from jobpipeline.collectors.parser import parse_job_html
+from jobpipeline.core.control import RunControl
+from jobpipeline.core.models import JobLink
+from jobpipeline.sources.adapters import posted_at
+from jobpipeline.sources.http import HttpTransport
+from jobpipeline.utils.dates import parse_date
+
+SNIPPET_KEYS = {
+    "title": ("position", "title"),
+    "company": ("company", "company_name"),
+    "location_text": ("location", "candidate_required_location"),
+}
+
+
+@dataclass(slots=True)
+class DetailPage:
+    link: JobLink
+    html: str | None
+    fetch_status: str
+    failure_reason: str | None = None
+    job_posting: dict[str, Any] | None = None
+    truncated: bool = False
+
+
+def fallback_page(link: JobLink) -> str:
+    return f"<html><body><h1>{link.snippet_meta.get('position','Job')}</h1></body></html>"
+
+
+def fill_from_snippet(parsed: dict[str, Any], link: JobLink) -> dict[str, Any]:
+    # the page wins; the search result fills whatever the page did not say
+    meta = link.snippet_meta
+    for field, keys in SNIPPET_KEYS.items():
+        if not parsed.get(field):
+            value = next((meta[k] for k in keys if meta.get(k)), None)
+            if value:
+                parsed[field] = str(value)
+    if not parsed.get("posted_date"):
+        posted = parse_date(posted_at(meta))
+        if posted is not None:
+            parsed["posted_date"] = posted.isoformat()
+    return parsed
+
+
+def fill_from_posting(parsed: dict[str, Any], page: DetailPage) -> dict[str, Any]:
+    # a page cut short after its JobPosting has little body text; the posting's own
+    # description is the better source then
+    if page.truncated and page.job_posting:
+        description = str(page.job_posting.get("description") or "")
+        text = parse_job_html(html.unescape(description))["description_raw"] if description else ""
+        if len(text) > len(parsed.get("description_raw") or ""):
+            parsed["description_raw"] = text
+    return parsed
+
+
+class DetailCollector:
+    # Fetches job pages with a bounded pool of workers. Retries, timeouts and the per-domain
+    # token bucket come from the transport's async client, per-host connection limits from
+    # its DomainLimitedTransport.
+    def __init__(self, transport: HttpTransport, collector_cfg: dict[str, Any] | None = None) -> None:
+        cfg = collector_cfg or {}
+        self.transport = transport
+        self.enabled = bool(cfg.get("fetch_details", False))
+        self.workers = max(1, int(cfg.get("detail_workers", cfg.get("max_concurrency", 8))))
+        self.byte_cap = int(cfg.get("page_byte_cap_kb", 1024)) * 1024
+        self.stop_at_job_posting = bool(cfg.get("stop_at_job_posting", True))
+        # per page domain, for the last collect: bytes read, pages whose read stopped early,
+        # and the bytes that skipped (known only when the page sent Content-Length)
+        self.bytes_read: Counter[str] = Counter()
+        self.cut_short: Counter[str] = Counter()
+        self.bytes_saved: Counter[str] = Counter()
+
+    def collect(
+        self, links: list[JobLink], control: RunControl | None = None, offset: int = 0, total: int | None = None
+    ) -> list[DetailPage]:
+        # offset and total place these links in a larger run for the "details" progress events
+        self.bytes_read, self.cut_short, self.bytes_saved = Counter(), Counter(), Counter()
+        if not self.enabled or not links:
+            return [DetailPage(link, None, "skipped") for link in links]
+        work = self._collect_with_client(links, control, offset, total)
+        return asyncio.run(work if control is None else control.guard(work))
+
+    async def _collect_with_client(
+        self, links: list[JobLink], control: RunControl | None = None, offset: int = 0, total: int | None = None
+    ) -> list[DetailPage]:
+        async with self.transport.async_client() as client:
+            return await self.collect_async(links, client, control, offset, total)
+
+    async def collect_async(
+        self,
+        links: list[JobLink],
+        client: httpx.AsyncClient,
+        control: RunControl | None = None,
+        offset: int = 0,
+        total: int | None = None,
+    ) -> list[DetailPage]:
+        gate = asyncio.Semaphore(self.workers)
+        done = 0
+
+        async def fetch(link: JobLink) -> DetailPage:
+            async with gate:
+                try:
+                    page = await fetch_page(client, link.job_url, self.byte_cap, self.stop_at_job_posting)
+                except httpx.HTTPStatusError as exc:
+                    return DetailPage(link, None, "failed", f"http {exc.response.status_code}")
+                except Exception as exc:
+                    return DetailPage(link, None, "failed", f"{type(exc).__name__}: {exc}"[:300])
+                domain = urlparse(link.job_url).netloc
+                self.bytes_read[domain] += page.bytes_read
+                self.cut_short[domain] += page.truncated
+                self.bytes_saved[domain] += page.bytes_saved
+                return DetailPage(link, page.html, "success", job_posting=page.job_posting, truncated=page.truncated)
+
+        async def fetch_counted(link: JobLink) -> DetailPage:
+            nonlocal done
+            page = await fetch(link)
+            done += 1
+            if control is not None:
+                control.emit("details", done=offset + done, total=total or len(links))
+            return page
+
+        # round-robin over domains so one large board does not hold every worker in its throttle
+        by_domain: dict[str, list[int]] = {}
+        for i, link in enumerate(links):
+            by_domain.setdefault(urlparse(link.job_url).netloc, []).append(i)
+        order = [i for batch in zip_longest(*by_domain.values()) for i in batch if i is not None]
+        pages = dict(zip(order, await asyncio.gather(*(fetch_counted(links[i]) for i in order))))
+        return [pages[i] for i in range(len(links))]
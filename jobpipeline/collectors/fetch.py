@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+_LD_OPEN = re.compile(r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>", re.I)
+_SCRIPT_CLOSE = re.compile(r"</script\s*>", re.I)
+# an opening tag cut at the chunk edge is at most this long
+_TAG_TAIL = 512
+
+
+def find_job_posting(raw: str) -> dict[str, Any] | None:
+    try:
+        obj = json.loads(raw)
+    except ValueError:
+        return None
+    # same shapes parse_job_html accepts: one object or a list of objects
+    candidates = obj if isinstance(obj, list) else [obj]
+    return next((c for c in candidates if isinstance(c, dict) and c.get("@type") == "JobPosting"), None)
+
+
+class JsonLdScanner:
+    # Finds application/ld+json blocks in HTML that arrives in pieces. Only the text after
+    # the last complete block (or a short tail that may hold a cut-off opening tag) is kept.
+    def __init__(self) -> None:
+        self._buf = ""
+        self._open = False
+
+    def feed(self, text: str) -> list[str]:
+        self._buf += text
+        blocks: list[str] = []
+        while True:
+            if not self._open:
+                m = _LD_OPEN.search(self._buf)
+                if m is None:
+                    self._buf = self._buf[-_TAG_TAIL:]
+                    return blocks
+                self._buf = self._buf[m.end() :]
+                self._open = True
+            m = _SCRIPT_CLOSE.search(self._buf)
+            if m is None:
+                return blocks
+            blocks.append(self._buf[: m.start()])
+            self._buf = self._buf[m.end() :]
+            self._open = False
+
+
+@dataclass(slots=True)
+class PageFetch:
+    url: str
+    html: str
+    bytes_read: int
+    content_length: int | None = None
+    truncated: bool = False
+    job_posting: dict[str, Any] | None = field(default=None)
+
+    @property
+    def bytes_saved(self) -> int:
+        if not self.truncated or self.content_length is None:
+            return 0
+        return max(0, self.content_length - self.bytes_read)
+
+
+async def fetch_page(
+    client: httpx.AsyncClient, url: str, byte_cap: int = 1 << 20, stop_at_job_posting: bool = True
+) -> PageFetch:
+    # Reads the body in chunks and leaves early once a complete JobPosting has been seen
+    # or byte_cap bytes have arrived; leaving the stream block drops the connection.
+    async with client.stream("GET", url) as resp:
+        resp.raise_for_status()
+        length = resp.headers.get("content-length")
+        decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+        scanner = JsonLdScanner()
+        parts: list[str] = []
+        posting: dict[str, Any] | None = None
+        truncated = False
+        async for chunk in resp.aiter_bytes():
+            text = decoder.decode(chunk)
+            parts.append(text)
+            if posting is None:
+                posting = next(filter(None, map(find_job_posting, scanner.feed(text))), None)
+                if posting is not None and stop_at_job_posting:
+                    truncated = True
+                    break
+            if resp.num_bytes_downloaded >= byte_cap:
+                truncated = True
+                break
+        else:
+            parts.append(decoder.decode(b"", True))
+        return PageFetch(
+            url,
+            "".join(parts),
+            resp.num_bytes_downloaded,
+            int(length) if length and length.isdigit() else None,
+            truncated,
+            posting,
+        )
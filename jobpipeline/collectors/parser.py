@@ -1,22 +1,50 @@
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
+import concurrent.futures
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import Callable
 import json
+import re
 
+from jobpipeline.utils.lazy import lazy_import
 
-def parse_job_html(html: str) -> dict:
-    soup = BeautifulSoup(html, "html.parser")
-    result = {
+# both load on first use, so a run on the lxml backend never imports bs4 and one on stdlib never lxml
+bs4 = lazy_import("bs4")
+etree = lazy_import("lxml.etree")  # optional: the stdlib scanner is used instead
+
+DESCRIPTION_CAP = 20000
+ATS_HINTS = ("greenhouse", "lever", "ashby", "workable", "workday")
+LD_JSON = "application/ld+json"
+# bs4's HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS and DEFAULT_EMPTY_ELEMENT_TAGS, copied so
+# the scanners do not import bs4; strings under the containers are not part of the page text
+_CONTAINERS = frozenset({"rp", "rt", "script", "style", "template"})
+_VOID = frozenset({
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image", "img",
+    "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source", "spacer",
+    "track", "wbr",
+})
+_DECIMAL_REF = re.compile("^([0-9]+)(.*)")
+_HEX_REF = re.compile("^([0-9a-f]+)(.*)")
+# below this many pages per worker the process start-up costs more than it saves
+MIN_PAGES_PER_WORKER = 50
+
+
+def _empty_result(description: str) -> dict:
+    return {
         "title": "",
         "company": "",
         "location_text": "",
         "posted_date": None,
-        "description_raw": soup.get_text(" ", strip=True)[:20000],
+        "description_raw": description,
         "apply_url": None,
     }
-    for script in soup.find_all("script", {"type": "application/ld+json"}):
+
+
+def _finish(result: dict, ld_scripts: list[str], ats_type: str) -> dict:
+    for raw in ld_scripts:
         try:
-            obj = json.loads(script.text)
+            obj = json.loads(raw)
             if isinstance(obj, list):
                 obj = next((x for x in obj if x.get("@type") == "JobPosting"), {})
             if obj.get("@type") == "JobPosting":
@@ -28,18 +56,263 @@ def parse_job_html(html: str) -> dict:
                 return result
         except Exception:
             continue
-    # ATS hints
-    text = soup.get_text(" ", strip=True).lower()
-    if "greenhouse" in text:
-        result["ats_type"] = "greenhouse"
-    elif "lever" in text:
-        result["ats_type"] = "lever"
-    elif "ashby" in text:
-        result["ats_type"] = "ashby"
-    elif "workable" in text:
-        result["ats_type"] = "workable"
-    elif "workday" in text:
-        result["ats_type"] = "workday"
-    else:
-        result["ats_type"] = "unknown"
+    result["ats_type"] = ats_type
     return result
+
+
+def parse_job_html_bs4(html: str) -> dict:
+    # reference implementation; the scanners below must produce the same dict
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    result = _empty_result(soup.get_text(" ", strip=True)[:DESCRIPTION_CAP])
+    scripts = [script.text for script in soup.find_all("script", {"type": LD_JSON})]
+    text = soup.get_text(" ", strip=True).lower()
+    return _finish(result, scripts, next((hint for hint in ATS_HINTS if hint in text), "unknown"))
+
+
+class PageScan:
+    # Receives the strings of a page in document order, as BeautifulSoup's get_text(strip=True)
+    # would yield them, and keeps only what parse_job_html needs: the description up to the
+    # cap, the best ATS hint seen so far and the raw JSON-LD blocks.
+    def __init__(self, cap: int = DESCRIPTION_CAP) -> None:
+        self.cap = cap
+        self.parts: list[str] = []
+        self.size = -1
+        self.hint = len(ATS_HINTS)
+        self.ld_scripts: list[str] = []
+
+    def text(self, value: str) -> None:
+        value = value.strip()
+        if not value:
+            return
+        if self.size < self.cap:
+            self.parts.append(value)
+            self.size += len(value) + 1
+        if self.hint:
+            lowered = value.lower()
+            for i in range(self.hint):
+                if ATS_HINTS[i] in lowered:
+                    self.hint = i
+                    break
+
+    def result(self) -> dict:
+        ats_type = ATS_HINTS[self.hint] if self.hint < len(ATS_HINTS) else "unknown"
+        return _finish(_empty_result(" ".join(self.parts)[: self.cap]), self.ld_scripts, ats_type)
+
+
+def _charref(number: int) -> str:
+    # HTML5 numeric references as bs4 resolves them: NUL, surrogates and out-of-range numbers
+    # become U+FFFD, C1 controls are read as windows-1252, anything else is kept as-is
+    # (html.unescape drops the non-characters instead)
+    if number == 0 or number > 0x10FFFF or 0xD800 <= number <= 0xDFFF:
+        return "\ufffd"
+    if 0x80 <= number <= 0x9F:
+        try:
+            return bytes([number]).decode("cp1252")
+        except UnicodeDecodeError:
+            pass
+    return chr(number)
+
+
+class StdlibPageScanner(HTMLParser):
+    # Single pass over html.parser events that mirrors how BeautifulSoup's html.parser
+    # builder opens and closes tags and where it splits strings, without building a tree.
+    def __init__(self, scan: PageScan) -> None:
+        super().__init__(convert_charrefs=False)
+        self.scan = scan
+        self.stack: list[str] = []
+        self.open_counts: dict[str, int] = {}
+        self.containers = 0
+        self.closed_void: list[str] = []
+        self.pending: list[str] = []
+        self.ld_index: int | None = None
+
+    def flush(self, cdata: bool = False) -> None:
+        if not self.pending:
+            return
+        value = "".join(self.pending)
+        self.pending = []
+        if self.ld_index is not None and self.stack and self.stack[-1] == "script":
+            self.scan.ld_scripts[self.ld_index] += value
+        elif cdata or not self.containers:
+            self.scan.text(value)
+
+    def push(self, tag: str) -> None:
+        self.stack.append(tag)
+        self.open_counts[tag] = self.open_counts.get(tag, 0) + 1
+        if tag in _CONTAINERS:
+            self.containers += 1
+
+    def pop_to(self, tag: str) -> None:
+        while self.stack and self.open_counts.get(tag):
+            popped = self.stack.pop()
+            self.open_counts[popped] -= 1
+            if popped in _CONTAINERS:
+                self.containers -= 1
+            if popped == "script":
+                self.ld_index = None
+            if popped == tag:
+                break
+
+    def handle_starttag(self, tag: str, attrs: list, void_check: bool = True) -> None:
+        self.flush()
+        self.push(tag)
+        if tag == "script":
+            kind = next((v for k, v in reversed(attrs) if k == "type"), None)
+            if kind == LD_JSON:
+                self.scan.ld_scripts.append("")
+                self.ld_index = len(self.scan.ld_scripts) - 1
+        if void_check and tag in _VOID:
+            self.handle_endtag(tag, check_closed=False)
+            self.closed_void.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        self.handle_starttag(tag, attrs, void_check=False)
+        self.handle_endtag(tag, check_closed=False)
+
+    def handle_endtag(self, tag: str, check_closed: bool = True) -> None:
+        if check_closed and tag in self.closed_void:
+            self.closed_void.remove(tag)
+            return
+        self.flush()
+        self.pop_to(tag)
+
+    def handle_data(self, data: str) -> None:
+        self.pending.append(data)
+
+    def handle_charref(self, name: str) -> None:
+        base, pattern = (16, _HEX_REF) if name[:1] in "xX" else (10, _DECIMAL_REF)
+        digits = name[1:] if base == 16 else name
+        extra = ""
+        try:
+            number: int | None = int(digits, base)
+        except ValueError:
+            match = pattern.search(digits)
+            number, extra = (int(match.group(1), base), match.group(2)) if match else (None, digits)
+        if number is not None:
+            self.pending.append(_charref(number))
+        self.pending.append(extra)
+
+    def handle_entityref(self, name: str) -> None:
+        character = html5.get(name + ";")
+        self.pending.append(f"&{name}" if character is None else character)
+
+    def handle_comment(self, data: str) -> None:
+        self.flush()
+
+    def handle_decl(self, decl: str) -> None:
+        self.flush()
+
+    def handle_pi(self, data: str) -> None:
+        self.flush()
+
+    def unknown_decl(self, data: str) -> None:
+        self.flush()
+        if data.upper().startswith("CDATA["):
+            self.pending.append(data[len("CDATA[") :])
+            self.flush(cdata=True)
+
+
+class LxmlPageTarget:
+    # lxml parser target: libxml2 tokenizes in C and only the events reach Python.
+    def __init__(self, scan: PageScan) -> None:
+        self.scan = scan
+        self.containers = 0
+        self.pending: list[str] = []
+        self.in_ld = False
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        value = "".join(self.pending)
+        self.pending = []
+        if self.in_ld:
+            self.scan.ld_scripts[-1] += value
+        elif not self.containers:
+            self.scan.text(value)
+
+    def start(self, tag: str, attrib: dict) -> None:
+        self.flush()
+        if tag in _CONTAINERS:
+            self.containers += 1
+        if tag == "script" and attrib.get("type") == LD_JSON:
+            self.scan.ld_scripts.append("")
+            self.in_ld = True
+
+    def end(self, tag: str) -> None:
+        self.flush()
+        if tag in _CONTAINERS:
+            self.containers -= 1
+        if tag == "script":
+            self.in_ld = False
+
+    def data(self, data: str) -> None:
+        self.pending.append(data)
+
+    def comment(self, text: str) -> None:
+        self.flush()
+
+    def pi(self, target: str, data: str | None = None) -> None:
+        self.flush()
+
+    def doctype(self, *args: str | None) -> None:
+        self.flush()
+
+    def close(self) -> PageScan:
+        self.flush()
+        return self.scan
+
+
+def parse_job_html_stdlib(html: str) -> dict:
+    scanner = StdlibPageScanner(PageScan())
+    scanner.feed(html)
+    scanner.close()
+    scanner.flush()
+    return scanner.scan.result()
+
+
+def parse_job_html_lxml(html: str) -> dict:
+    # fed as bytes with the encoding fixed: lxml refuses str input that carries an
+    # XML encoding declaration (XHTML pages); any page libxml2 rejects goes to stdlib
+    if not html.strip():
+        return PageScan().result()
+    parser = etree.HTMLParser(target=LxmlPageTarget(PageScan()), encoding="utf-8")
+    try:
+        scan = etree.fromstring(html.encode("utf-8"), parser)
+    except (etree.LxmlError, ValueError):
+        return parse_job_html_stdlib(html)
+    return scan.result()
+
+
+BACKENDS: dict[str, Callable[[str], dict]] = {
+    "bs4": parse_job_html_bs4,
+    "stdlib": parse_job_html_stdlib,
+}
+if etree is not None:
+    # libxml2 recovers from broken markup differently (stray "<", unknown entities, CDATA,
+    # mis-nested tags), so only well-formed pages match the bs4 output; opt-in only
+    BACKENDS["lxml"] = parse_job_html_lxml
+# "stdlib" matches bs4 on every page, well-formed or not
+DEFAULT_BACKEND = "stdlib"
+
+
+def html_backend(name: str | None = None) -> Callable[[str], dict]:
+    if not name or name == "auto":
+        return BACKENDS[DEFAULT_BACKEND]
+    if name not in BACKENDS:
+        raise ValueError(f"unknown html parser backend {name!r}; available: {', '.join(BACKENDS)}")
+    return BACKENDS[name]
+
+
+def parse_job_html(html: str, backend: str | None = None) -> dict:
+    return html_backend(backend)(html)
+
+
+def parse_job_html_batch(
+    pages: list[str], workers: int = 0, backend: str | None = None, chunksize: int = 16
+) -> list[dict]:
+    parse = html_backend(backend)
+    workers = min(workers, len(pages) // MIN_PAGES_PER_WORKER)
+    if workers < 2:
+        return [parse(html) for html in pages]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse, pages, chunksize=chunksize))
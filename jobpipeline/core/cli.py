@@ -1,17 +1,122 @@
 from __future__ import annotations
 
-from jobpipeline.core.models import SearchProfile
+import argparse
+from datetime import datetime
+from typing import Callable
+
+from jobpipeline.core.models import RunStats, SearchProfile
 from jobpipeline.core.pipeline import PipelineService
+from jobpipeline.core.scheduler import Scheduler
+from jobpipeline.export.stream import SINKS, export_jobs
+from jobpipeline.storage.filters import JobFilter
 from jobpipeline.utils.config import load_config
 
 
-def main() -> None:
-    cfg = load_config()
-    p = cfg["profiles"][0]
-    profile = SearchProfile(**p)
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="jobpipeline-cli")
+    parser.add_argument("--full", action="store_true", help="reprocess every link, not only new or changed ones")
+    parser.add_argument("--profile", action="append", help="profile name to run (repeatable); default: all profiles")
+    parser.add_argument("--daemon", action="store_true", help="keep running and poll each source on its own adaptive interval")
+    parser.add_argument("--rebuild-excel", action="store_true", help="rewrite the tracker from the database and exit")
+    parser.add_argument("--export", metavar="PATH", help="write stored jobs to a .csv/.jsonl/.parquet/.arrow file and exit")
+    parser.add_argument("--search", metavar="QUERY", help="full-text search stored jobs (best matches first) and exit")
+    parser.add_argument("--fts-syntax", action="store_true", help="treat the --search query as FTS5 syntax (OR, NOT, \"phrase\", title:term)")
+    parser.add_argument("--limit", type=int, default=20, help="number of search results")
+    parser.add_argument("--format", choices=sorted(SINKS), help="export format; default: from the file suffix")
+    parser.add_argument("--grade", action="append", default=[], help="export/search only this fit grade (repeatable)")
+    parser.add_argument("--since-hours", type=float, help="export/search only jobs seen in the last N hours")
+    parser.add_argument("--source", action="append", default=[], help="export/search only jobs seen on this source name or domain")
+    parser.add_argument("--with-description", action="store_true", help="include the description text in the export")
+    parser.add_argument("--output-dir", metavar="DIR", help="keep the database, tracker and HTTP cache under DIR (e.g. a temp dir for a smoke run)")
+    args = parser.parse_args(argv)
+    try:
+        cfg = load_config(output_dir=args.output_dir)
+    except ValueError as exc:
+        parser.error(str(exc))
+    profiles = [SearchProfile(**p) for p in cfg["profiles"]]
+    if args.profile:
+        profiles = [p for p in profiles if p.name in args.profile]
+        if not profiles:
+            parser.error(f"no profile named {', '.join(args.profile)}")
     service = PipelineService(cfg)
-    jobs = service.run(profile)
-    print(f"Collected {len(jobs)} jobs")
+    flt = JobFilter(grades=args.grade, since_hours=args.since_hours, sources=args.source)
+    if args.search:
+        try:
+            hits = service.repo.search(args.search, flt, args.limit, syntax=args.fts_syntax)
+        except ValueError as exc:
+            parser.error(str(exc))
+        finally:
+            service.close()
+        for hit in hits:
+            print(f"{hit.fit_score if hit.fit_score is not None else '-':>3} {hit.fit_grade or '-'}  {hit.title_marked} | {hit.company}")
+            print(f"       {hit.job_url}")
+            if hit.snippet:
+                print(f"       {hit.snippet}")
+        print(f"{len(hits)} results")
+        return
+    if args.export:
+        try:
+            count = export_jobs(service.repo, args.export, args.format, flt, include_description=args.with_description)
+        finally:
+            service.close()
+        print(f"Exported {count} jobs to {args.export}")
+        return
+    if args.rebuild_excel:
+        try:
+            print(f"Rebuilt tracker with {service.rebuild_excel(profiles)} rows")
+        finally:
+            service.close()
+        return
+    if args.daemon:
+        scheduler = Scheduler.from_config(service, profiles)
+        try:
+            scheduler.run_forever(on_batch=print_batch(scheduler))
+        except KeyboardInterrupt:
+            print("Stopped; the schedule resumes on the next start")
+        finally:
+            service.close()
+        return
+    try:
+        views = service.run_profiles(profiles, incremental=False if args.full else None)
+    finally:
+        service.close()
+    stats = service.last_stats
+    print(f"Collected {stats.exported} jobs")
+    for name, jobs in views.items():
+        print(f"  {name}: {len(jobs)}")
+    print(f"new={stats.new} changed={stats.changed} unchanged={stats.unchanged} failed={stats.failed} retried={stats.retried}")
+    print("stages: " + ", ".join(f"{name}={seconds:.2f}s" for name, seconds in stats.timings.items()))
+    if stats.cut_short:
+        short = sorted(stats.cut_short.items(), key=lambda kv: -kv[1])
+        print(
+            f"pages cut short: {sum(stats.cut_short.values())} ({', '.join(f'{d}={n}' for d, n in short[:5])}); "
+            f"page bytes read: {sum(stats.bytes_read.values())}"
+        )
+    if stats.bytes_saved:
+        saved = sorted(stats.bytes_saved.items(), key=lambda kv: -kv[1])
+        print(
+            f"page bytes saved where Content-Length was sent: {sum(stats.bytes_saved.values())} "
+            f"({', '.join(f'{d}={n}' for d, n in saved[:5])})"
+        )
+    busy = [(d, m) for d, m in stats.throttle.items() if m.waited_seconds or m.throttled or m.hedged]
+    for domain, m in sorted(busy, key=lambda kv: -kv[1].waited_seconds)[:5]:
+        print(
+            f"throttle {domain}: waited {m.waited_seconds:.1f}s over {m.requests} requests, "
+            f"{m.throttled} throttled, {m.hedged} hedged ({m.hedge_wins} won)"
+        )
+
+
+def print_batch(scheduler: Scheduler) -> Callable[[list[str], RunStats], None]:
+    def report(due: list[str], stats: RunStats) -> None:
+        stamp = datetime.now().strftime("%H:%M:%S")
+        polled = ", ".join(f"{name}+{stats.new_by_source.get(name, 0)}" for name in due)
+        print(f"[{stamp}] polled {polled}; collected {stats.exported} jobs")
+        upcoming = sorted(scheduler.schedules.values(), key=lambda s: s.next_due)[:3]
+        print("  next: " + ", ".join(
+            f"{s.source} at {datetime.fromtimestamp(s.next_due):%H:%M:%S} (every {s.interval / 60:.0f} min)" for s in upcoming
+        ))
+
+    return report
 
 
 if __name__ == "__main__":
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+# how often a guarded coroutine looks at the cancel flag
+CANCEL_POLL_SECONDS = 0.1
+
+
+class RunCancelled(Exception):
+    pass
+
+
+class RunControl:
+    # Passed into a pipeline run by whoever started it (CLI, UI worker thread). Events are
+    # delivered on the run's own thread as on_event(kind, data); cancel() may be called
+    # from any thread and is honoured between stages and inside the async fetch stages.
+    def __init__(self, on_event: Callable[[str, dict[str, Any]], None] | None = None) -> None:
+        self.on_event = on_event
+        self.cancelled = threading.Event()
+        self.timings: dict[str, float] = {}
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def check(self) -> None:
+        if self.cancelled.is_set():
+            raise RunCancelled()
+
+    def emit(self, kind: str, **data: Any) -> None:
+        if self.on_event is not None:
+            self.on_event(kind, data)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self.check()
+        self.emit("stage", name=name, state="started")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # a stage entered once per batch adds up over the run
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+            self.emit("stage", name=name, state="finished", seconds=self.timings[name])
+
+    async def guard(self, work: Awaitable[T]) -> T:
+        # Cancels the task when the flag is set, so open streams and pooled connections are
+        # closed by their own async-with blocks, then raises RunCancelled.
+        task = asyncio.ensure_future(work)
+        while not task.done():
+            if self.cancelled.is_set():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                raise RunCancelled()
+            await asyncio.wait({task}, timeout=CANCEL_POLL_SECONDS)
+        return task.result()
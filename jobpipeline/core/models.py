@@ -4,6 +4,17 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 import hashlib
+import json
+
+from jobpipeline.utils.throttle import DomainMetrics
+from jobpipeline.utils.urls import canonicalize_url
+
+# snippet fields that describe the posting itself; ids, slugs and urls are covered by the url
+FINGERPRINT_FIELDS = (
+    "position", "title", "company", "company_name", "location", "candidate_required_location",
+    "salary", "salary_min", "salary_max", "job_type", "job_types", "remote", "tags",
+    "date", "publication_date", "created_at", "pubDate", "published", "updated",
+)
 
 
 @dataclass(slots=True)
@@ -20,6 +31,27 @@ class SearchProfile:
     exclude_keywords: list[str]
     time_window_hours: int = 24
 
+    @classmethod
+    def combined(cls, profiles: list["SearchProfile"]) -> "SearchProfile":
+        # what a single fetch has to cover so every profile can be scored from it
+        if len(profiles) == 1:
+            return profiles[0]
+        union = lambda attr: list(dict.fromkeys(v for p in profiles for v in getattr(p, attr)))
+        shared_excludes = set.intersection(*(set(p.exclude_keywords) for p in profiles))
+        return cls(
+            name="+".join(p.name for p in profiles),
+            target_titles=union("target_titles"),
+            adjacent_titles=union("adjacent_titles"),
+            location_mode=profiles[0].location_mode,
+            city=profiles[0].city,
+            radius_km=profiles[0].radius_km,
+            experience_range=profiles[0].experience_range,
+            must_have_keywords=union("must_have_keywords"),
+            nice_to_have_keywords=union("nice_to_have_keywords"),
+            exclude_keywords=[k for k in profiles[0].exclude_keywords if k in shared_excludes],
+            time_window_hours=max(p.time_window_hours for p in profiles),
+        )
+
 
 @dataclass(slots=True)
 class JobLink:
@@ -28,6 +60,39 @@ class JobLink:
     source_domain: str
     snippet_meta: dict[str, Any] = field(default_factory=dict)
 
+    def canonical_key(self) -> str:
+        return canonicalize_url(self.job_url).key
+
+    def fingerprint(self) -> str:
+        relevant = {k: self.snippet_meta[k] for k in FINGERPRINT_FIELDS if k in self.snippet_meta}
+        raw = f"{self.canonical_key()}|{json.dumps(relevant, sort_keys=True, default=str)}".encode("utf-8")
+        return hashlib.sha1(raw).hexdigest()
+
+
+@dataclass(slots=True)
+class RunStats:
+    started_at: str = ""
+    finished_at: str = ""
+    found: int = 0
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    # links fetched again because their page failed on an earlier run
+    retried: int = 0
+    merged: int = 0
+    exported: int = 0
+    # per page domain: bytes read, pages read only up to the JobPosting or the byte cap, and
+    # the bytes that skipped; bytes_saved only counts pages that sent Content-Length
+    bytes_read: dict[str, int] = field(default_factory=dict)
+    cut_short: dict[str, int] = field(default_factory=dict)
+    bytes_saved: dict[str, int] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+    # new or changed links per adapter name
+    new_by_source: dict[str, int] = field(default_factory=dict)
+    # per request domain: time spent waiting for tokens, 429/503 answers, hedged requests
+    throttle: dict[str, DomainMetrics] = field(default_factory=dict)
+
 
 @dataclass(slots=True)
 class JobRecord:
@@ -70,7 +135,7 @@ class JobRecord:
     @classmethod
     def from_link(cls, link: JobLink, **kwargs: Any) -> "JobRecord":
         now = datetime.utcnow().isoformat()
-        url = kwargs.get("canonical_url", link.job_url)
+        url = kwargs.get("canonical_url") or canonicalize_url(link.job_url).url
         company = kwargs.get("company", "Unknown")
         title = kwargs.get("title", "Unknown")
         return cls(
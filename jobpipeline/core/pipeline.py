@@ -1,13 +1,27 @@
 from __future__ import annotations
 
-from jobpipeline.collectors.parser import parse_job_html
-from jobpipeline.core.models import JobRecord, SearchProfile
-from jobpipeline.dedupe.engine import dedupe_jobs
-from jobpipeline.export.excel_sync import sync_excel
-from jobpipeline.scoring.engine import score_job
+import json
+from collections import Counter
+from dataclasses import replace
+from datetime import datetime
+from urllib.parse import urlparse
+
+from jobpipeline.collectors.detail import DetailCollector, fallback_page, fill_from_posting, fill_from_snippet
+from jobpipeline.collectors.parser import parse_job_html_batch
+from jobpipeline.core.control import RunControl
+from jobpipeline.core.models import JobLink, JobRecord, RunStats, SearchProfile
+from jobpipeline.dedupe.engine import NearDuplicateIndex, dedupe_jobs
+from jobpipeline.scoring.engine import apply_score, score_profiles
+from jobpipeline.scoring.relevance import RelevanceScorer
+from jobpipeline.sources.cache import HttpCache
+from jobpipeline.sources.http import HttpTransport
 from jobpipeline.sources.manager import SourceManager
 from jobpipeline.storage.sqlite_repo import SQLiteRepo
 
+# links taken through details, parse, dedupe, score and write together; each batch is
+# committed and reported through RunControl before the next one is fetched
+RUN_BATCH = 100
+
 
 class DisabledDiscoveryProvider:
     def discover(self, query: str) -> list[str]:
@@ -18,19 +32,232 @@ class DisabledDiscoveryProvider:
 class PipelineService:
     def __init__(self, cfg: dict) -> None:
         self.cfg = cfg
-        self.sources = SourceManager(cfg)
-        self.repo = SQLiteRepo(cfg["storage"]["sqlite_path"])
+        self.transport = HttpTransport(cfg.get("collector", {}), cache=HttpCache.from_config(cfg))
+        self.sources = SourceManager(cfg, transport=self.transport)
+        self.details = DetailCollector(self.transport, cfg.get("collector", {}))
+        self.repo = SQLiteRepo.from_config(cfg)
         self.discovery_provider = DisabledDiscoveryProvider()
+        self.last_stats = RunStats()
+
+    def select_changed(
+        self, links: list[JobLink], stats: RunStats, resolved: dict[str, str]
+    ) -> list[tuple[JobLink, str, str]]:
+        keyed = [(link, link.fingerprint(), link.canonical_key()) for link in links]
+        known = self.repo.known_fingerprints([fp for _, fp, _ in keyed])
+        unchanged: list[str] = []
+        todo: list[tuple[JobLink, str, str]] = []
+        for link, fp, key in keyed:
+            if fp in known:
+                unchanged.append(fp)
+                continue
+            if key in resolved:
+                stats.changed += 1
+            else:
+                stats.new += 1
+            todo.append((link, fp, key))
+        stats.unchanged = len(unchanged)
+        self.repo.touch_fingerprints(unchanged, stats.started_at)
+        return todo
+
+    def run(self, profile: SearchProfile, incremental: bool | None = None) -> list[JobRecord]:
+        return self.run_profiles([profile], incremental)[profile.name]
+
+    def run_profiles(
+        self,
+        profiles: list[SearchProfile],
+        incremental: bool | None = None,
+        control: RunControl | None = None,
+        sources: list[str] | None = None,
+    ) -> dict[str, list[JobRecord]]:
+        # Sources are fetched once for the combined profile; the links then go through the
+        # remaining stages in batches and every profile is scored against each batch. A
+        # cancelled run raises RunCancelled between batches: the saved ones stay, with their
+        # fingerprints, and the HTTP cache keeps none of the search's validators, so the next
+        # run reads the feeds again and picks up the links that were not saved.
+        # `sources` limits the search to those adapter names; None polls every enabled one.
+        cache = self.transport.cache
+        if cache is not None:
+            cache.hold()
+        try:
+            return self._run_profiles(profiles, incremental, control, sources)
+        finally:
+            if cache is not None:
+                # no-op once the write stage committed
+                cache.discard()
+
+    def _run_profiles(
+        self,
+        profiles: list[SearchProfile],
+        incremental: bool | None,
+        control: RunControl | None,
+        sources: list[str] | None,
+    ) -> dict[str, list[JobRecord]]:
+        if incremental is None:
+            incremental = bool(self.cfg.get("incremental", True))
+        control = control or RunControl()
+        stats = RunStats(started_at=datetime.utcnow().isoformat())
+        self.transport.throttle.reset_metrics()
+        with control.stage("search"):
+            links = self.sources.search(SearchProfile.combined(profiles), control, sources)
+            stats.found = len(links)
+            # links whose page could not be fetched on an earlier run are fetched again whether
+            # or not a source still serves them; a feed answering 304 would never repeat them
+            served = {link.job_url for link in links}
+            retried = [
+                (JobLink(url, name, domain, json.loads(meta)), origin)
+                for url, name, domain, meta, origin in self.repo.failed_links(sources)
+                if url not in served
+            ]
+            stats.retried = len(retried)
+            # links that resolve to a stored job keep its id whatever URL form they arrived in
+            resolved = self.repo.resolve_canonical([link.canonical_key() for link in links + [r[0] for r in retried]])
+            if incremental:
+                todo = self.select_changed(links, stats, resolved)
+            else:
+                todo = [(link, link.fingerprint(), link.canonical_key()) for link in links]
+                stats.new = len(todo)
+            origins = self.sources.last_origins
+            stats.new_by_source = dict(Counter(origins[id(link)] for link, _, _ in todo if id(link) in origins))
+            todo.extend((link, link.fingerprint(), link.canonical_key()) for link, _ in retried)
+            origins = {**origins, **{id(link): origin for link, origin in retried}}
+        control.emit("found", found=stats.found, new=stats.new, changed=stats.changed, unchanged=stats.unchanged)
+        collector = self.cfg.get("collector", {})
+        near_dupes = NearDuplicateIndex.from_config(self.cfg, store=self.repo)
+        relevance = RelevanceScorer.from_config(self.cfg, store=self.repo)
+        workers = int(self.cfg.get("scoring", {}).get("workers", 0))
+        # by job id, so a job saved by two batches is exported once
+        saved: dict[str, JobRecord] = {}
+        profile_rows: dict[str, dict[str, JobRecord]] = {profile.name: {} for profile in profiles}
+        errors: list[tuple[str, str, str]] = []
+        bytes_read: Counter[str] = Counter()
+        cut_short: Counter[str] = Counter()
+        bytes_saved: Counter[str] = Counter()
+        size = max(1, int(collector.get("run_batch", RUN_BATCH)))
+        for start in range(0, len(todo), size):
+            chunk = todo[start : start + size]
+            with control.stage("details"):
+                details = self.details.collect([link for link, _, _ in chunk], control, start, len(todo))
+            errors.extend(
+                (urlparse(d.link.job_url).netloc, d.failure_reason or "", d.link.job_url)
+                for d in details
+                if d.fetch_status == "failed"
+            )
+            # links whose page could not be fetched are not fingerprinted and are kept in
+            # failed_links, so the next run fetches them again
+            retry = {fp for (_, fp, _), d in zip(chunk, details) if d.fetch_status == "failed"}
+            bytes_read.update(self.details.bytes_read)
+            cut_short.update(self.details.cut_short)
+            bytes_saved.update(self.details.bytes_saved)
+            jobs: list[JobRecord] = []
+            fingerprints: list[tuple[str, str, str, str]] = []
+            with control.stage("parse"):
+                parsed_pages = parse_job_html_batch(
+                    [d.html if d.html is not None else fallback_page(d.link) for d in details],
+                    workers=int(collector.get("parse_workers", 0)),
+                    backend=collector.get("html_parser"),
+                )
+                for (link, fp, key), detail, parsed in zip(chunk, details, parsed_pages):
+                    parsed = fill_from_snippet(fill_from_posting(parsed, detail), link)
+                    if detail.fetch_status == "failed":
+                        parsed.update(fetch_status="failed", failure_reason=detail.failure_reason)
+                    job = JobRecord.from_link(link, **parsed)
+                    job.job_id = resolved.get(key, job.job_id)
+                    jobs.append(job)
+                    fingerprints.append((fp, job.job_id, job.canonical_url, key))
+            collected = len(jobs)
+            with control.stage("dedupe"):
+                jobs = dedupe_jobs(jobs, near_dupes)
+            stats.merged += collected - len(jobs)
+            survivor = {job.job_id: job.job_id for job in jobs}
+            for job in jobs:
+                for merged_id in job.merged_from:
+                    survivor.setdefault(merged_id, job.job_id)
+
+            with control.stage("score"):
+                scores = score_profiles(jobs, profiles, workers)
+                matrix = relevance.matrix(jobs) if relevance is not None and jobs else None
+                scored_views: dict[str, list[JobRecord]] = {}
+                for i, profile in enumerate(profiles):
+                    if len(profiles) > 1:
+                        kept = {id(link) for link in self.sources.profile_links([t[0] for t in chunk], profile)}
+                        members = {survivor.get(f[1], f[1]) for t, f in zip(chunk, fingerprints) if id(t[0]) in kept}
+                    else:
+                        members = set(survivor.values())
+                    # the first profile scores the shared rows in place; the others get copies
+                    scored = [
+                        apply_score(job if i == 0 else replace(job), result)
+                        for job, result in zip(jobs, scores[profile.name])
+                    ]
+                    if matrix is not None:
+                        relevance.blend(scored, relevance.similarities(matrix, profile))
+                    scored_views[profile.name] = [job for job in scored if job.job_id in members]
+
+            with control.stage("write"):
+                self.repo.upsert_jobs(jobs)
+                for name, view in scored_views.items():
+                    self.repo.upsert_scores(name, view, stats.started_at)
+                    profile_rows[name].update((job.job_id, job) for job in view)
+                if near_dupes is not None:
+                    near_dupes.remember(jobs)
+                self.repo.remember_fingerprints(
+                    [
+                        (fp, survivor.get(job_id, job_id), url, stats.started_at)
+                        for fp, job_id, url, _ in fingerprints
+                        if fp not in retry
+                    ]
+                )
+                self.repo.remember_canonical(
+                    [(key, survivor.get(job_id, job_id), url) for _, job_id, url, key in fingerprints]
+                )
+                self.repo.remember_failed(
+                    [
+                        (
+                            d.link.job_url, d.link.source_name, d.link.source_domain,
+                            json.dumps(d.link.snippet_meta, default=str), origins.get(id(d.link)),
+                        )
+                        for d in details
+                        if d.fetch_status == "failed"
+                    ],
+                    stats.started_at,
+                    int(collector.get("failed_link_attempts", 5)),
+                )
+                self.repo.forget_failed([d.link.job_url for d in details if d.fetch_status != "failed"])
+            saved.update((job.job_id, job) for job in jobs)
+            control.emit("jobs", jobs=jobs, written=start + len(chunk), total=len(todo))
+            # a link in a later batch with the same canonical key lands on the row saved here
+            resolved.update((key, survivor.get(job_id, job_id)) for _, job_id, _, key in fingerprints)
+        stats.failed = len(errors)
+        stats.bytes_read = {domain: n for domain, n in bytes_read.items() if n}
+        stats.cut_short = {domain: n for domain, n in cut_short.items() if n}
+        stats.bytes_saved = {domain: n for domain, n in bytes_saved.items() if n}
+        if self.transport.cache is not None:
+            self.transport.cache.commit()
+        jobs = list(saved.values())
+        views = {name: list(rows.values()) for name, rows in profile_rows.items()}
+        with control.stage("export"):
+            if jobs:
+                # openpyxl is the slowest import in the package; runs with nothing to export skip it
+                from jobpipeline.export.excel_sync import sync_workbook
+
+                sheets = {"Jobs": jobs, **(views if len(profiles) > 1 else {})}
+                sync_workbook(self.cfg["excel_path"], sheets, incremental=bool(self.cfg.get("excel_incremental", True)))
+        stats.exported = len(jobs)
+        stats.throttle = self.transport.throttle.metrics()
+        stats.timings = dict(control.timings)
+        stats.finished_at = datetime.utcnow().isoformat()
+        run_id = self.repo.record_run(stats)
+        if errors:
+            self.repo.record_errors(run_id, errors)
+        self.last_stats = stats
+        return views
+
+    def rebuild_excel(self, profiles: list[SearchProfile]) -> int:
+        from jobpipeline.export.excel_sync import rebuild_excel
+
+        sheets = {"Jobs": self.repo.export_rows()}
+        if len(profiles) > 1:
+            sheets.update({p.name: self.repo.export_rows(p.name) for p in profiles})
+        return rebuild_excel(self.cfg["excel_path"], sheets)
 
-    def run(self, profile: SearchProfile) -> list[JobRecord]:
-        links = self.sources.search(profile)
-        jobs: list[JobRecord] = []
-        for link in links:
-            parsed = parse_job_html(f"<html><body><h1>{link.snippet_meta.get('position','Job')}</h1></body></html>")
-            jobs.append(JobRecord.from_link(link, **parsed))
-        jobs = dedupe_jobs(jobs)
-        jobs = [score_job(j, profile) for j in jobs]
-        for job in jobs:
-            self.repo.upsert_job(job)
-        sync_excel(self.cfg["excel_path"], jobs)
-        return jobs
+    def close(self) -> None:
+        self.transport.close()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from jobpipeline.core.control import RunCancelled, RunControl
+from jobpipeline.core.models import RunStats, SearchProfile
+from jobpipeline.core.pipeline import PipelineService
+
+# longest single sleep; Ctrl+C on Windows and wake-ups from system sleep are noticed this fast
+IDLE_SLICE_SECONDS = 5.0
+
+log = logging.getLogger("jobpipeline")
+
+
+@dataclass(slots=True)
+class SourceSchedule:
+    source: str
+    interval: float
+    next_due: float = 0.0
+    last_polled: float | None = None
+    # smoothed new items per second
+    rate: float = 0.0
+    polls: int = 0
+
+    def row(self) -> tuple:
+        return (self.source, self.interval, self.next_due, self.last_polled, self.rate, self.polls)
+
+
+@dataclass(slots=True)
+class PollPolicy:
+    min_seconds: float = 300.0
+    max_seconds: float = 21600.0
+    # new items a poll should find on average
+    target_new: float = 1.0
+    smoothing: float = 0.3
+    # how much a quiet source's interval may grow per poll
+    backoff: float = 1.5
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any]) -> "PollPolicy":
+        daemon = cfg.get("daemon", {})
+        low = float(daemon.get("min_interval_seconds", 300))
+        return cls(
+            min_seconds=low,
+            max_seconds=max(low, float(daemon.get("max_interval_seconds", 21600))),
+            target_new=float(daemon.get("target_new_per_poll", 1)),
+            smoothing=float(daemon.get("smoothing", 0.3)),
+            backoff=max(1.0, float(daemon.get("backoff", 1.5))),
+        )
+
+    def clamp(self, seconds: float) -> float:
+        return min(max(seconds, self.min_seconds), self.max_seconds)
+
+    def observe(self, sched: SourceSchedule, new: int, now: float) -> None:
+        # The first poll sees a source's whole backlog as new and says nothing about its
+        # rate. After that the interval aims at target_new items per poll: it drops at once
+        # when a source gets busy and grows by at most `backoff` per poll while it is quiet.
+        if sched.last_polled is not None:
+            sample = new / max(now - sched.last_polled, 1.0)
+            sched.rate = sample if sched.polls <= 1 else self.smoothing * sample + (1 - self.smoothing) * sched.rate
+            ideal = self.target_new / sched.rate if sched.rate > 0 else self.max_seconds
+            sched.interval = min(ideal, sched.interval * self.backoff)
+        sched.interval = self.clamp(sched.interval)
+        sched.last_polled = now
+        sched.next_due = now + sched.interval
+        sched.polls += 1
+
+
+class Scheduler:
+    # Long-running loop behind --daemon. Every enabled source has its own interval; the
+    # sources due within coalesce_seconds of each other share one pipeline run. State is
+    # saved to the repository after every run, so a restart picks up the same schedule.
+    def __init__(
+        self,
+        service: PipelineService,
+        profiles: list[SearchProfile],
+        policy: PollPolicy | None = None,
+        coalesce_seconds: float = 60.0,
+        control: RunControl | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.service = service
+        self.profiles = profiles
+        self.policy = policy or PollPolicy()
+        self.coalesce_seconds = coalesce_seconds
+        self.control = control or RunControl()
+        self.clock = clock
+        self.schedules: dict[str, SourceSchedule] = {}
+
+    @classmethod
+    def from_config(
+        cls, service: PipelineService, profiles: list[SearchProfile], control: RunControl | None = None
+    ) -> "Scheduler":
+        coalesce = float(service.cfg.get("daemon", {}).get("coalesce_seconds", 60))
+        return cls(service, profiles, PollPolicy.from_config(service.cfg), coalesce, control)
+
+    def load(self) -> None:
+        now = self.clock()
+        stored = {row[0]: SourceSchedule(*row) for row in self.service.repo.load_schedule()}
+        self.schedules = {}
+        for name in self.service.sources.enabled_names():
+            sched = stored.get(name) or SourceSchedule(name, self.policy.min_seconds, now)
+            # the bounds may have changed in the config since the state was saved
+            sched.interval = self.policy.clamp(sched.interval)
+            sched.next_due = min(sched.next_due, now + sched.interval)
+            self.schedules[name] = sched
+        self.service.repo.save_schedule([s.row() for s in self.schedules.values()], prune=True)
+
+    def due(self, now: float) -> list[str]:
+        return sorted(name for name, s in self.schedules.items() if s.next_due <= now + self.coalesce_seconds)
+
+    def next_wake(self) -> float:
+        return min(s.next_due for s in self.schedules.values())
+
+    def run_due(self, now: float | None = None) -> list[str]:
+        now = self.clock() if now is None else now
+        due = self.due(now)
+        if not due:
+            return []
+        try:
+            self.service.run_profiles(self.profiles, control=self.control, sources=due)
+        except RunCancelled:
+            raise
+        except Exception:
+            # e.g. the tracker is open in Excel; try these sources again after the shortest interval
+            log.exception("daemon run failed for %s", ", ".join(due))
+            for name in due:
+                self.schedules[name].next_due = now + self.policy.min_seconds
+            self.service.repo.save_schedule([self.schedules[name].row() for name in due])
+            return []
+        new = self.service.last_stats.new_by_source
+        for name in due:
+            self.policy.observe(self.schedules[name], new.get(name, 0), now)
+        self.service.repo.save_schedule([self.schedules[name].row() for name in due])
+        return due
+
+    def run_forever(self, on_batch: Callable[[list[str], RunStats], None] | None = None) -> None:
+        self.load()
+        if not self.schedules:
+            return
+        while not self.control.cancelled.is_set():
+            now = self.clock()
+            wake = self.next_wake()
+            if wake > now:
+                self.control.cancelled.wait(min(wake - now, IDLE_SLICE_SECONDS))
+                continue
+            try:
+                due = self.run_due(now)
+            except RunCancelled:
+                return
+            if due and on_batch is not None:
+                on_batch(due, self.service.last_stats)
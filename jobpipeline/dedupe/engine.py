@@ -1,16 +1,182 @@
 from __future__ import annotations
 
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
 from jobpipeline.core.models import JobRecord
+from jobpipeline.dedupe.minhash import (
+    band_keys,
+    block_key,
+    normalize_company,
+    normalize_title,
+    signature,
+    signature_bytes,
+    signature_from_bytes,
+    similarity,
+    title_similarity,
+)
+from jobpipeline.utils.urls import canonicalize_url
+
+
+class SignatureStore(Protocol):
+    def find_signatures(self, buckets: list[int]) -> list[tuple[str, str, str, bytes | None]]: ...
+
+    def save_signatures(self, rows: list[tuple[str, str, str, bytes | None]], buckets: list[tuple[int, str]]) -> None: ...
+
+
+@dataclass(slots=True)
+class SignatureEntry:
+    job_id: str
+    company_key: str
+    title_key: str
+    sig: array | None
+    keys: list[int] = field(default_factory=list)
+
+
+def _merge_into(existing: JobRecord, job: JobRecord) -> None:
+    existing.last_seen = job.last_seen
+    existing.source_name = ",".join(sorted(set((existing.source_name + "," + job.source_name).split(","))))
+    existing.merged_from.append(job.job_id)
+
+
+class NearDuplicateIndex:
+    # Candidate pairs come from LSH buckets (company + a band of the description MinHash,
+    # or company + title when there is too little text), so the work grows with the number
+    # of records, not with the number of pairs. Candidates are then verified on company,
+    # title overlap and estimated description similarity.
+    def __init__(
+        self,
+        store: SignatureStore | None = None,
+        threshold: float = 0.6,
+        title_threshold: float = 0.5,
+        num_perm: int = 64,
+        bands: int = 16,
+        max_tokens: int = 200,
+    ) -> None:
+        self.store = store
+        self.threshold = threshold
+        self.title_threshold = title_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.max_tokens = max_tokens
+        self.buckets: dict[int, list[SignatureEntry]] = defaultdict(list)
+        self.entries: dict[str, SignatureEntry] = {}
+        # reposts and multi-source listings often share the exact same description
+        self._signatures: dict[str, array | None] = {}
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any], store: SignatureStore | None = None) -> "NearDuplicateIndex | None":
+        dcfg = cfg.get("dedupe", {})
+        if not dcfg.get("near_duplicates", False):
+            return None
+        return cls(
+            store,
+            threshold=float(dcfg.get("threshold", 0.6)),
+            title_threshold=float(dcfg.get("title_threshold", 0.5)),
+            num_perm=int(dcfg.get("num_perm", 64)),
+            bands=int(dcfg.get("bands", 16)),
+            max_tokens=int(dcfg.get("max_tokens", 200)),
+        )
+
+    def entry_for(self, job: JobRecord) -> SignatureEntry:
+        text = job.description_raw
+        if text not in self._signatures:
+            self._signatures[text] = signature(text, self.num_perm, self.max_tokens)
+        return SignatureEntry(
+            job.job_id, normalize_company(job.company), normalize_title(job.title), self._signatures[text]
+        )
+
+    def keys(self, entry: SignatureEntry) -> list[int]:
+        if not entry.keys:
+            entry.keys = [block_key(entry.company_key, entry.title_key)]
+            if entry.sig is not None:
+                entry.keys.extend(band_keys(entry.company_key, entry.sig, self.bands))
+        return entry.keys
+
+    def matches(self, a: SignatureEntry, b: SignatureEntry) -> bool:
+        if a.job_id == b.job_id or not a.company_key or a.company_key == "unknown":
+            return False
+        if a.company_key != b.company_key:
+            return False
+        if title_similarity(a.title_key, b.title_key) < self.title_threshold:
+            return False
+        if a.sig is None or b.sig is None:
+            return a.title_key == b.title_key
+        return similarity(a.sig, b.sig) >= self.threshold
+
+    def add(self, entry: SignatureEntry) -> None:
+        self.entries[entry.job_id] = entry
+        for key in self.keys(entry):
+            self.buckets[key].append(entry)
+
+    def find(self, entry: SignatureEntry) -> SignatureEntry | None:
+        seen: set[str] = set()
+        for key in self.keys(entry):
+            for candidate in self.buckets.get(key, ()):
+                if candidate.job_id in seen:
+                    continue
+                seen.add(candidate.job_id)
+                if self.matches(entry, candidate):
+                    return candidate
+        return None
+
+    def preload(self, entries: list[SignatureEntry]) -> None:
+        if self.store is None:
+            return
+        wanted = list(dict.fromkeys(k for e in entries if e.company_key for k in self.keys(e)))
+        for job_id, company_key, title_key, raw in self.store.find_signatures(wanted):
+            if job_id not in self.entries:
+                self.add(SignatureEntry(job_id, company_key, title_key, signature_from_bytes(raw)))
+
+    def merge(self, jobs: list[JobRecord]) -> list[JobRecord]:
+        entries = [self.entry_for(job) for job in jobs]
+        self.preload(entries)
+        in_batch: dict[str, JobRecord] = {}
+        out: list[JobRecord] = []
+        for job, entry in zip(jobs, entries):
+            match = self.find(entry)
+            if match is None:
+                self.add(entry)
+                in_batch[job.job_id] = job
+                out.append(job)
+            elif match.job_id in in_batch:
+                primary = in_batch[match.job_id]
+                _merge_into(primary, job)
+                primary.possible_duplicate = True
+            else:
+                # same posting stored by an earlier run: write onto that row instead
+                job.merged_from.append(job.job_id)
+                job.job_id = entry.job_id = match.job_id
+                job.possible_duplicate = True
+                self.entries[match.job_id] = entry
+                in_batch[job.job_id] = job
+                out.append(job)
+        return out
+
+    def remember(self, jobs: list[JobRecord]) -> None:
+        if self.store is None:
+            return
+        rows: list[tuple[str, str, str, bytes | None]] = []
+        buckets: list[tuple[int, str]] = []
+        for job in jobs:
+            entry = self.entries.get(job.job_id)
+            if entry is None:
+                continue
+            rows.append((entry.job_id, entry.company_key, entry.title_key, signature_bytes(entry.sig)))
+            buckets.extend((key, entry.job_id) for key in self.keys(entry))
+        self.store.save_signatures(rows, buckets)
 
 
-def dedupe_jobs(jobs: list[JobRecord]) -> list[JobRecord]:
+def dedupe_jobs(jobs: list[JobRecord], index: NearDuplicateIndex | None = None) -> list[JobRecord]:
     by_url: dict[str, JobRecord] = {}
     for job in jobs:
-        existing = by_url.get(job.canonical_url)
+        key = canonicalize_url(job.canonical_url).key
+        existing = by_url.get(key)
         if not existing:
-            by_url[job.canonical_url] = job
+            by_url[key] = job
             continue
-        existing.last_seen = job.last_seen
-        existing.source_name = ",".join(sorted(set((existing.source_name + "," + job.source_name).split(","))))
-        existing.merged_from.append(job.job_id)
-    return list(by_url.values())
+        _merge_into(existing, job)
+    out = list(by_url.values())
+    return index.merge(out) if index is not None else out
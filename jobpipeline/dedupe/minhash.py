@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import re
+import zlib
+from array import array
+from bisect import bisect_right
+
+from jobpipeline.utils.text import word_tokens
+
+EMPTY = 0xFFFFFFFF
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "gmbh", "plc", "sa", "ag"}
+_TITLE_ALIASES = {"sr": "senior", "jr": "junior", "eng": "engineer", "mgr": "manager", "ii": "2", "iii": "3"}
+_SENIORITY = {"senior", "junior", "lead", "principal", "staff", "head", "intern", "1", "2", "3"}
+
+
+def normalize_company(name: str) -> str:
+    tokens = [t for t in word_tokens(name) if t not in _COMPANY_SUFFIXES]
+    return " ".join(tokens)
+
+
+def normalize_title(title: str) -> str:
+    title = re.sub(r"\(.*?\)", " ", title or "")
+    return " ".join(_TITLE_ALIASES.get(t, t) for t in word_tokens(title))
+
+
+def title_similarity(a: str, b: str) -> float:
+    sa, sb = set(a.split()), set(b.split())
+    if sa & _SENIORITY != sb & _SENIORITY:
+        return 0.0
+    if not sa or not sb:
+        return 1.0 if sa == sb else 0.0
+    return len(sa & sb) / len(sa | sb)
+
+
+def signature(text: str, num_perm: int = 64, max_tokens: int = 200) -> array | None:
+    # One-permutation MinHash: every shingle is hashed once and binned by hash % num_perm,
+    # so the cost is linear in the document, not in num_perm * document.
+    # only the head of the text is tokenized; ~16 chars per token is a generous bound
+    words = word_tokens((text or "")[: max_tokens * 16])[:max_tokens]
+    if len(words) < 3:
+        return None
+    hashes = set(map(zlib.crc32, map(str.encode, map(" ".join, zip(words, words[1:], words[2:])))))
+    bins = {h % num_perm: h // num_perm for h in sorted(hashes, reverse=True)}
+    sig = array("I", map(bins.get, range(num_perm), [EMPTY] * num_perm))
+    # densify empty bins from the next filled bin so sparse documents still compare
+    if len(bins) < num_perm:
+        filled = sorted(bins)
+        for i in range(num_perm):
+            if sig[i] == EMPTY:
+                pos = bisect_right(filled, i)
+                sig[i] = bins[filled[pos % len(filled)]]
+    return sig
+
+
+def similarity(a: array, b: array) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / max(len(a), 1)
+
+
+def band_keys(company_key: str, sig: array, bands: int) -> list[int]:
+    width = max(1, len(sig) // bands) * sig.itemsize
+    raw = sig.tobytes()
+    seed = zlib.crc32(company_key.encode("utf-8"))
+    return [(band << 32) | zlib.crc32(raw[band * width : (band + 1) * width], seed) for band in range(bands)]
+
+
+def block_key(company_key: str, title_key: str) -> int:
+    # jobs without enough description text are only compared on company + title
+    return (0xFFFF << 32) | zlib.crc32(f"{company_key}|{title_key}".encode("utf-8"))
+
+
+def signature_bytes(sig: array | None) -> bytes | None:
+    return None if sig is None else sig.tobytes()
+
+
+def signature_from_bytes(raw: bytes | None) -> array | None:
+    if raw is None:
+        return None
+    sig = array("I")
+    sig.frombytes(raw)
+    return sig
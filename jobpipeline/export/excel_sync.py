@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Iterable, Sequence
+import hashlib
+import json
+import os
+import re
 
 from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
 
 from jobpipeline.core.models import JobRecord
 
@@ -11,37 +19,212 @@ COLUMNS = [
     "Job ID", "Date Collected", "Last Seen", "Company", "Title", "Location", "Remote", "Link", "Source(s)",
     "Posted Date", "Fit Score", "Fit Grade", "Fit Notes", "Missing Must-have", "Status", "Notes"
 ]
+# the last two columns belong to the user and are never overwritten
+EXPORTED = len(COLUMNS) - 2
+USER_DEFAULTS = ["New", ""]
+LINK_COL = COLUMNS.index("Link") + 1
+COLUMN_WIDTH = 18
+INDEX_SUFFIX = ".index.json"
 
 
-def sync_excel(path: str, jobs: list[JobRecord]) -> None:
-    p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    wb = load_workbook(p) if p.exists() else Workbook()
-    ws = wb["Jobs"] if "Jobs" in wb.sheetnames else wb.active
-    ws.title = "Jobs"
-    if ws.max_row == 1 and ws["A1"].value is None:
-        ws.append(COLUMNS)
-    existing: dict[str, int] = {}
-    for row in range(2, ws.max_row + 1):
-        existing[str(ws.cell(row, 1).value)] = row
+def sheet_title(name: str) -> str:
+    return re.sub(r"[\[\]:*?/\\]", " ", name).strip()[:31] or "Jobs"
+
+
+def export_values(job: JobRecord) -> list[Any]:
+    return [job.job_id, job.collected_at, job.last_seen, job.company, job.title, job.location_text, job.remote_flag,
+            job.job_url, job.source_name, job.posted_date, job.fit_score, job.fit_grade, job.fit_notes,
+            ", ".join(job.missing_must_have)]
+
+
+def row_hash(values: Sequence[Any]) -> str:
+    # openpyxl reads an empty string cell back as None; hash both the same way
+    normalized = [None if v == "" else v for v in values]
+    return hashlib.blake2b(json.dumps(normalized, default=str).encode("utf-8"), digest_size=12).hexdigest()
+
+
+@dataclass(slots=True)
+class ExcelIndex:
+    # Sidecar next to the workbook: per sheet, job_id -> [row, hash of the exported cells].
+    # It is trusted only while the workbook's mtime and size match what was stored at the
+    # last save, so a workbook edited or re-sorted in Excel is scanned again.
+    stamp: list[int] | None = None
+    sheets: dict[str, dict[str, list]] = field(default_factory=dict)
+
+    @staticmethod
+    def sidecar(xlsx: Path) -> Path:
+        return xlsx.with_name(xlsx.name + INDEX_SUFFIX)
+
+    @staticmethod
+    def stamp_of(xlsx: Path) -> list[int] | None:
+        if not xlsx.exists():
+            return None
+        st = xlsx.stat()
+        return [st.st_mtime_ns, st.st_size]
+
+    @classmethod
+    def load(cls, xlsx: Path) -> "ExcelIndex":
+        try:
+            data = json.loads(cls.sidecar(xlsx).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls()
+        if data.get("stamp") is None or data.get("stamp") != cls.stamp_of(xlsx):
+            return cls()
+        return cls(data["stamp"], data.get("sheets", {}))
+
+    def save(self, xlsx: Path) -> None:
+        self.stamp = self.stamp_of(xlsx)
+        self.sidecar(xlsx).write_text(json.dumps({"stamp": self.stamp, "sheets": self.sheets}), encoding="utf-8")
+
+
+def _open_sheet(wb: Workbook, sheet: str) -> tuple[Any, bool]:
+    if sheet in wb.sheetnames:
+        return wb[sheet], False
+    if sheet == "Jobs" or (wb.active.max_row == 1 and wb.active["A1"].value is None):
+        # the main sheet takes over the default (or pre-rename) first sheet
+        ws = wb.active
+    else:
+        ws = wb.create_sheet()
+    ws.title = sheet
+    return ws, ws.max_row == 1 and ws["A1"].value is None
+
+
+def _format(ws: Any) -> None:
     for i, h in enumerate(COLUMNS, 1):
         ws.cell(1, i).value = h
         ws.cell(1, i).font = Font(bold=True)
-    for job in jobs:
-        values = [job.job_id, job.collected_at, job.last_seen, job.company, job.title, job.location_text, job.remote_flag,
-                  job.job_url, job.source_name, job.posted_date, job.fit_score, job.fit_grade, job.fit_notes,
-                  ", ".join(job.missing_must_have)]
-        if job.job_id in existing:
-            r = existing[job.job_id]
-            for col, val in enumerate(values, 1):
-                ws.cell(r, col).value = val
-        else:
-            ws.append(values + ["New", ""])
-            r = ws.max_row
-        ws.cell(r, 8).hyperlink = job.job_url
-        ws.cell(r, 8).style = "Hyperlink"
     ws.freeze_panes = "A2"
-    ws.auto_filter.ref = ws.dimensions
-    for col in "ABCDEFGHIJKLMNOP":
-        ws.column_dimensions[col].width = 18
+    for i in range(1, len(COLUMNS) + 1):
+        ws.column_dimensions[get_column_letter(i)].width = COLUMN_WIDTH
+
+
+def _scan(ws: Any) -> dict[str, list]:
+    rows: dict[str, list] = {}
+    for r, values in enumerate(ws.iter_rows(min_row=2, max_col=EXPORTED, values_only=True), 2):
+        if values[0] is not None:
+            rows[str(values[0])] = [r, row_hash(values)]
+    return rows
+
+
+def sync_workbook(path: str, sheets: dict[str, list[JobRecord]], incremental: bool = True) -> int:
+    # Writes only rows whose exported values changed and returns how many were written.
+    # With a valid sidecar index and nothing to change the workbook is not opened at all.
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    index = ExcelIndex.load(p) if incremental else ExcelIndex()
+    pending: dict[str, list[tuple[JobRecord, list[Any], str]]] = {}
+    for name, jobs in sheets.items():
+        pending[sheet_title(name)] = [(job, values, row_hash(values)) for job in jobs for values in [export_values(job)]]
+    if p.exists() and all(
+        title in index.sheets and all(index.sheets[title].get(job.job_id, [0, None])[1] == h for job, _, h in rows)
+        for title, rows in pending.items()
+    ):
+        return 0
+
+    wb = load_workbook(p) if p.exists() else Workbook()
+    written = 0
+    for title, rows in pending.items():
+        ws, created = _open_sheet(wb, title)
+        if created:
+            _format(ws)
+        known = index.sheets.get(title)
+        if known is None:
+            known = _scan(ws)
+        # openpyxl computes max_row over every cell, so it is read once, not per appended row
+        last = ws.max_row
+        for job, values, h in rows:
+            if known.get(job.job_id, [0, None])[1] == h:
+                continue
+            if job.job_id in known:
+                r = known[job.job_id][0]
+                for col, val in enumerate(values, 1):
+                    ws.cell(r, col).value = val
+            else:
+                last += 1
+                r = last
+                for col, val in enumerate(values + USER_DEFAULTS, 1):
+                    ws.cell(r, col, val)
+            ws.cell(r, LINK_COL).hyperlink = job.job_url
+            ws.cell(r, LINK_COL).style = "Hyperlink"
+            known[job.job_id] = [r, h]
+            written += 1
+        ws.auto_filter.ref = ws.dimensions
+        index.sheets[title] = known
     wb.save(p)
+    if incremental:
+        index.save(p)
+    return written
+
+
+def sync_excel(path: str, jobs: list[JobRecord], sheet: str = "Jobs") -> None:
+    sync_workbook(path, {sheet: jobs})
+
+
+def _read_existing(p: Path, rebuilt: set[str]) -> tuple[list[str], dict[str, dict[str, tuple]], dict[str, list[tuple]]]:
+    # one streaming pass: sheet order, Status/Notes of rebuilt sheets, all values of the others
+    if not p.exists():
+        return [], {}, {}
+    wb = load_workbook(p, read_only=True)
+    try:
+        user: dict[str, dict[str, tuple]] = {}
+        foreign: dict[str, list[tuple]] = {}
+        for ws in wb.worksheets:
+            if ws.title in rebuilt:
+                user[ws.title] = {
+                    str(row[0]): tuple(row[EXPORTED : len(COLUMNS)])
+                    for row in ws.iter_rows(min_row=2, max_col=len(COLUMNS), values_only=True)
+                    if row and row[0] is not None
+                }
+            else:
+                foreign[ws.title] = list(ws.iter_rows(values_only=True))
+        return wb.sheetnames, user, foreign
+    finally:
+        wb.close()
+
+
+def _write_sheet(ws: Any, rows: Iterable[Sequence[Any]], edits: dict[str, tuple]) -> dict[str, list]:
+    ws.freeze_panes = "A2"
+    for i in range(1, len(COLUMNS) + 1):
+        ws.column_dimensions[get_column_letter(i)].width = COLUMN_WIDTH
+    header = []
+    for h in COLUMNS:
+        cell = WriteOnlyCell(ws, h)
+        cell.font = Font(bold=True)
+        header.append(cell)
+    ws.append(header)
+    known: dict[str, list] = {}
+    r = 1
+    for values in rows:
+        values = list(values)
+        link = WriteOnlyCell(ws, values[LINK_COL - 1])
+        link.hyperlink = values[LINK_COL - 1]
+        link.style = "Hyperlink"
+        ws.append(values[: LINK_COL - 1] + [link] + values[LINK_COL:] + list(edits.get(str(values[0])) or USER_DEFAULTS))
+        r += 1
+        known[str(values[0])] = [r, row_hash(values)]
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(COLUMNS))}{r}"
+    return known
+
+
+def rebuild_excel(path: str, sheets: dict[str, Iterable[Sequence[Any]]]) -> int:
+    # Full rebuild in write-only mode: rows stream from `sheets` (export_values order) and
+    # the user's Status/Notes are merged back in. Other sheets keep their values and
+    # position but lose formatting.
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    titles = {sheet_title(name): rows for name, rows in sheets.items()}
+    order, user, foreign = _read_existing(p, set(titles))
+    wb = Workbook(write_only=True)
+    index = ExcelIndex()
+    for title in order + [t for t in titles if t not in order]:
+        ws = wb.create_sheet(title)
+        if title in titles:
+            index.sheets[title] = _write_sheet(ws, titles[title], user.get(title, {}))
+        else:
+            for row in foreign[title]:
+                ws.append(list(row))
+    tmp = p.with_name(p.name + ".tmp")
+    wb.save(tmp)
+    os.replace(tmp, p)
+    index.save(p)
+    return sum(len(rows) for rows in index.sheets.values())
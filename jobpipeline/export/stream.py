@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+from typing import Any, Protocol
+
+from jobpipeline.storage.filters import JobFilter
+from jobpipeline.storage.sqlite_repo import INTEGER_COLUMNS, SQLiteRepo
+from jobpipeline.utils.lazy import lazy_import
+
+# optional: pip install jobpipeline[parquet]; loaded by the first Arrow/Parquet export
+pa = lazy_import("pyarrow")
+
+# jobs columns in export order; the description is read from its blob only when asked for
+EXPORT_COLUMNS = [
+    "job_id", "source_domain", "source_name", "job_url", "canonical_url", "apply_url", "title", "company",
+    "location_text", "remote_flag", "employment_type", "posted_date", "collected_at", "salary_text",
+    "skills_extracted", "fetch_status", "failure_reason", "first_seen", "last_seen", "repost_count",
+    "merged_from", "fit_score", "fit_grade", "fit_notes", "missing_must_have", "flags", "user_status",
+    "user_notes", "possible_duplicate",
+]
+BATCH_SIZE = 1000
+
+
+class RowSink(Protocol):
+    def write(self, rows: list[tuple]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class CsvSink:
+    def __init__(self, path: Path, columns: list[str]) -> None:
+        self.fh = path.open("w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.fh)
+        self.writer.writerow(columns)
+
+    def write(self, rows: list[tuple]) -> None:
+        self.writer.writerows(rows)
+
+    def close(self) -> None:
+        self.fh.close()
+
+
+class JsonlSink:
+    def __init__(self, path: Path, columns: list[str]) -> None:
+        self.fh = path.open("w", encoding="utf-8")
+        self.columns = columns
+
+    def write(self, rows: list[tuple]) -> None:
+        self.fh.writelines(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + "\n" for row in rows)
+
+    def close(self) -> None:
+        self.fh.close()
+
+
+class ArrowSink:
+    # one record batch per cursor batch: a parquet row group or an Arrow IPC file block
+    def __init__(self, path: Path, columns: list[str], fmt: str = "parquet") -> None:
+        if pa is None:
+            raise RuntimeError(f"{fmt} export needs pyarrow; pip install jobpipeline[parquet]")
+        self.columns = columns
+        self.schema = pa.schema([(c, pa.int64() if c in INTEGER_COLUMNS else pa.string()) for c in columns])
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            self.writer = pq.ParquetWriter(str(path), self.schema, compression="zstd")
+        else:
+            import pyarrow.ipc as pa_ipc
+
+            self.writer = pa_ipc.new_file(str(path), self.schema)
+
+    def write(self, rows: list[tuple]) -> None:
+        arrays = [pa.array([row[i] for row in rows], type=self.schema.field(i).type) for i in range(len(self.columns))]
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        self.writer.write_batch(batch)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "parquet": lambda path, columns: ArrowSink(path, columns, "parquet"),
+    "arrow": lambda path, columns: ArrowSink(path, columns, "arrow"),
+}
+SUFFIXES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+
+def export_format(path: str, fmt: str | None = None) -> str:
+    fmt = fmt or SUFFIXES.get(Path(path).suffix.lower())
+    if fmt not in SINKS:
+        raise ValueError(f"unknown export format for {path!r}; use one of {', '.join(SINKS)}")
+    return fmt
+
+
+def export_jobs(
+    repo: SQLiteRepo,
+    path: str,
+    fmt: str | None = None,
+    flt: JobFilter | None = None,
+    include_description: bool = False,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    # Streams jobs from the repository cursor into the sink batch by batch; memory use is
+    # bounded by batch_size whatever the size of the history.
+    fmt = export_format(path, fmt)
+    where, params = (flt or JobFilter()).where()
+    columns = EXPORT_COLUMNS + (["description_hash"] if include_description else [])
+    names = EXPORT_COLUMNS + (["description_raw"] if include_description else [])
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    sink = SINKS[fmt](p, names)
+    written = 0
+    try:
+        for rows in repo.iter_jobs(columns, where, params, batch_size):
+            if include_description:
+                rows = [(*row[:-1], repo.blob_text(row[-1])) for row in rows]
+            sink.write(rows)
+            written += len(rows)
+    finally:
+        sink.close()
+    return written
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import concurrent.futures
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Iterable
 import re
 
 from jobpipeline.core.models import JobRecord, SearchProfile
@@ -14,6 +18,9 @@ FLAG_PATTERNS = {
     "onsite_required": ["onsite", "on-site"],
     "contract": ["contract", "c2c"],
 }
+HARD_FLAGS = {"clearance", "us_citizen_only", "no_sponsorship"}
+# below this many jobs per worker the process start-up costs more than it saves
+MIN_JOBS_PER_WORKER = 2000
 
 
 def _grade(score: int) -> str:
@@ -63,3 +70,158 @@ def score_job(job: JobRecord, profile: SearchProfile) -> JobRecord:
     job.flags = sorted(set(flags))
     job.fit_notes = f"must_match={len(must)-len(missing)}/{len(must)}; flags={','.join(job.flags) or 'none'}; freshness={freshness}"
     return job
+
+
+# (fit_score, fit_grade, missing_must_have, flags, fit_notes)
+ScoreResult = tuple[int, str, list[str], list[str], str]
+
+
+@dataclass(slots=True)
+class CompiledScorer:
+    # Everything score_job derives from the profile, computed once. Each distinct keyword or
+    # flag pattern is tested once per document; str.__contains__ beats a combined regex here.
+    must: list[str]
+    nice: list[str]
+    titles: list[str]
+    remote_mode: bool
+    max_years: str
+    window: timedelta
+    needles: tuple[str, ...]
+
+    @classmethod
+    def build(cls, profile: SearchProfile) -> "CompiledScorer":
+        must = [normalize_skill(x) for x in profile.must_have_keywords]
+        nice = [normalize_skill(x) for x in profile.nice_to_have_keywords]
+        patterns = [p for group in FLAG_PATTERNS.values() for p in group]
+        return cls(
+            must=must,
+            nice=nice,
+            titles=[t.lower() for t in profile.target_titles + profile.adjacent_titles],
+            remote_mode=profile.location_mode.lower() == "remote",
+            max_years=profile.experience_range.split("-")[-1],
+            window=timedelta(hours=profile.time_window_hours),
+            needles=tuple(dict.fromkeys(n for n in must + nice + patterns if n)),
+        )
+
+    def evaluate(
+        self, title: str, description: str, location_text: str, posted_date: str | None, now: datetime
+    ) -> ScoreResult:
+        text = f"{title} {description}".lower()
+        present = {n for n in self.needles if n in text}
+        missing = [m for m in self.must if m and m not in present]
+        must_score = int((len(self.must) - len(missing)) / max(len(self.must), 1) * 40)
+        nice_score = min(20, sum(1 for n in self.nice if n in present) * 4)
+        lowered_title = title.lower()
+        title_score = 20 if any(t in lowered_title for t in self.titles) else 5
+        location_score = 10 if self.remote_mode and "remote" in location_text.lower() else 5
+
+        freshness = 0
+        if posted_date:
+            try:
+                posted = datetime.fromisoformat(posted_date.replace("Z", "+00:00")).replace(tzinfo=None)
+                freshness = 10 if posted >= now - self.window else 2
+            except Exception:
+                freshness = 3
+
+        score = min(100, must_score + nice_score + title_score + location_score + freshness)
+        flags: list[str] = []
+        for flag, patterns in FLAG_PATTERNS.items():
+            if any(p in present for p in patterns):
+                flags.append(flag)
+                if flag in HARD_FLAGS:
+                    score = min(score, 40)
+
+        years = _first_years(text)
+        if years is not None and years > int(self.max_years):
+            score -= 10
+
+        score = max(0, score)
+        flags = sorted(set(flags))
+        notes = f"must_match={len(self.must)-len(missing)}/{len(self.must)}; flags={','.join(flags) or 'none'}; freshness={freshness}"
+        return score, _grade(score), missing, flags, notes
+
+    def score(self, job: JobRecord, now: datetime | None = None) -> JobRecord:
+        result = self.evaluate(job.title, job.description_raw, job.location_text, job.posted_date, now or datetime.utcnow())
+        return apply_score(job, result)
+
+
+def _first_years(text: str) -> int | None:
+    # same as the first r"(\d+)\+?\s+years" match, but anchored on the literal so the regex
+    # engine does not have to attempt a match at every offset of a long description
+    idx = text.find("years")
+    while idx != -1:
+        end = idx
+        while end > 0 and text[end - 1].isspace():
+            end -= 1
+        if end < idx:
+            if text[end - 1 : end] == "+":
+                end -= 1
+            start = end
+            while start > 0 and text[start - 1].isdecimal():
+                start -= 1
+            if start < end:
+                return int(text[start:end])
+        idx = text.find("years", idx + 5)
+    return None
+
+
+def _profile_key(profile: SearchProfile) -> tuple:
+    return (
+        tuple(profile.must_have_keywords), tuple(profile.nice_to_have_keywords), tuple(profile.target_titles),
+        tuple(profile.adjacent_titles), profile.location_mode, profile.experience_range, profile.time_window_hours,
+    )
+
+
+@lru_cache(maxsize=32)
+def _compiled(key: tuple) -> CompiledScorer:
+    must, nice, targets, adjacent, location_mode, experience_range, window = key
+    profile = SearchProfile(
+        "", list(targets), list(adjacent), location_mode, None, None, experience_range, list(must), list(nice), [], window
+    )
+    return CompiledScorer.build(profile)
+
+
+def compiled_scorer(profile: SearchProfile) -> CompiledScorer:
+    return _compiled(_profile_key(profile))
+
+
+def apply_score(job: JobRecord, result: ScoreResult) -> JobRecord:
+    job.fit_score, job.fit_grade, job.missing_must_have, job.flags, job.fit_notes = result
+    return job
+
+
+def _score_rows(key: tuple, rows: list[tuple], now: datetime) -> list[ScoreResult]:
+    scorer = _compiled(key)
+    return [scorer.evaluate(*row, now) for row in rows]
+
+
+def score_profiles(
+    jobs: list[JobRecord], profiles: list[SearchProfile], workers: int = 0
+) -> dict[str, list[ScoreResult]]:
+    # one task per profile over the shared job set; results are not applied to the jobs
+    now = datetime.utcnow()
+    keys = [_profile_key(p) for p in profiles]
+    rows = [(j.title, j.description_raw, j.location_text, j.posted_date) for j in jobs]
+    workers = min(workers, len(profiles)) if len(jobs) >= MIN_JOBS_PER_WORKER else 0
+    if workers < 2:
+        results = [_score_rows(key, rows, now) for key in keys]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_score_rows, keys, [rows] * len(keys), [now] * len(keys)))
+    return {p.name: r for p, r in zip(profiles, results)}
+
+
+def score_jobs(jobs: Iterable[JobRecord], profile: SearchProfile, workers: int = 0) -> list[JobRecord]:
+    jobs = list(jobs)
+    now = datetime.utcnow()
+    key = _profile_key(profile)
+    workers = min(workers, len(jobs) // MIN_JOBS_PER_WORKER)
+    if workers < 2:
+        scorer = _compiled(key)
+        return [scorer.score(job, now) for job in jobs]
+    rows = [(j.title, j.description_raw, j.location_text, j.posted_date) for j in jobs]
+    size = -(-len(rows) // workers)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = pool.map(_score_rows, [key] * workers, [rows[i : i + size] for i in range(0, len(rows), size)], [now] * workers)
+        results = [result for chunk in chunks for result in chunk]
+    return [apply_score(job, result) for job, result in zip(jobs, results)]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Protocol
+
+from jobpipeline.core.models import JobRecord, SearchProfile
+from jobpipeline.scoring.engine import HARD_FLAGS, _grade
+from jobpipeline.utils.lazy import lazy_import
+from jobpipeline.utils.text import word_tokens
+
+np = lazy_import("numpy")  # optional: pip install jobpipeline[relevance]
+
+
+def relevance_available() -> bool:
+    return np is not None
+
+
+class TermStore(Protocol):
+    def counted_documents(self, job_ids: list[str]) -> set[str]: ...
+
+    def document_frequencies(self, terms: list[str]) -> tuple[int, dict[str, int]]: ...
+
+    def add_documents(self, job_ids: list[str], term_counts: dict[str, int]) -> None: ...
+
+
+@dataclass(slots=True)
+class TermMatrix:
+    # sparse tf-idf matrix in coordinate form: one entry per (document, term) pair
+    vocab: dict[str, int]
+    rows: Any
+    cols: Any
+    weights: Any
+    norms: Any
+    idf: Any
+    size: int
+
+
+class RelevanceScorer:
+    # Cosine similarity between each posting and a query built from the profile's titles
+    # and keywords. Document frequencies live in SQLite and only postings that have not
+    # been counted yet add to them, so the idf stays stable across runs.
+    def __init__(self, store: TermStore | None = None, weight: float = 0.25, max_tokens: int = 200) -> None:
+        self.store = store
+        self.weight = weight
+        self.max_tokens = max_tokens
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any], store: TermStore | None = None) -> "RelevanceScorer | None":
+        rcfg = cfg.get("scoring", {}).get("relevance", {})
+        if not rcfg.get("enabled", False) or not relevance_available():
+            return None
+        return cls(store, weight=float(rcfg.get("weight", 0.25)), max_tokens=int(rcfg.get("max_tokens", 200)))
+
+    def tokens(self, job: JobRecord) -> list[str]:
+        text = f"{job.title} {job.description_raw}"
+        return word_tokens(text[: self.max_tokens * 16])[: self.max_tokens]
+
+    def matrix(self, jobs: list[JobRecord]) -> TermMatrix:
+        docs = [self.tokens(job) for job in jobs]
+        flat = list(chain.from_iterable(docs))
+        vocab = {term: i for i, term in enumerate(dict.fromkeys(flat))}
+        cols = np.fromiter(map(vocab.__getitem__, flat), dtype=np.int64, count=len(flat))
+        rows = np.repeat(np.arange(len(docs), dtype=np.int64), [len(doc) for doc in docs])
+        width = max(len(vocab), 1)
+        pairs, tf = np.unique(rows * width + cols, return_counts=True)
+        rows, cols = pairs // width, pairs % width
+        docs_seen, counts = self._frequencies(jobs, list(vocab), rows, cols)
+        idf = np.log((1.0 + docs_seen) / (1.0 + counts)) + 1.0
+
+        weights = (1.0 + np.log(tf)) * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights * weights, minlength=len(docs)))
+        return TermMatrix(vocab, rows, cols, weights, norms, idf, len(docs))
+
+    def _frequencies(self, jobs: list[JobRecord], terms: list[str], rows: Any, cols: Any) -> tuple[int, Any]:
+        batch_df = np.bincount(cols, minlength=len(terms))
+        if self.store is None:
+            return len(jobs), batch_df
+        ids = [job.job_id for job in jobs]
+        counted = self.store.counted_documents(ids)
+        fresh = np.fromiter((job_id not in counted for job_id in ids), dtype=bool, count=len(ids))
+        if fresh.any():
+            new_df = np.bincount(cols[fresh[rows]], minlength=len(terms))
+            self.store.add_documents(
+                [job_id for job_id, f in zip(ids, fresh.tolist()) if f],
+                {terms[i]: int(new_df[i]) for i in np.flatnonzero(new_df).tolist()},
+            )
+        total, stored = self.store.document_frequencies(terms)
+        counts = np.fromiter((stored.get(t, 0) for t in terms), dtype=np.float64, count=len(terms))
+        # a posting counted earlier under different text can bring terms the store has not seen
+        return max(total, 1), np.maximum(counts, 1.0)
+
+    def similarities(self, matrix: TermMatrix, profile: SearchProfile) -> Any:
+        query_terms = word_tokens(
+            " ".join(profile.target_titles + profile.adjacent_titles + profile.must_have_keywords
+                     + profile.nice_to_have_keywords)
+        )
+        query = np.zeros(len(matrix.idf))
+        for term in set(query_terms):
+            col = matrix.vocab.get(term)
+            if col is not None:
+                query[col] = matrix.idf[col]
+        qnorm = float(np.sqrt(query @ query))
+        if qnorm == 0.0:
+            return np.zeros(matrix.size)
+        dots = np.bincount(matrix.rows, matrix.weights * query[matrix.cols], minlength=matrix.size)
+        return dots / (np.where(matrix.norms > 0, matrix.norms, 1.0) * qnorm)
+
+    def blend(self, jobs: list[JobRecord], sims: Any) -> list[JobRecord]:
+        for job, sim in zip(jobs, sims.tolist()):
+            score = round((1.0 - self.weight) * job.fit_score + self.weight * 100.0 * sim)
+            if HARD_FLAGS.intersection(job.flags):
+                score = min(score, 40)
+            job.fit_score = max(0, min(100, score))
+            job.fit_grade = _grade(job.fit_score)
+            job.fit_notes = f"{job.fit_notes}; relevance={sim:.2f}"
+        return jobs
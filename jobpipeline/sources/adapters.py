@@ -1,98 +1,170 @@
 from __future__ import annotations
 
+from abc import abstractmethod
 from datetime import datetime, timedelta
-from email import policy
-from email.parser import BytesParser
-from typing import Any
-import json
+from typing import TYPE_CHECKING, Any, Callable
+import asyncio
+import importlib
 
 
 from jobpipeline.core.models import JobLink, SearchProfile
 from jobpipeline.sources.base import SourceAdapter, StubAdapter
+from jobpipeline.sources.jsonstream import JsonArrayStream
+from jobpipeline.utils.dates import parse_date
+from jobpipeline.utils.lazy import lazy_import
+
+# xml.etree is only loaded once an RSS source actually runs
+feeds = lazy_import("jobpipeline.sources.feeds")
+
+if TYPE_CHECKING:
+    import httpx
+
+    from jobpipeline.sources.http import HttpTransport
 
 
 class JsonApiAdapter(SourceAdapter):
     endpoint: str = ""
 
-    def fetch_json(self) -> Any:
-        import httpx
-        with httpx.Client(timeout=15) as client:
-            resp = client.get(self.endpoint)
-            resp.raise_for_status()
-            return resp.json()
+    def fetch_json(self, url: str | None = None) -> Any:
+        return self.http.get(self.rebase(url or self.endpoint), self.cache_ttl).json()
+
+    async def fetch_json_async(self, client: "httpx.AsyncClient", url: str | None = None) -> Any:
+        resp = await self.http.aget(client, self.rebase(url or self.endpoint), self.cache_ttl)
+        return resp.json()
 
 
-class RemoteOkAdapter(JsonApiAdapter):
+class StreamingJsonAdapter(JsonApiAdapter):
+    # Aggregator feeds are decoded one array element at a time; items outside the time
+    # window or matching an exclude keyword are dropped before they are kept, and the
+    # rest are trimmed to keep_fields.
+    items_key: str | None = None
+    keep_fields: tuple[str, ...] = ()
+
+    @staticmethod
+    @abstractmethod
+    def parse_items(items: list[dict[str, Any]]) -> list[JobLink]:
+        raise NotImplementedError
+
+    def item_filter(self, profile: SearchProfile) -> Callable[[Any], dict[str, Any] | None]:
+        cutoff = window_cutoff(profile)
+        excludes = [k.lower() for k in profile.exclude_keywords if k]
+        keep = self.keep_fields
+
+        def accept(item: Any) -> dict[str, Any] | None:
+            if not isinstance(item, dict) or not item.get("url"):
+                return None
+            posted = parse_date(posted_at(item))
+            if posted is not None and posted < cutoff:
+                return None
+            title = str(item.get("position") or item.get("title") or "").lower()
+            if any(k in title for k in excludes):
+                return None
+            return {k: item[k] for k in keep if k in item} if keep else item
+
+        return accept
+
+    def search(self, profile: SearchProfile) -> list[JobLink]:
+        if not self.enabled:
+            return []
+        try:
+            accept = self.item_filter(profile)
+            stream = JsonArrayStream(self.items_key)
+            items: list[dict[str, Any]] = []
+            variant = self.filter_variant(profile)
+            with self.http.stream(self.rebase(self.endpoint), self.cache_ttl, variant) as chunks:
+                for chunk in chunks:
+                    items.extend(filter(None, map(accept, stream.feed(chunk))))
+                    if stream.done:
+                        break
+                # inside the stream, so a body that does not decode leaves no cache entry
+                items.extend(filter(None, map(accept, stream.feed(b"", final=True))))
+            return self.parse_items(items)
+        except Exception:
+            return []
+
+    async def search_async(self, profile: SearchProfile, client: "httpx.AsyncClient") -> list[JobLink]:
+        if not self.enabled:
+            return []
+        try:
+            accept = self.item_filter(profile)
+            stream = JsonArrayStream(self.items_key)
+            items: list[dict[str, Any]] = []
+            variant = self.filter_variant(profile)
+            async with self.http.astream(client, self.rebase(self.endpoint), self.cache_ttl, variant) as chunks:
+                async for chunk in chunks:
+                    items.extend(filter(None, map(accept, stream.feed(chunk))))
+                    if stream.done:
+                        break
+                # inside the stream, so a body that does not decode leaves no cache entry
+                items.extend(filter(None, map(accept, stream.feed(b"", final=True))))
+            return self.parse_items(items)
+        except Exception:
+            return []
+
+
+class RemoteOkAdapter(StreamingJsonAdapter):
     name, domain = "remoteok_api", "remoteok.com"
     endpoint = "https://remoteok.com/api"
+    keep_fields = (
+        "id", "slug", "url", "apply_url", "position", "company", "location", "tags", "date",
+        "salary_min", "salary_max",
+    )
 
     @staticmethod
-    def parse(data: list[dict[str, Any]]) -> list[JobLink]:
+    def parse_items(items: list[dict[str, Any]]) -> list[JobLink]:
         links: list[JobLink] = []
-        for item in data:
+        for item in items:
             url = item.get("url")
             if not url:
                 continue
             links.append(JobLink(job_url=url, source_name="Remote OK API", source_domain="remoteok.com", snippet_meta=item))
         return links
 
-    def search(self, profile: SearchProfile) -> list[JobLink]:
-        _ = profile
-        if not self.enabled:
-            return []
-        try:
-            return self.parse(self.fetch_json())
-        except Exception:
-            return []
+    @staticmethod
+    def parse(data: list[dict[str, Any]]) -> list[JobLink]:
+        return RemoteOkAdapter.parse_items(data)
 
 
-class RemotiveAdapter(JsonApiAdapter):
+class RemotiveAdapter(StreamingJsonAdapter):
     name, domain = "remotive_api", "remotive.com"
     endpoint = "https://remotive.com/api/remote-jobs"
+    items_key = "jobs"
+    keep_fields = (
+        "id", "url", "title", "company_name", "category", "job_type", "publication_date",
+        "candidate_required_location", "salary", "tags",
+    )
 
     @staticmethod
-    def parse(data: dict[str, Any]) -> list[JobLink]:
-        return [
-            JobLink(j["url"], "Remotive API", "remotive.com", j)
-            for j in data.get("jobs", [])
-            if j.get("url")
-        ]
+    def parse_items(items: list[dict[str, Any]]) -> list[JobLink]:
+        return [JobLink(j["url"], "Remotive API", "remotive.com", j) for j in items if j.get("url")]
 
-    def search(self, profile: SearchProfile) -> list[JobLink]:
-        _ = profile
-        if not self.enabled:
-            return []
-        try:
-            return self.parse(self.fetch_json())
-        except Exception:
-            return []
+    @staticmethod
+    def parse(data: dict[str, Any]) -> list[JobLink]:
+        return RemotiveAdapter.parse_items(data.get("jobs", []))
 
 
-class ArbeitnowAdapter(JsonApiAdapter):
+class ArbeitnowAdapter(StreamingJsonAdapter):
     name, domain = "arbeitnow_api", "arbeitnow.com"
     endpoint = "https://www.arbeitnow.com/api/job-board-api"
+    items_key = "data"
+    keep_fields = ("slug", "url", "title", "company_name", "location", "remote", "job_types", "tags", "created_at")
 
     @staticmethod
-    def parse(data: dict[str, Any]) -> list[JobLink]:
-        return [
-            JobLink(j["url"], "Arbeitnow API", "arbeitnow.com", j)
-            for j in data.get("data", [])
-            if j.get("url")
-        ]
+    def parse_items(items: list[dict[str, Any]]) -> list[JobLink]:
+        return [JobLink(j["url"], "Arbeitnow API", "arbeitnow.com", j) for j in items if j.get("url")]
 
-    def search(self, profile: SearchProfile) -> list[JobLink]:
-        _ = profile
-        if not self.enabled:
-            return []
-        try:
-            return self.parse(self.fetch_json())
-        except Exception:
-            return []
+    @staticmethod
+    def parse(data: dict[str, Any]) -> list[JobLink]:
+        return ArbeitnowAdapter.parse_items(data.get("data", []))
 
 
 class GreenhouseApiAdapter(JsonApiAdapter):
     name, domain = "greenhouse_api", "boards.greenhouse.io"
 
+    @staticmethod
+    def board_url(board: str) -> str:
+        return f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs"
+
     @staticmethod
     def parse(data: dict[str, Any], board: str) -> list[JobLink]:
         links: list[JobLink] = []
@@ -109,16 +181,33 @@ class GreenhouseApiAdapter(JsonApiAdapter):
         out: list[JobLink] = []
         for board in self.config.get("boards", []):
             try:
-                self.endpoint = f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs"
-                out.extend(self.parse(self.fetch_json(), board))
+                out.extend(self.parse(self.fetch_json(self.board_url(board)), board))
             except Exception:
                 continue
         return out
 
+    async def search_async(self, profile: SearchProfile, client: "httpx.AsyncClient") -> list[JobLink]:
+        _ = profile
+        if not self.enabled:
+            return []
+
+        async def one(board: str) -> list[JobLink]:
+            try:
+                return self.parse(await self.fetch_json_async(client, self.board_url(board)), board)
+            except Exception:
+                return []
+
+        results = await asyncio.gather(*(one(b) for b in self.config.get("boards", [])))
+        return [link for batch in results for link in batch]
+
 
 class LeverApiAdapter(JsonApiAdapter):
     name, domain = "lever_api", "api.lever.co"
 
+    @staticmethod
+    def company_url(company: str) -> str:
+        return f"https://api.lever.co/v0/postings/{company}?mode=json"
+
     @staticmethod
     def parse(data: list[dict[str, Any]], company: str) -> list[JobLink]:
         links: list[JobLink] = []
@@ -135,48 +224,76 @@ class LeverApiAdapter(JsonApiAdapter):
         out: list[JobLink] = []
         for company in self.config.get("companies", []):
             try:
-                self.endpoint = f"https://api.lever.co/v0/postings/{company}?mode=json"
-                out.extend(self.parse(self.fetch_json(), company))
+                out.extend(self.parse(self.fetch_json(self.company_url(company)), company))
             except Exception:
                 continue
         return out
 
+    async def search_async(self, profile: SearchProfile, client: "httpx.AsyncClient") -> list[JobLink]:
+        _ = profile
+        if not self.enabled:
+            return []
+
+        async def one(company: str) -> list[JobLink]:
+            try:
+                return self.parse(await self.fetch_json_async(client, self.company_url(company)), company)
+            except Exception:
+                return []
+
+        results = await asyncio.gather(*(one(c) for c in self.config.get("companies", [])))
+        return [link for batch in results for link in batch]
+
 
 class RssAdapter(SourceAdapter):
     feed_url: str = ""
     source_name: str = "RSS"
     source_domain: str = ""
 
-    def _parse_rss(self, content: bytes) -> list[JobLink]:
-        msg = BytesParser(policy=policy.default).parsebytes(content)
-        text = msg.get_body(preferencelist=("plain", "html"))
-        payload = text.get_content() if text else content.decode("utf-8", errors="ignore")
-        # basic fallback parse for item/link
+    def _link(self, item: dict[str, str]) -> JobLink:
+        meta = {k: v for k, v in item.items() if k != "link"}
+        return JobLink(item["link"], self.source_name, self.source_domain, meta)
+
+    def search(self, profile: SearchProfile) -> list[JobLink]:
+        if not self.enabled:
+            return []
+        parser = feeds.FeedStreamParser(window_cutoff(profile))
         links: list[JobLink] = []
-        for part in payload.split("<item>")[1:]:
-            if "<link>" in part:
-                url = part.split("<link>", 1)[1].split("</link>", 1)[0].strip()
-                links.append(JobLink(url, self.source_name, self.source_domain, {}))
+        variant = self.filter_variant(profile)
+        try:
+            with self.http.stream(self.rebase(self.feed_url), self.cache_ttl, variant) as chunks:
+                for chunk in chunks:
+                    links.extend(self._link(item) for item in parser.feed(chunk))
+                    if parser.done:
+                        break
+                if parser.error is not None:
+                    # raised inside the stream so it drops the cache entry for this body
+                    raise parser.error
+        except feeds.ParseError:
+            return links
+        except Exception:
+            return []
         return links
 
-    def search(self, profile: SearchProfile) -> list[JobLink]:
-        _ = profile
+    async def search_async(self, profile: SearchProfile, client: "httpx.AsyncClient") -> list[JobLink]:
         if not self.enabled:
             return []
+        parser = feeds.FeedStreamParser(window_cutoff(profile))
+        links: list[JobLink] = []
+        variant = self.filter_variant(profile)
         try:
-            import httpx
-            with httpx.Client(timeout=15) as client:
-                r = client.get(self.feed_url)
-                r.raise_for_status()
-            txt = r.text
-            links: list[JobLink] = []
-            for part in txt.split("<item>")[1:]:
-                if "<link>" in part:
-                    url = part.split("<link>", 1)[1].split("</link>", 1)[0].strip()
-                    links.append(JobLink(url, self.source_name, self.source_domain, {}))
+            async with self.http.astream(client, self.rebase(self.feed_url), self.cache_ttl, variant) as chunks:
+                async for chunk in chunks:
+                    links.extend(self._link(item) for item in parser.feed(chunk))
+                    if parser.done:
+                        break
+                if parser.error is not None:
+                    # raised inside the stream so it drops the cache entry for this body
+                    raise parser.error
+        except feeds.ParseError:
             return links
         except Exception:
             return []
+        return links
 
 
 class WeWorkRemotelyRssAdapter(RssAdapter):
@@ -198,13 +315,11 @@ class CraigslistRssAdapter(RssAdapter):
     source_name = "Craigslist RSS"
     source_domain = "craigslist.org"
 
-    def search(self, profile: SearchProfile) -> list[JobLink]:
-        if not self.enabled:
-            return []
+    @property
+    def feed_url(self) -> str:  # type: ignore[override]
         city = self.config.get("city", "sfbay")
         category = self.config.get("category", "sof")
-        self.feed_url = f"https://{city}.craigslist.org/search/{category}?format=rss"
-        return super().search(profile)
+        return f"https://{city}.craigslist.org/search/{category}?format=rss"
 
 
 class GenericStubAdapter(StubAdapter):
@@ -214,39 +329,54 @@ class GenericStubAdapter(StubAdapter):
         self.domain = domain
 
 
-def build_adapters(sources_cfg: dict[str, dict[str, Any]]) -> list[SourceAdapter]:
-    fixed: dict[str, type[SourceAdapter]] = {
-        "remoteok_api": RemoteOkAdapter,
-        "remotive_api": RemotiveAdapter,
-        "arbeitnow_api": ArbeitnowAdapter,
-        "greenhouse_api": GreenhouseApiAdapter,
-        "lever_api": LeverApiAdapter,
-        "weworkremotely_rss": WeWorkRemotelyRssAdapter,
-        "remoteok_rss": RemoteOkRssAdapter,
-        "craigslist_rss": CraigslistRssAdapter,
-    }
+# source key -> "module:Class"; a source's config may name its own class under "adapter"
+ADAPTER_CLASSES = {
+    "remoteok_api": "jobpipeline.sources.adapters:RemoteOkAdapter",
+    "remotive_api": "jobpipeline.sources.adapters:RemotiveAdapter",
+    "arbeitnow_api": "jobpipeline.sources.adapters:ArbeitnowAdapter",
+    "greenhouse_api": "jobpipeline.sources.adapters:GreenhouseApiAdapter",
+    "lever_api": "jobpipeline.sources.adapters:LeverApiAdapter",
+    "weworkremotely_rss": "jobpipeline.sources.adapters:WeWorkRemotelyRssAdapter",
+    "remoteok_rss": "jobpipeline.sources.adapters:RemoteOkRssAdapter",
+    "craigslist_rss": "jobpipeline.sources.adapters:CraigslistRssAdapter",
+}
+
+
+def adapter_class(path: str) -> type[SourceAdapter]:
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def build_adapters(
+    sources_cfg: dict[str, dict[str, Any]], transport: "HttpTransport | None" = None
+) -> list[SourceAdapter]:
+    # classes are resolved (and their modules imported) only for sources named in the config
     adapters: list[SourceAdapter] = []
     for key, cfg in sources_cfg.items():
-        cls = fixed.get(key)
-        if cls:
-            adapters.append(cls(cfg))
+        path = cfg.get("adapter") or ADAPTER_CLASSES.get(key)
+        if path:
+            adapters.append(adapter_class(path)(cfg, transport))
         else:
             adapters.append(GenericStubAdapter(cfg, key, cfg.get("domain", key)))
     return adapters
 
 
+POSTED_KEYS = ("date", "publication_date", "created_at", "pubDate", "published", "updated")
+
+
+def window_cutoff(profile: SearchProfile) -> datetime:
+    return datetime.utcnow() - timedelta(hours=profile.time_window_hours)
+
+
+def posted_at(meta: dict[str, Any]) -> Any:
+    return next((meta[k] for k in POSTED_KEYS if meta.get(k)), None)
+
+
 def apply_time_window(links: list[JobLink], profile: SearchProfile) -> list[JobLink]:
-    cutoff = datetime.utcnow() - timedelta(hours=profile.time_window_hours)
+    cutoff = window_cutoff(profile)
     out: list[JobLink] = []
     for link in links:
-        posted = link.snippet_meta.get("date") or link.snippet_meta.get("publication_date")
-        if not posted:
-            out.append(link)
-            continue
-        try:
-            dt = datetime.fromisoformat(str(posted).replace("Z", "+00:00")).replace(tzinfo=None)
-            if dt >= cutoff:
-                out.append(link)
-        except Exception:
+        dt = parse_date(posted_at(link.snippet_meta))
+        if dt is None or dt >= cutoff:
             out.append(link)
     return out
@@ -1,17 +1,54 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit, urlunsplit
 
 from jobpipeline.core.models import JobLink, SearchProfile
 
+if TYPE_CHECKING:
+    import httpx
+
+    from jobpipeline.sources.http import HttpTransport
+
 
 class SourceAdapter(ABC):
     name: str
     domain: str
 
-    def __init__(self, config: dict[str, Any]) -> None:
+    def __init__(self, config: dict[str, Any], transport: "HttpTransport | None" = None) -> None:
         self.config = config
+        self.transport = transport
+
+    @property
+    def cache_ttl(self) -> float | None:
+        ttl = self.config.get("cache_ttl_seconds")
+        return None if ttl is None else float(ttl)
+
+    @staticmethod
+    def filter_variant(profile: SearchProfile) -> str:
+        # the parts of a profile that decide which feed items a filtering adapter keeps;
+        # used as the cache variant so each filter gets its own validators
+        excludes = ",".join(sorted({k.lower() for k in profile.exclude_keywords if k}))
+        return f"{profile.time_window_hours}h:{excludes}"
+
+    def rebase(self, url: str) -> str:
+        # "base_url" in a source's config points it at a mirror or a local stand-in: the
+        # scheme and host are replaced and the path is appended to the base path
+        base = self.config.get("base_url")
+        if not base:
+            return url
+        target, parts = urlsplit(url), urlsplit(base)
+        return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip("/") + target.path, target.query, ""))
+
+    @property
+    def http(self) -> "HttpTransport":
+        if self.transport is None:
+            from jobpipeline.sources.http import HttpTransport
+
+            self.transport = HttpTransport()
+        return self.transport
 
     @property
     def enabled(self) -> bool:
@@ -21,8 +58,16 @@ class SourceAdapter(ABC):
     def search(self, profile: SearchProfile) -> list[JobLink]:
         raise NotImplementedError
 
+    async def search_async(self, profile: SearchProfile, client: "httpx.AsyncClient") -> list[JobLink]:
+        _ = client
+        return await asyncio.to_thread(self.search, profile)
+
 
 class StubAdapter(SourceAdapter):
     def search(self, profile: SearchProfile) -> list[JobLink]:
         _ = profile
         return []
+
+    async def search_async(self, profile: SearchProfile, client: "httpx.AsyncClient") -> list[JobLink]:
+        _ = profile, client
+        return []
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,
+    stored_at REAL, accessed_at REAL, size INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+"""
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    url: str
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+    size: int
+
+
+class CacheWriter:
+    # Bodies are streamed to a temp file. A body the caller stopped reading early because
+    # it had what it needed is dropped, but its validators are still recorded so the next
+    # poll can get a 304; a body abandoned by an error or a cancellation records nothing.
+    def __init__(self, cache: "HttpCache", url: str, headers: Mapping[str, str]) -> None:
+        self.cache = cache
+        self.url = url
+        self.headers = dict(headers)
+        self.path = cache.body_path(url)
+        self.tmp = self.path.with_suffix(".tmp")
+        self.size = 0
+        self._f = self.tmp.open("wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._f.write(chunk)
+        self.size += len(chunk)
+
+    def close(self, complete: bool) -> None:
+        self._f.close()
+        if not complete:
+            self.tmp.unlink(missing_ok=True)
+        self.cache._finish(self.url, self.headers, self.tmp if complete else None, self.size if complete else 0)
+
+    def abort(self) -> None:
+        self._f.close()
+        self.tmp.unlink(missing_ok=True)
+        self.cache.forget(self.url)
+
+
+class HttpCache:
+    def __init__(self, directory: str | Path, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 0) -> None:
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.dir / "index.sqlite", check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        # while held, new validators and freshness stamps wait here until commit()
+        self._held: dict[str, tuple[Mapping[str, str], Path | None, int] | None] | None = None
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any]) -> "HttpCache | None":
+        cache_cfg = cfg.get("http_cache", {})
+        if not cache_cfg.get("enabled", False):
+            return None
+        directory = cache_cfg.get("dir") or Path(cfg.get("output_dir", ".")) / "http_cache"
+        return cls(
+            directory,
+            max_bytes=int(float(cache_cfg.get("max_mb", 64)) * 1024 * 1024),
+            ttl_seconds=float(cache_cfg.get("ttl_seconds", 0)),
+        )
+
+    def body_path(self, url: str) -> Path:
+        return self.dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.body"
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT url, etag, last_modified, stored_at, size FROM entries WHERE url=?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE entries SET accessed_at=? WHERE url=?", (time.time(), url))
+            self.conn.commit()
+        return CacheEntry(*row)
+
+    def is_fresh(self, entry: CacheEntry, ttl_seconds: float | None = None) -> bool:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        return ttl > 0 and time.time() - entry.stored_at < ttl
+
+    @staticmethod
+    def validators(entry: CacheEntry | None) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    @staticmethod
+    def cacheable(headers: Mapping[str, str]) -> bool:
+        return bool(headers.get("etag") or headers.get("last-modified"))
+
+    def hold(self) -> None:
+        # A pipeline run holds the cache from its search until its jobs are saved: a run
+        # that is cancelled or fails must not leave validators behind that would turn the
+        # next poll of the same feeds into a 304 for postings that were never stored.
+        with self._lock:
+            self._held = {}
+
+    def commit(self) -> None:
+        with self._lock:
+            held, self._held = self._held, None
+        for url, staged in (held or {}).items():
+            if staged is None:
+                self.touch(url)
+            else:
+                self._finish(url, *staged)
+
+    def discard(self) -> None:
+        with self._lock:
+            held, self._held = self._held, None
+        for staged in (held or {}).values():
+            if staged is not None and staged[1] is not None:
+                staged[1].unlink(missing_ok=True)
+
+    def begin(self, url: str, headers: Mapping[str, str]) -> "CacheWriter":
+        return CacheWriter(self, url, headers)
+
+    def store(self, url: str, headers: Mapping[str, str], chunks: Iterable[bytes]) -> None:
+        writer = self.begin(url, headers)
+        for chunk in chunks:
+            writer.write(chunk)
+        writer.close(complete=True)
+
+    def _finish(self, url: str, headers: Mapping[str, str], body: Path | None, size: int) -> None:
+        # body is the finished temp file, None for a body the caller stopped reading early
+        with self._lock:
+            if self._held is not None:
+                if body is not None:
+                    staged = body.with_suffix(".staged")
+                    os.replace(body, staged)
+                    body = staged
+                self._drop_held(url)
+                self._held[url] = (headers, body, size)
+                return
+        if body is not None:
+            os.replace(body, self.body_path(url))
+        else:
+            self.body_path(url).unlink(missing_ok=True)
+        self._record(url, headers, size)
+
+    def _drop_held(self, url: str) -> None:
+        # caller holds the lock
+        staged = self._held.pop(url, None) if self._held is not None else None
+        if staged is not None and staged[1] is not None:
+            staged[1].unlink(missing_ok=True)
+
+    def _record(self, url: str, headers: Mapping[str, str], size: int) -> None:
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?,?,?,?,?,?)",
+                (url, headers.get("etag"), headers.get("last-modified"), now, now, size),
+            )
+            self.conn.commit()
+        self.evict()
+
+    def forget(self, url: str) -> None:
+        with self._lock:
+            self._drop_held(url)
+            self.conn.execute("DELETE FROM entries WHERE url=?", (url,))
+            self.conn.commit()
+        self.body_path(url).unlink(missing_ok=True)
+
+    def touch(self, url: str) -> None:
+        now = time.time()
+        with self._lock:
+            if self._held is not None:
+                self._held.setdefault(url, None)
+                return
+            self.conn.execute("UPDATE entries SET stored_at=?, accessed_at=? WHERE url=?", (now, now, url))
+            self.conn.commit()
+
+    def read_body(self, url: str) -> bytes | None:
+        path = self.body_path(url)
+        return path.read_bytes() if path.exists() else None
+
+    def total_size(self) -> int:
+        with self._lock:
+            return int(self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+
+    def evict(self) -> None:
+        with self._lock:
+            total = int(self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+            if total <= self.max_bytes:
+                return
+            victims: list[str] = []
+            for url, size in self.conn.execute("SELECT url, size FROM entries ORDER BY accessed_at"):
+                if total <= self.max_bytes:
+                    break
+                victims.append(url)
+                total -= size
+            self.conn.executemany("DELETE FROM entries WHERE url=?", [(u,) for u in victims])
+            self.conn.commit()
+        for url in victims:
+            self.body_path(url).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Iterator
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+from jobpipeline.utils.dates import parse_date
+
+ITEM_TAGS = {"item", "entry"}
+DATE_TAGS = ("pubDate", "published", "updated", "date")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _item_fields(elem: Element) -> dict[str, str]:
+    fields: dict[str, str] = {}
+    for child in elem:
+        tag = _local(child.tag)
+        if tag == "link":
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                fields.setdefault("link", href.strip())
+            elif child.text and child.text.strip():
+                fields.setdefault("link", child.text.strip())
+        elif tag in {"title", "guid", "id", "category", "author", *DATE_TAGS}:
+            text = (child.text or "").strip()
+            if text:
+                fields.setdefault(tag, text)
+    if "link" not in fields:
+        guid = fields.get("guid") or fields.get("id") or ""
+        if guid.startswith("http"):
+            fields["link"] = guid
+    return fields
+
+
+class FeedStreamParser:
+    # Incremental RSS/Atom item parser: completed <item>/<entry> elements are detached
+    # from the tree as soon as they are read, so memory stays flat for any feed size.
+    def __init__(self, cutoff: datetime | None = None, stale_limit: int = 3) -> None:
+        self.cutoff = cutoff
+        self.stale_limit = stale_limit
+        self.done = False
+        # set when the body is not well-formed XML (e.g. an undeclared &nbsp;); the items
+        # before the error are still returned, the rest of the feed is not read
+        self.error: ParseError | None = None
+        self._stale = 0
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._stack: list[Element] = []
+
+    def feed(self, chunk: bytes) -> list[dict[str, str]]:
+        if self.done:
+            return []
+        items: list[dict[str, str]] = []
+        try:
+            self._parser.feed(chunk)
+            self._read(items)
+        except ParseError as exc:
+            self.error = exc
+            self.done = True
+        return items
+
+    def _read(self, items: list[dict[str, str]]) -> None:
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._stack.append(elem)
+                continue
+            self._stack.pop()
+            if _local(elem.tag) not in ITEM_TAGS:
+                continue
+            fields = _item_fields(elem)
+            if self._stack:
+                self._stack[-1].remove(elem)
+            elem.clear()
+            if self._is_stale(fields):
+                self._stale += 1
+                if self._stale >= self.stale_limit:
+                    self.done = True
+                    return
+                continue
+            self._stale = 0
+            if fields.get("link"):
+                items.append(fields)
+
+    def _is_stale(self, fields: dict[str, str]) -> bool:
+        if self.cutoff is None:
+            return False
+        posted = parse_date(next((fields[t] for t in DATE_TAGS if t in fields), None))
+        return posted is not None and posted < self.cutoff
+
+
+def iter_feed_items(chunks: Iterable[bytes], cutoff: datetime | None = None) -> Iterator[dict[str, str]]:
+    parser = FeedStreamParser(cutoff)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
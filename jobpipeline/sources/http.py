@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Iterator
+
+import httpx
+
+from jobpipeline.utils.throttle import DomainThrottle, jittered, retry_after_seconds
+
+if TYPE_CHECKING:
+    from jobpipeline.sources.cache import CacheWriter, HttpCache
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# answers that mean "slow down": the whole domain backs off, not just the one request
+THROTTLE_STATUSES = {429, 503}
+# only these are duplicated by hedging
+IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+
+class NotModified(Exception):
+    pass
+
+
+def cache_key(url: str, variant: str = "") -> str:
+    return f"{url}#{variant}" if variant else url
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, inner: httpx.AsyncByteStream, sem: asyncio.Semaphore) -> None:
+        self._inner = inner
+        self._sem = sem
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._sem.release()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._inner:
+                yield chunk
+        finally:
+            self.release()
+
+    async def aclose(self) -> None:
+        try:
+            await self._inner.aclose()
+        finally:
+            self.release()
+
+
+class HostSlots:
+    # per-host concurrency; a slot stays held until the response body is closed
+    def __init__(self, per_domain: int) -> None:
+        self._per_domain = max(1, per_domain)
+        self._sems: dict[str, asyncio.Semaphore] = {}
+
+    async def send(
+        self, request: httpx.Request, send: Callable[[httpx.Request], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        sem = self._sems.setdefault(request.url.host, asyncio.Semaphore(self._per_domain))
+        await sem.acquire()
+        try:
+            response = await send(request)
+        except BaseException:
+            sem.release()
+            raise
+        if isinstance(response.stream, httpx.ByteStream):
+            sem.release()
+        else:
+            response.stream = _ReleasingStream(response.stream, sem)
+        return response
+
+
+class DomainLimitedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, slots: HostSlots) -> None:
+        self._inner = inner
+        self.slots = slots
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.slots.send(request, self._inner.handle_async_request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class RetryingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    # Retries transport errors and RETRY_STATUSES with jittered exponential backoff. With a
+    # throttle every attempt first takes a token for its host, 429/503 back off the whole
+    # domain (for Retry-After when given) and async GETs still waiting for headers past the
+    # domain's p95 latency get one hedged duplicate; whichever answers first is used.
+    # Latency is measured from when the token is granted, so time queued on our own bucket
+    # never counts as a slow server. Hedges take a token and, given `slots`, a per-host
+    # slot of their own like any other request.
+    def __init__(
+        self,
+        inner: Any,
+        retries: int,
+        backoff_seconds: float = 0.5,
+        throttle: DomainThrottle | None = None,
+        slots: HostSlots | None = None,
+    ) -> None:
+        self._inner = inner
+        self._retries = max(0, retries)
+        self._backoff = backoff_seconds
+        self._throttle = throttle
+        self._slots = slots
+
+    def _delay(self, attempt: int) -> float:
+        return jittered(self._backoff * (2**attempt))
+
+    def _pause(self, request: httpx.Request, response: httpx.Response, attempt: int) -> float | None:
+        # how long to sleep before the next attempt; None hands this response back instead
+        retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+        if response.status_code not in THROTTLE_STATUSES:
+            return self._delay(attempt)
+        if self._throttle is not None:
+            # the next acquire waits out the domain-wide pause
+            return None if self._throttle.backoff(request.url.host, retry_after) is None else 0.0
+        return self._delay(attempt) if retry_after is None else retry_after
+
+    def _observe(self, request: httpx.Request, response: httpx.Response, started: float) -> None:
+        if self._throttle is not None and response.status_code not in RETRY_STATUSES:
+            self._throttle.record(request.url.host, time.perf_counter() - started)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self._retries + 1):
+            last = attempt == self._retries
+            if self._throttle is not None:
+                self._throttle.acquire(request.url.host)
+            started = time.perf_counter()
+            try:
+                response = self._inner.handle_request(request)
+            except httpx.TransportError:
+                if last:
+                    raise
+                time.sleep(self._delay(attempt))
+                continue
+            self._observe(request, response, started)
+            if response.status_code not in RETRY_STATUSES or last:
+                return response
+            pause = self._pause(request, response, attempt)
+            if pause is None:
+                return response
+            response.close()
+            time.sleep(pause)
+        raise AssertionError("unreachable")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self._retries + 1):
+            last = attempt == self._retries
+            try:
+                response, started = await self._send_async(request)
+            except httpx.TransportError:
+                if last:
+                    raise
+                await asyncio.sleep(self._delay(attempt))
+                continue
+            self._observe(request, response, started)
+            if response.status_code not in RETRY_STATUSES or last:
+                return response
+            pause = self._pause(request, response, attempt)
+            if pause is None:
+                return response
+            await response.aclose()
+            await asyncio.sleep(pause)
+        raise AssertionError("unreachable")
+
+    async def _attempt(
+        self, request: httpx.Request, sent: asyncio.Event | None = None
+    ) -> tuple[httpx.Response, float]:
+        if self._throttle is not None:
+            await self._throttle.acquire_async(request.url.host)
+        started = time.perf_counter()
+        if sent is not None:
+            sent.set()
+        return await self._inner.handle_async_request(request), started
+
+    async def _hedge(self, request: httpx.Request) -> tuple[httpx.Response, float]:
+        if self._slots is None:
+            return await self._attempt(request)
+        started = 0.0
+
+        async def send(request: httpx.Request) -> httpx.Response:
+            nonlocal started
+            response, started = await self._attempt(request)
+            return response
+
+        return await self._slots.send(request, send), started
+
+    async def _send_async(self, request: httpx.Request) -> tuple[httpx.Response, float]:
+        host = request.url.host
+        hedge_after = None
+        if self._throttle is not None and request.method in IDEMPOTENT_METHODS:
+            hedge_after = self._throttle.hedge_delay(host)
+        if hedge_after is None:
+            return await self._attempt(request)
+        sent = asyncio.Event()
+        primary = asyncio.ensure_future(self._attempt(request, sent))
+        tasks = [primary]
+        try:
+            # the hedge timer starts once the primary is on the wire, not while it waits for a token
+            on_wire = asyncio.ensure_future(sent.wait())
+            await asyncio.wait([primary, on_wire], return_when=asyncio.FIRST_COMPLETED)
+            on_wire.cancel()
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            # checked again: other requests may have used up the hedge budget meanwhile
+            if not done and self._throttle.hedge_delay(host) is not None:
+                self._throttle.hedge_started(host)
+                tasks.append(asyncio.ensure_future(self._hedge(request)))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                answered = [task for task in tasks if task in done and task.exception() is None]
+                if answered:
+                    for extra in answered[1:]:
+                        await extra.result()[0].aclose()
+                    if answered[0] is not primary:
+                        self._throttle.hedge_won(host)
+                    return answered[0].result()
+            raise primary.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def close(self) -> None:
+        self._inner.close()
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class HttpTransport:
+    # One sync client per process keeps keep-alive pools per host. Async clients are
+    # bound to an event loop, so async_client() hands out one per run with the same
+    # pool, retry and timeout settings.
+    def __init__(self, collector_cfg: dict[str, Any] | None = None, cache: "HttpCache | None" = None) -> None:
+        cfg = collector_cfg or {}
+        self.cache = cache
+        self.timeout = float(cfg.get("timeout_seconds", 15))
+        self.retries = int(cfg.get("retries", 0))
+        self.max_concurrency = int(cfg.get("max_concurrency", 8))
+        self.per_domain = int(cfg.get("per_domain_concurrency", 2))
+        self.max_keepalive = int(cfg.get("max_keepalive_connections", 20))
+        self.http2 = bool(cfg.get("http2", False)) and _http2_available()
+        self.user_agent = str(cfg.get("user_agent", "jobpipeline/0.1"))
+        self.backoff_seconds = float(cfg.get("backoff_seconds", 0.5))
+        # shared by the sync client and every async client, so all requests to a domain draw on one bucket
+        self.throttle = DomainThrottle.from_config(cfg)
+        self._client: httpx.Client | None = None
+
+    def _limits(self, max_connections: int | None = None) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=30,
+        )
+
+    def _client_kwargs(self) -> dict[str, Any]:
+        return {
+            "timeout": self.timeout,
+            "follow_redirects": True,
+            "headers": {"User-Agent": self.user_agent},
+        }
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            inner = httpx.HTTPTransport(http2=self.http2, limits=self._limits())
+            self._client = httpx.Client(
+                transport=RetryingTransport(inner, self.retries, self.backoff_seconds, self.throttle),
+                **self._client_kwargs(),
+            )
+        return self._client
+
+    def async_client(self) -> httpx.AsyncClient:
+        inner = httpx.AsyncHTTPTransport(http2=self.http2, limits=self._limits(self.max_concurrency))
+        slots = HostSlots(self.per_domain)
+        retrying = RetryingTransport(inner, self.retries, self.backoff_seconds, self.throttle, slots)
+        transport = DomainLimitedTransport(retrying, slots)
+        return httpx.AsyncClient(transport=transport, **self._client_kwargs())
+
+    # Cache entries are keyed by URL plus `variant`: adapters that filter a feed by the
+    # profile pass the filter, so a feed read for one profile is not a 304 for another.
+    def _conditional_headers(self, key: str, ttl_seconds: float | None) -> dict[str, str]:
+        if self.cache is None:
+            return {}
+        entry = self.cache.lookup(key)
+        if entry is not None and self.cache.is_fresh(entry, ttl_seconds):
+            raise NotModified(key)
+        return self.cache.validators(entry)
+
+    def _check(self, key: str, resp: httpx.Response) -> None:
+        if resp.status_code == 304 and self.cache is not None:
+            self.cache.touch(key)
+            raise NotModified(key)
+        resp.raise_for_status()
+
+    def _writer(self, key: str, resp: httpx.Response) -> "CacheWriter | None":
+        if self.cache is not None and self.cache.cacheable(resp.headers):
+            return self.cache.begin(key, resp.headers)
+        return None
+
+    def _finish(self, key: str, resp: httpx.Response) -> httpx.Response:
+        self._check(key, resp)
+        if self.cache is not None and self.cache.cacheable(resp.headers):
+            self.cache.store(key, resp.headers, [resp.content])
+        return resp
+
+    def get(self, url: str, ttl_seconds: float | None = None, variant: str = "") -> httpx.Response:
+        key = cache_key(url, variant)
+        headers = self._conditional_headers(key, ttl_seconds)
+        return self._finish(key, self.client.get(url, headers=headers))
+
+    async def aget(
+        self, client: httpx.AsyncClient, url: str, ttl_seconds: float | None = None, variant: str = ""
+    ) -> httpx.Response:
+        key = cache_key(url, variant)
+        headers = self._conditional_headers(key, ttl_seconds)
+        return self._finish(key, await client.get(url, headers=headers))
+
+    @contextmanager
+    def stream(self, url: str, ttl_seconds: float | None = None, variant: str = "") -> Iterator[Iterator[bytes]]:
+        key = cache_key(url, variant)
+        headers = self._conditional_headers(key, ttl_seconds)
+        with self.client.stream("GET", url, headers=headers) as resp:
+            self._check(key, resp)
+            writer = self._writer(key, resp)
+            complete = False
+
+            def chunks() -> Iterator[bytes]:
+                nonlocal complete
+                for chunk in resp.iter_bytes():
+                    if writer is not None:
+                        writer.write(chunk)
+                    yield chunk
+                complete = True
+
+            try:
+                yield chunks()
+            except BaseException:
+                # a read or parse error, or the source deadline: the next poll must fetch the body again
+                if writer is not None:
+                    writer.abort()
+                raise
+            if writer is not None:
+                writer.close(complete)
+
+    @asynccontextmanager
+    async def astream(
+        self, client: httpx.AsyncClient, url: str, ttl_seconds: float | None = None, variant: str = ""
+    ) -> AsyncIterator[AsyncIterator[bytes]]:
+        key = cache_key(url, variant)
+        headers = self._conditional_headers(key, ttl_seconds)
+        async with client.stream("GET", url, headers=headers) as resp:
+            self._check(key, resp)
+            writer = self._writer(key, resp)
+            complete = False
+
+            async def chunks() -> AsyncIterator[bytes]:
+                nonlocal complete
+                async for chunk in resp.aiter_bytes():
+                    if writer is not None:
+                        writer.write(chunk)
+                    yield chunk
+                complete = True
+
+            try:
+                yield chunks()
+            except BaseException:
+                # a read or parse error, or the source deadline: the next poll must fetch the body again
+                if writer is not None:
+                    writer.abort()
+                raise
+            if writer is not None:
+                writer.close(complete)
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        if self.cache is not None:
+            self.cache.close()
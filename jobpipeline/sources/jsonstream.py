@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WS = " \t\r\n"
+_DELIMS = _WS + ",:]}"
+_decoder = json.JSONDecoder()
+
+
+class JsonArrayStream:
+    # Decodes one element at a time from a JSON array that is either the document
+    # itself (key=None) or the value of a top-level object key. Only the undecoded
+    # tail of the input is buffered, never the whole payload.
+    def __init__(self, key: str | None = None) -> None:
+        self.key = key
+        self.done = False
+        self._utf8 = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+
+    def feed(self, chunk: bytes, final: bool = False) -> list[Any]:
+        if self.done:
+            return []
+        self._buf = self._buf[self._pos :] + self._utf8.decode(chunk, final)
+        self._pos = 0
+        out: list[Any] = []
+        while not self.done and self._step(out, final):
+            pass
+        return out
+
+    def _skip(self, chars: str = _WS) -> str | None:
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in chars:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _value(self, final: bool) -> tuple[bool, Any]:
+        try:
+            value, end = _decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return False, None
+        # a number cut at the chunk edge ("12" of "12.5") must not be accepted early
+        if not final and (end >= len(self._buf) or self._buf[end] not in _DELIMS):
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _step(self, out: list[Any], final: bool) -> bool:
+        ch = self._skip()
+        if ch is None:
+            return False
+        state = self._state
+        if state == "start":
+            expected = "[" if self.key is None else "{"
+            if ch != expected:
+                raise ValueError(f"expected {expected!r} at start of JSON document")
+            self._pos += 1
+            self._state = "items" if self.key is None else "key"
+            return True
+        if state == "key":
+            if ch == "}":
+                self.done = True
+                return False
+            if ch == ",":
+                self._pos += 1
+                return True
+            ok, key = self._value(final)
+            if ok:
+                self._state = "target" if key == self.key else "skip"
+            return ok
+        if state in {"target", "skip"}:
+            if ch != ":":
+                raise ValueError("expected ':' after object key")
+            self._pos += 1
+            self._state = "open" if state == "target" else "value"
+            return True
+        if state == "value":
+            ok, _ = self._value(final)
+            if ok:
+                self._state = "key"
+            return ok
+        if state == "open":
+            if ch != "[":
+                raise ValueError(f"expected an array under {self.key!r}")
+            self._pos += 1
+            self._state = "items"
+            return True
+        if ch == "]":
+            self.done = True
+            return False
+        if ch == ",":
+            self._pos += 1
+            return True
+        ok, value = self._value(final)
+        if ok:
+            out.append(value)
+        return ok
+
+
+def iter_json_items(chunks: Iterable[bytes], key: str | None = None) -> Iterator[Any]:
+    stream = JsonArrayStream(key)
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+        if stream.done:
+            return
+    yield from stream.feed(b"", final=True)
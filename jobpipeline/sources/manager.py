@@ -1,25 +1,64 @@
 from __future__ import annotations
 
+import asyncio
 from urllib.parse import urlparse
 
+from jobpipeline.core.control import RunControl
 from jobpipeline.core.models import JobLink, SearchProfile
 from jobpipeline.sources.adapters import apply_time_window, build_adapters
+from jobpipeline.sources.base import SourceAdapter
+from jobpipeline.sources.http import HttpTransport
 
 
 class SourceManager:
-    def __init__(self, cfg: dict) -> None:
+    def __init__(self, cfg: dict, transport: HttpTransport | None = None) -> None:
         self.cfg = cfg
-        self.adapters = build_adapters(cfg.get("sources", {}))
+        self.transport = transport or HttpTransport(cfg.get("collector", {}))
+        self.adapters = build_adapters(cfg.get("sources", {}), self.transport)
+        # id(link) -> name of the adapter that returned it, for the last search
+        self.last_origins: dict[int, str] = {}
 
-    def search(self, profile: SearchProfile) -> list[JobLink]:
+    def enabled_names(self) -> list[str]:
+        return [a.name for a in self.adapters if a.enabled]
+
+    def search(
+        self, profile: SearchProfile, control: RunControl | None = None, only: list[str] | None = None
+    ) -> list[JobLink]:
+        if control is None:
+            return asyncio.run(self.search_async(profile, only=only))
+        return asyncio.run(control.guard(self.search_async(profile, control, only)))
+
+    async def search_async(
+        self, profile: SearchProfile, control: RunControl | None = None, only: list[str] | None = None
+    ) -> list[JobLink]:
+        # `only` restricts the search to the named adapters (the daemon polls the due ones)
+        collector = self.cfg.get("collector", {})
+        deadline = float(collector.get("source_deadline_seconds", 30))
+        gate = asyncio.Semaphore(max(1, int(collector.get("max_concurrency", 8))))
+
+        enabled = [a for a in self.adapters if a.enabled and (only is None or a.name in only)]
+
+        async def run_one(adapter: SourceAdapter) -> list[JobLink]:
+            async with gate:
+                try:
+                    found = await asyncio.wait_for(adapter.search_async(profile, client), deadline)
+                except Exception as exc:
+                    found, error = [], f"{type(exc).__name__}: {exc}"[:200]
+                else:
+                    error = None
+            if control is not None:
+                control.emit("source", name=adapter.name, links=len(found), error=error, total=len(enabled))
+            return found
+
+        async with self.transport.async_client() as client:
+            results = await asyncio.gather(*(run_one(a) for a in enabled))
+        self.last_origins = {id(link): a.name for a, batch in zip(enabled, results) for link in batch}
+        links = [link for batch in results for link in batch]
+        return self.filter_links(links, profile)
+
+    def filter_links(self, links: list[JobLink], profile: SearchProfile) -> list[JobLink]:
         include = set(self.cfg.get("include_domains", []))
         exclude = set(self.cfg.get("exclude_domains", []))
-        links: list[JobLink] = []
-        for adapter in self.adapters:
-            try:
-                links.extend(adapter.search(profile))
-            except Exception:
-                continue
         out: list[JobLink] = []
         for link in apply_time_window(links, profile):
             domain = urlparse(link.job_url).netloc
@@ -30,6 +69,16 @@ class SourceManager:
             out.append(link)
         return out
 
+    def profile_links(self, links: list[JobLink], profile: SearchProfile) -> list[JobLink]:
+        # narrows a combined fetch back down to what this profile alone would have kept
+        excludes = [k.lower() for k in profile.exclude_keywords if k]
+        out: list[JobLink] = []
+        for link in apply_time_window(links, profile):
+            title = str(link.snippet_meta.get("position") or link.snippet_meta.get("title") or "").lower()
+            if not any(k in title for k in excludes):
+                out.append(link)
+        return out
+
     def h1b_mode_links(self, profile: SearchProfile) -> list[JobLink]:
         links: list[JobLink] = []
         source_by_name = {a.name: a for a in self.adapters}
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import hashlib
+import zlib
+
+from jobpipeline.utils.lazy import lazy_import
+
+zstandard = lazy_import("zstandard")  # optional: the `zstd` extra, chosen with storage.description_codec
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+# zlib needs nothing installed, so a database written with it opens on any install
+DEFAULT_CODEC = "zlib"
+CODECS = ("zlib", "zstd")
+
+
+def check_codec(codec: str) -> str:
+    if codec not in CODECS:
+        raise ValueError(f"unknown blob codec {codec!r}; available: {', '.join(CODECS)}")
+    if codec == "zstd" and zstandard is None:
+        raise RuntimeError("description_codec zstd needs the zstd extra: pip install jobpipeline[zstd]")
+    return codec
+
+
+def text_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def compress_text(text: str, codec: str = DEFAULT_CODEC) -> bytes:
+    data = text.encode("utf-8")
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if codec == "zlib":
+        return zlib.compress(data, ZLIB_LEVEL)
+    raise ValueError(f"unknown blob codec {codec!r}")
+
+
+def decompress_text(body: bytes, codec: str) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("description stored with zstd; pip install jobpipeline[zstd] to read it")
+        return zstandard.ZstdDecompressor().decompress(body).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(body).decode("utf-8")
+    raise ValueError(f"unknown blob codec {codec!r}")
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+
+@dataclass(slots=True)
+class JobFilter:
+    # conditions on the jobs table, rendered as one WHERE clause; empty fields do not filter
+    grades: list[str] = field(default_factory=list)
+    since_hours: float | None = None
+    sources: list[str] = field(default_factory=list)
+    min_score: int | None = None
+
+    def where(self, now: datetime | None = None) -> tuple[str, list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if self.grades:
+            clauses.append(f"fit_grade IN ({','.join('?' * len(self.grades))})")
+            params.extend(self.grades)
+        if self.since_hours is not None:
+            clauses.append("last_seen >= ?")
+            params.append(((now or datetime.utcnow()) - timedelta(hours=self.since_hours)).isoformat())
+        if self.sources:
+            clauses.append(
+                f"job_id IN (SELECT job_id FROM job_sources_seen WHERE source_name IN ({','.join('?' * len(self.sources))}) "
+                f"OR source_domain IN ({','.join('?' * len(self.sources))}))"
+            )
+            params.extend(self.sources + self.sources)
+        if self.min_score is not None:
+            clauses.append("fit_score >= ?")
+            params.append(self.min_score)
+        return " AND ".join(clauses), params
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import re
 import sqlite3
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterable, Iterator
 
-from jobpipeline.core.models import JobRecord
+from jobpipeline.core.models import JobRecord, RunStats
+from jobpipeline.storage.blobs import DEFAULT_CODEC, check_codec, compress_text, decompress_text, text_digest
+from jobpipeline.storage.filters import JobFilter
+from jobpipeline.utils.urls import canonicalize_url
 
 
 SCHEMA = """
@@ -18,28 +26,498 @@ CREATE TABLE IF NOT EXISTS jobs (
     flags TEXT, user_status TEXT, user_notes TEXT
 );
 CREATE TABLE IF NOT EXISTS job_sources_seen (job_id TEXT, source_name TEXT, source_domain TEXT);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_job_sources_seen ON job_sources_seen(job_id, source_name, source_domain);
 CREATE TABLE IF NOT EXISTS runs (run_id INTEGER PRIMARY KEY AUTOINCREMENT, started_at TEXT, finished_at TEXT, num_found INTEGER, num_collected INTEGER, num_failed INTEGER, num_merged INTEGER, num_exported INTEGER);
 CREATE TABLE IF NOT EXISTS run_errors (run_id INTEGER, domain TEXT, reason TEXT, trace_summary TEXT);
+CREATE TABLE IF NOT EXISTS link_fingerprints (content_fp TEXT PRIMARY KEY, job_id TEXT, canonical_url TEXT, last_seen TEXT);
+CREATE INDEX IF NOT EXISTS idx_link_fingerprints_url ON link_fingerprints(canonical_url);
+CREATE INDEX IF NOT EXISTS idx_link_fingerprints_job ON link_fingerprints(job_id);
+CREATE TABLE IF NOT EXISTS failed_links (
+    job_url TEXT PRIMARY KEY, source_name TEXT, source_domain TEXT, snippet_meta TEXT, origin TEXT,
+    attempts INTEGER, last_failed TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS canonical_index (canonical_key TEXT PRIMARY KEY, job_id TEXT, canonical_url TEXT) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_canonical_index_job ON canonical_index(job_id);
+CREATE TABLE IF NOT EXISTS job_scores (
+    job_id TEXT, profile TEXT, fit_score INTEGER, fit_grade TEXT, fit_notes TEXT,
+    missing_must_have TEXT, flags TEXT, scored_at TEXT, PRIMARY KEY (job_id, profile)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_job_scores_profile ON job_scores(profile, fit_score);
+CREATE TABLE IF NOT EXISTS relevance_docs (job_id TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS relevance_terms (term TEXT PRIMARY KEY, df INTEGER) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS job_signatures (job_id TEXT PRIMARY KEY, company_key TEXT, title_key TEXT, signature BLOB);
+CREATE TABLE IF NOT EXISTS lsh_buckets (bucket INTEGER, job_id TEXT, PRIMARY KEY (bucket, job_id)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_lsh_buckets_job ON lsh_buckets(job_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_score ON jobs(COALESCE(fit_score, -1), job_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(COALESCE(last_seen, ''), job_id);
+CREATE TABLE IF NOT EXISTS description_blobs (digest TEXT PRIMARY KEY, codec TEXT, raw_size INTEGER, refs INTEGER, body BLOB);
+CREATE TABLE IF NOT EXISTS source_schedule (
+    source TEXT PRIMARY KEY, interval_seconds REAL, next_due REAL, last_polled REAL, rate REAL, polls INTEGER
+) WITHOUT ROWID;
+CREATE VIEW IF NOT EXISTS job_search_content AS
+    SELECT j.rowid AS rowid, j.title, j.company, j.location_text, description_text(b.codec, b.body) AS description
+    FROM jobs j LEFT JOIN description_blobs b ON b.digest = j.description_hash;
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, location_text, description,
+    content='job_search_content', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
 """
+# bm25 weights for title, company, location_text, description
+FTS_RANK = "bm25(10.0, 5.0, 2.0, 1.0)"
+
+# columns added after the first release; created on open for older databases
+MIGRATIONS = {
+    "jobs": {"possible_duplicate": "INTEGER DEFAULT 0", "description_hash": "TEXT"},
+    "runs": {"num_new": "INTEGER", "num_changed": "INTEGER", "num_unchanged": "INTEGER"},
+}
+# stay well under SQLITE_MAX_VARIABLE_NUMBER on old builds
+PARAM_CHUNK = 500
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA busy_timeout=5000",
+)
+
+JOB_COLUMNS = (
+    "job_id", "source_domain", "source_name", "job_url", "canonical_url", "apply_url", "title", "company",
+    "location_text", "remote_flag", "employment_type", "posted_date", "collected_at", "description_hash",
+    "salary_text", "skills_extracted", "fetch_status", "failure_reason", "first_seen", "last_seen",
+    "repost_count", "merged_from", "fit_score", "fit_grade", "fit_notes", "missing_must_have", "flags",
+    "user_status", "user_notes", "possible_duplicate",
+)
+INTEGER_COLUMNS = {"repost_count", "fit_score", "possible_duplicate"}
+SEARCH_FIELDS = [JOB_COLUMNS.index(c) for c in ("title", "company", "location_text", "description_hash")]
+# kept from the stored row when a job is seen again
+PRESERVED_COLUMNS = {"job_id", "first_seen", "repost_count", "user_status", "user_notes"}
+
+UPSERT_JOB_SQL = (
+    f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) VALUES ({', '.join('?' for _ in JOB_COLUMNS)}) "
+    "ON CONFLICT(job_id) DO UPDATE SET "
+    + ", ".join(f"{c}=excluded.{c}" for c in JOB_COLUMNS if c not in PRESERVED_COLUMNS)
+    # a repost is a later sighting with a new description or posting date; re-runs and
+    # repeats of a job within one batch leave the count alone
+    + ", repost_count=COALESCE(jobs.repost_count, 0) + ("
+    "excluded.last_seen > COALESCE(jobs.last_seen, '') AND ("
+    "excluded.description_hash IS NOT jobs.description_hash OR excluded.posted_date IS NOT jobs.posted_date))"
+)
+
+
+def job_row(job: JobRecord, description_hash: str | None) -> tuple:
+    # the description itself lives in description_blobs; jobs.description_raw is only read by the migration
+    return (
+        job.job_id, job.source_domain, job.source_name, job.job_url, job.canonical_url,
+        job.apply_url, job.title, job.company, job.location_text, job.remote_flag, job.employment_type,
+        job.posted_date, job.collected_at, description_hash, job.salary_text, ",".join(job.skills_extracted),
+        job.fetch_status, job.failure_reason, job.first_seen, job.last_seen, job.repost_count, ",".join(job.merged_from),
+        job.fit_score, job.fit_grade, job.fit_notes, ",".join(job.missing_must_have), ",".join(job.flags),
+        job.user_status, job.user_notes, int(job.possible_duplicate),
+    )
+
+
+def fts_query(text: str, syntax: bool = False) -> str:
+    # Words become an AND of quoted terms with the last one as a prefix, so typing
+    # "netw eng" finds "Network Engineer" and "Portland, OR" or "c++ (senior)" never
+    # reach MATCH as operators. FTS5 query syntax is passed through only on request.
+    if syntax:
+        return text.strip()
+    terms = re.findall(r"\w+", text)
+    return " ".join(f'"{t}"' for t in terms[:-1]) + (f' "{terms[-1]}"*' if terms else "")
+
+
+def _description_text(codec: str | None, body: bytes | None) -> str | None:
+    return decompress_text(body, codec) if body is not None else None
+
+
+@dataclass(slots=True)
+class SearchHit:
+    job_id: str
+    title: str
+    company: str
+    location_text: str
+    fit_score: int | None
+    fit_grade: str | None
+    job_url: str
+    rank: float
+    title_marked: str
+    snippet: str
 
 
 class SQLiteRepo:
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, description_cache: int = 256, codec: str = DEFAULT_CODEC) -> None:
         self.path = Path(db_path)
+        self.codec = check_codec(codec)
+        # decompressed bodies by digest; a digest always names the same text, so entries never go stale
+        self._body = lru_cache(maxsize=description_cache)(self._load_body)
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(self.path)
+        # the FTS index reads descriptions through job_search_content, which decompresses blobs
+        self.conn.create_function("description_text", 2, _description_text, deterministic=True)
+        for pragma in PRAGMAS:
+            self.conn.execute(pragma)
         self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "SQLiteRepo":
+        storage = cfg["storage"]
+        return cls(storage["sqlite_path"], codec=str(storage.get("description_codec", DEFAULT_CODEC)))
+
+    def _migrate(self) -> None:
+        for table, columns in MIGRATIONS.items():
+            existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for name, decl in columns.items():
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+        self.conn.commit()
+        if self.conn.execute("SELECT 1 FROM canonical_index LIMIT 1").fetchone() is None:
+            # databases written before the canonical index existed
+            rows = self.conn.execute("SELECT canonical_url, job_id FROM jobs ORDER BY first_seen").fetchall()
+            self.remember_canonical([(canonicalize_url(url).key, job_id, url) for url, job_id in rows if url])
+        legacy = self.conn.execute(
+            "SELECT job_id, description_raw FROM jobs WHERE description_hash IS NULL AND description_raw != ''"
+        ).fetchall()
+        if legacy:
+            # databases written when descriptions were stored inline
+            digests = [text_digest(text) for _, text in legacy]
+            with self.conn:
+                self._store_descriptions([(None, d) for d in digests], dict(zip(digests, (t for _, t in legacy))))
+                self.conn.executemany(
+                    "UPDATE jobs SET description_hash=?, description_raw=NULL WHERE job_id=?",
+                    [(d, job_id) for d, (job_id, _) in zip(digests, legacy)],
+                )
+        if self.conn.execute("SELECT 1 FROM jobs_fts_config WHERE k='rank'").fetchone() is None:
+            with self.conn:
+                self.conn.execute("INSERT INTO jobs_fts(jobs_fts, rank) VALUES ('rank', ?)", (FTS_RANK,))
+        indexed = self.conn.execute("SELECT COUNT(*) FROM jobs_fts_docsize").fetchone()[0]
+        if indexed != self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]:
+            # databases written before the search index existed
+            with self.conn:
+                self.conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+
+    def _select_in(self, sql: str, values: list) -> list[tuple]:
+        rows: list[tuple] = []
+        unique = list(dict.fromkeys(values))
+        for i in range(0, len(unique), PARAM_CHUNK):
+            chunk = unique[i : i + PARAM_CHUNK]
+            rows.extend(self.conn.execute(sql.format(",".join("?" * len(chunk))), chunk))
+        return rows
 
     def upsert_job(self, job: JobRecord) -> None:
-        self.conn.execute(
-            """INSERT OR REPLACE INTO jobs VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-            (
-                job.job_id, job.source_domain, job.source_name, job.job_url, job.canonical_url,
-                job.apply_url, job.title, job.company, job.location_text, job.remote_flag, job.employment_type,
-                job.posted_date, job.collected_at, job.description_raw, job.salary_text, ",".join(job.skills_extracted),
-                job.fetch_status, job.failure_reason, job.first_seen, job.last_seen, job.repost_count, ",".join(job.merged_from),
-                job.fit_score, job.fit_grade, job.fit_notes, ",".join(job.missing_must_have), ",".join(job.flags),
-                job.user_status, job.user_notes,
-            ),
+        self.upsert_jobs([job])
+
+    def upsert_jobs(self, jobs: Iterable[JobRecord]) -> int:
+        rows: list[tuple] = []
+        seen: list[tuple[str, str, str]] = []
+        hashes: dict[str, str | None] = {}
+        bodies: dict[str, str] = {}
+        for job in jobs:
+            digest = text_digest(job.description_raw) if job.description_raw else None
+            if digest is not None:
+                bodies[digest] = job.description_raw
+            hashes[job.job_id] = digest
+            rows.append(job_row(job, digest))
+            for name in job.source_name.split(","):
+                seen.append((job.job_id, name, job.source_domain))
+        if not rows:
+            return 0
+        stored = {
+            r[1]: r
+            for r in self._select_in(
+                "SELECT rowid, job_id, title, company, location_text, description_hash FROM jobs WHERE job_id IN ({})",
+                list(hashes),
+            )
+        }
+        # (title, company, location, digest) per job as it will be stored; only rows whose
+        # searchable text changes are taken out of the index and put back
+        searchable = {row[0]: tuple(row[i] for i in SEARCH_FIELDS) for row in rows}
+        changed = [job_id for job_id, values in searchable.items() if job_id not in stored or stored[job_id][2:] != values]
+        removed = [
+            ("delete", stored[job_id][0], *stored[job_id][2:5], self.blob_text(stored[job_id][5]))
+            for job_id in changed if job_id in stored
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location_text, description) VALUES (?,?,?,?,?,?)",
+                removed,
+            )
+            self._store_descriptions(
+                [(stored[job_id][5] if job_id in stored else None, digest) for job_id, digest in hashes.items()], bodies
+            )
+            self.conn.executemany(UPSERT_JOB_SQL, rows)
+            self.conn.executemany("INSERT OR IGNORE INTO job_sources_seen VALUES (?,?,?)", seen)
+            rowids = dict(self._select_in("SELECT job_id, rowid FROM jobs WHERE job_id IN ({})", changed))
+            self.conn.executemany(
+                "INSERT INTO jobs_fts(rowid, title, company, location_text, description) VALUES (?,?,?,?,?)",
+                [(rowids[job_id], *searchable[job_id][:3], bodies.get(searchable[job_id][3] or "")) for job_id in changed],
+            )
+        return len(rows)
+
+    def _store_descriptions(self, changes: list[tuple[str | None, str | None]], bodies: dict[str, str]) -> None:
+        # changes are (old digest, new digest) per job; runs inside the caller's transaction
+        refs: Counter[str] = Counter()
+        for old, new in changes:
+            if old != new:
+                if new is not None:
+                    refs[new] += 1
+                if old is not None:
+                    refs[old] -= 1
+        added = [d for d, n in refs.items() if n > 0]
+        known = {r[0] for r in self._select_in("SELECT digest FROM description_blobs WHERE digest IN ({})", added)}
+        self.conn.executemany(
+            "INSERT INTO description_blobs VALUES (?,?,?,0,?)",
+            [(d, self.codec, len(bodies[d].encode()), compress_text(bodies[d], self.codec)) for d in added if d not in known],
         )
-        self.conn.commit()
+        self.conn.executemany("UPDATE description_blobs SET refs=refs+? WHERE digest=?", [(n, d) for d, n in refs.items() if n])
+        self.conn.executemany(
+            "DELETE FROM description_blobs WHERE digest=? AND refs<=0", [(d,) for d, n in refs.items() if n < 0]
+        )
+
+    def _load_body(self, digest: str) -> str:
+        row = self.conn.execute("SELECT codec, body FROM description_blobs WHERE digest=?", (digest,)).fetchone()
+        return decompress_text(row[1], row[0]) if row else ""
+
+    def blob_text(self, digest: str | None) -> str:
+        return self._body(digest) if digest else ""
+
+    def description(self, job_id: str) -> str:
+        row = self.conn.execute("SELECT description_hash FROM jobs WHERE job_id=?", (job_id,)).fetchone()
+        return self.blob_text(row[0] if row else None)
+
+    def descriptions(self, job_ids: list[str]) -> dict[str, str]:
+        rows = self._select_in("SELECT job_id, description_hash FROM jobs WHERE job_id IN ({})", job_ids)
+        return {job_id: self.blob_text(digest) for job_id, digest in rows}
+
+    def page_jobs(
+        self,
+        columns: list[str],
+        sort: str = "fit_score",
+        descending: bool = True,
+        after: tuple | None = None,
+        limit: int = 200,
+        search: str = "",
+        job_ids: list[str] | None = None,
+    ) -> list[tuple]:
+        # Keyset pagination: rows come back as (*columns, sort key, job_id) and the last
+        # row's (sort key, job_id) is the `after` of the next page, so a page costs the
+        # same at row 100k as at row 0. NULLs are coalesced so the comparison holds.
+        # `job_ids` restricts the page to those jobs (rows just written by a run).
+        if sort not in JOB_COLUMNS:
+            raise ValueError(f"cannot sort jobs by {sort!r}")
+        blank = "-1" if sort in INTEGER_COLUMNS else "''"
+        key = f"COALESCE({sort}, {blank})"
+        clauses: list[str] = []
+        params: list = []
+        if fts_query(search):
+            clauses.append("rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?1)")
+            params.append(fts_query(search))
+        if after is not None:
+            # spelled out rather than as a row value so SQLite can seek the (key, job_id) index
+            op = "<" if descending else ">"
+            k, j = len(params) + 1, len(params) + 2
+            clauses.append(f"{key} {op}= ?{k} AND ({key} {op} ?{k} OR job_id {op} ?{j})")
+            params.extend(after)
+        if job_ids is not None:
+            first = len(params) + 1
+            clauses.append(f"job_id IN ({', '.join(f'?{first + i}' for i in range(len(job_ids)))})")
+            params.extend(job_ids)
+        direction = "DESC" if descending else "ASC"
+        return self.conn.execute(
+            f"SELECT {', '.join(columns)}, {key}, job_id FROM jobs"
+            f"{' WHERE ' + ' AND '.join(clauses) if clauses else ''} "
+            f"ORDER BY {key} {direction}, job_id {direction} LIMIT {int(limit)}",
+            params,
+        ).fetchall()
+
+    def count_jobs(self, search: str = "") -> int:
+        if not fts_query(search):
+            return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM jobs_fts WHERE jobs_fts MATCH ?", (fts_query(search),)).fetchone()[0]
+
+    def search(
+        self,
+        query: str,
+        filters: JobFilter | None = None,
+        limit: int = 20,
+        mark: tuple[str, str] = ("[", "]"),
+        syntax: bool = False,
+    ) -> list[SearchHit]:
+        # best matches first by bm25 (title weighted highest); filters narrow the jobs side;
+        # with syntax=True the query is FTS5 syntax (OR, NOT, "phrases", column:term)
+        match = fts_query(query, syntax)
+        if not match:
+            return []
+        where, params = (filters or JobFilter()).where()
+        try:
+            rows = self.conn.execute(
+                "SELECT j.job_id, j.title, j.company, j.location_text, j.fit_score, j.fit_grade, j.job_url, "
+                "jobs_fts.rank, highlight(jobs_fts, 0, ?, ?), snippet(jobs_fts, 3, ?, ?, '...', 16) "
+                "FROM jobs_fts JOIN jobs j ON j.rowid = jobs_fts.rowid "
+                f"WHERE jobs_fts MATCH ?{' AND ' + where if where else ''} ORDER BY jobs_fts.rank LIMIT ?",
+                [*mark, *mark, match, *params, int(limit)],
+            ).fetchall()
+        except sqlite3.OperationalError as exc:
+            if not syntax:
+                raise
+            raise ValueError(f"invalid full-text query {query!r}: {exc}") from None
+        return [SearchHit(*row) for row in rows]
+
+    def iter_jobs(
+        self, columns: list[str], where: str = "", params: Iterable = (), batch_size: int = 1000
+    ) -> Iterator[list[tuple]]:
+        # a dedicated cursor so writes on the connection between batches do not reset it
+        cur = self.conn.cursor()
+        cur.execute(
+            f"SELECT {', '.join(columns)} FROM jobs{' WHERE ' + where if where else ''} ORDER BY first_seen, rowid",
+            list(params),
+        )
+        try:
+            while batch := cur.fetchmany(batch_size):
+                yield batch
+        finally:
+            cur.close()
+
+    def known_fingerprints(self, fingerprints: list[str]) -> set[str]:
+        rows = self._select_in("SELECT content_fp FROM link_fingerprints WHERE content_fp IN ({})", fingerprints)
+        return {r[0] for r in rows}
+
+    def resolve_canonical(self, keys: list[str]) -> dict[str, str]:
+        rows = self._select_in("SELECT canonical_key, job_id FROM canonical_index WHERE canonical_key IN ({})", keys)
+        return dict(rows)
+
+    def remember_canonical(self, rows: list[tuple[str, str, str]]) -> None:
+        # rows are (canonical_key, job_id, canonical_url); the first job seen for a key keeps it
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO canonical_index VALUES (?,?,?)", rows)
+
+    def touch_fingerprints(self, fingerprints: list[str], seen_at: str) -> int:
+        if not fingerprints:
+            return 0
+        params = [(seen_at, fp) for fp in dict.fromkeys(fingerprints)]
+        with self.conn:
+            self.conn.executemany("UPDATE link_fingerprints SET last_seen=? WHERE content_fp=?", params)
+            cur = self.conn.executemany(
+                "UPDATE jobs SET last_seen=?1 WHERE job_id=(SELECT job_id FROM link_fingerprints WHERE content_fp=?2)",
+                params,
+            )
+        return cur.rowcount
+
+    def remember_fingerprints(self, rows: list[tuple[str, str, str, str]]) -> None:
+        # rows are (content_fp, job_id, canonical_url, last_seen)
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO link_fingerprints VALUES (?,?,?,?)", rows)
+
+    def failed_links(self, origins: list[str] | None = None) -> list[tuple[str, str, str, str, str | None]]:
+        # rows are (job_url, source_name, source_domain, snippet_meta json, origin adapter name);
+        # `origins` keeps the links found by those adapters only
+        sql = "SELECT job_url, source_name, source_domain, snippet_meta, origin FROM failed_links"
+        if origins is None:
+            return self.conn.execute(sql + " ORDER BY last_failed, job_url").fetchall()
+        return self._select_in(sql + " WHERE origin IN ({}) ORDER BY last_failed, job_url", origins)
+
+    def remember_failed(self, rows: list[tuple[str, str, str, str, str | None]], failed_at: str, max_attempts: int) -> None:
+        # rows as returned by failed_links; a link is given up after max_attempts failed runs
+        params = [(*row, failed_at) for row in rows]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO failed_links VALUES (?1,?2,?3,?4,?5,1,?6) ON CONFLICT(job_url) DO UPDATE SET "
+                "snippet_meta=excluded.snippet_meta, attempts=failed_links.attempts + 1, last_failed=excluded.last_failed",
+                params,
+            )
+            self.conn.execute("DELETE FROM failed_links WHERE attempts >= ?", (max_attempts,))
+
+    def forget_failed(self, urls: list[str]) -> None:
+        with self.conn:
+            self.conn.executemany("DELETE FROM failed_links WHERE job_url=?", [(u,) for u in dict.fromkeys(urls)])
+
+    def find_signatures(self, buckets: list[int]) -> list[tuple[str, str, str, bytes | None]]:
+        return self._select_in(
+            "SELECT s.job_id, s.company_key, s.title_key, s.signature FROM job_signatures s "
+            "WHERE s.job_id IN (SELECT DISTINCT job_id FROM lsh_buckets WHERE bucket IN ({}))",
+            buckets,
+        )
+
+    def save_signatures(self, rows: list[tuple[str, str, str, bytes | None]], buckets: list[tuple[int, str]]) -> None:
+        with self.conn:
+            self.conn.executemany("DELETE FROM lsh_buckets WHERE job_id=?", [(r[0],) for r in rows])
+            self.conn.executemany("INSERT OR REPLACE INTO job_signatures VALUES (?,?,?,?)", rows)
+            self.conn.executemany("INSERT OR IGNORE INTO lsh_buckets VALUES (?,?)", buckets)
+
+    def upsert_scores(self, profile: str, jobs: Iterable[JobRecord], scored_at: str) -> int:
+        rows = [
+            (j.job_id, profile, j.fit_score, j.fit_grade, j.fit_notes, ",".join(j.missing_must_have), ",".join(j.flags), scored_at)
+            for j in jobs
+        ]
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO job_scores VALUES (?,?,?,?,?,?,?,?)", rows)
+        return len(rows)
+
+    def profile_scores(self, profile: str) -> list[tuple[str, int, str]]:
+        return self.conn.execute(
+            "SELECT job_id, fit_score, fit_grade FROM job_scores WHERE profile=? ORDER BY fit_score DESC", (profile,)
+        ).fetchall()
+
+    def export_rows(self, profile: str | None = None) -> Iterator[tuple]:
+        # rows in the tracker's exported-column order, streamed from the cursor
+        scores = "j" if profile is None else "s"
+        sql = (
+            "SELECT j.job_id, j.collected_at, j.last_seen, j.company, j.title, j.location_text, j.remote_flag, "
+            f"j.job_url, j.source_name, j.posted_date, {scores}.fit_score, {scores}.fit_grade, {scores}.fit_notes, "
+            f"REPLACE({scores}.missing_must_have, ',', ', ') FROM jobs j"
+        )
+        if profile is None:
+            return self.conn.execute(sql + " ORDER BY j.first_seen, j.rowid")
+        return self.conn.execute(
+            sql + " JOIN job_scores s ON s.job_id = j.job_id WHERE s.profile=? ORDER BY j.first_seen, j.rowid", (profile,)
+        )
+
+    def counted_documents(self, job_ids: list[str]) -> set[str]:
+        return {r[0] for r in self._select_in("SELECT job_id FROM relevance_docs WHERE job_id IN ({})", job_ids)}
+
+    def document_frequencies(self, terms: list[str]) -> tuple[int, dict[str, int]]:
+        total = self.conn.execute("SELECT COUNT(*) FROM relevance_docs").fetchone()[0]
+        return total, dict(self._select_in("SELECT term, df FROM relevance_terms WHERE term IN ({})", terms))
+
+    def add_documents(self, job_ids: list[str], term_counts: dict[str, int]) -> None:
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO relevance_docs VALUES (?)", [(i,) for i in job_ids])
+            self.conn.executemany(
+                "INSERT INTO relevance_terms VALUES (?,?) ON CONFLICT(term) DO UPDATE SET df=df+excluded.df",
+                term_counts.items(),
+            )
+
+    def record_run(self, stats: RunStats) -> int:
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (started_at, finished_at, num_found, num_collected, num_failed, num_merged, "
+                "num_exported, num_new, num_changed, num_unchanged) VALUES (?,?,?,?,?,?,?,?,?,?)",
+                (
+                    stats.started_at, stats.finished_at, stats.found, stats.new + stats.changed, stats.failed,
+                    stats.merged, stats.exported, stats.new, stats.changed, stats.unchanged,
+                ),
+            )
+        return int(cur.lastrowid)
+
+    def load_schedule(self) -> list[tuple]:
+        return self.conn.execute(
+            "SELECT source, interval_seconds, next_due, last_polled, rate, polls FROM source_schedule"
+        ).fetchall()
+
+    def save_schedule(self, rows: list[tuple], prune: bool = False) -> None:
+        # rows are (source, interval_seconds, next_due, last_polled, rate, polls); prune drops
+        # every other source, e.g. ones disabled or removed from the config
+        with self.conn:
+            if prune:
+                stale = {row[0] for row in self.conn.execute("SELECT source FROM source_schedule")} - {r[0] for r in rows}
+                self.conn.executemany("DELETE FROM source_schedule WHERE source=?", [(s,) for s in stale])
+            self.conn.executemany("INSERT OR REPLACE INTO source_schedule VALUES (?,?,?,?,?,?)", rows)
+
+    def record_errors(self, run_id: int, errors: list[tuple[str, str, str]]) -> None:
+        # errors are (domain, reason, trace_summary)
+        with self.conn:
+            self.conn.executemany("INSERT INTO run_errors VALUES (?,?,?,?)", [(run_id, *e) for e in errors])
+
+    def close(self) -> None:
+        self.conn.close()
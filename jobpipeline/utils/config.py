@@ -1,13 +1,50 @@
 from __future__ import annotations
 
+import os
+import re
 from pathlib import Path
 from typing import Any
 import yaml
 
 
 DEFAULT_CONFIG_PATH = Path("config.yaml")
+# set to a directory to keep every file a run writes there (smoke runs, CI)
+OUTPUT_DIR_ENV = "JOBPIPELINE_OUTPUT_DIR"
+_DRIVE = re.compile(r"^[A-Za-z]:[\\/]")
 
 
-def load_config(path: Path | str = DEFAULT_CONFIG_PATH) -> dict[str, Any]:
+def load_config(path: Path | str = DEFAULT_CONFIG_PATH, output_dir: Path | str | None = None) -> dict[str, Any]:
     with Path(path).open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        cfg = yaml.safe_load(f) or {}
+    output_dir = output_dir or os.environ.get(OUTPUT_DIR_ENV)
+    if output_dir:
+        return redirect_outputs(cfg, output_dir)
+    # elsewhere "C:/Users/..." is a relative path and the files would land in the working directory
+    windows = [p for p in output_paths(cfg) if _DRIVE.match(p)]
+    if windows and os.name != "nt":
+        raise ValueError(
+            f"{path} writes to Windows paths ({', '.join(windows)}); "
+            f"pass --output-dir or set {OUTPUT_DIR_ENV} to run on this system"
+        )
+    return cfg
+
+
+def output_paths(cfg: dict[str, Any]) -> list[str]:
+    paths = [cfg.get("output_dir"), cfg.get("excel_path"), cfg.get("storage", {}).get("sqlite_path")]
+    paths.append(cfg.get("http_cache", {}).get("dir"))
+    return [str(p) for p in paths if p]
+
+
+def redirect_outputs(cfg: dict[str, Any], output_dir: Path | str) -> dict[str, Any]:
+    # the database, tracker and HTTP cache keep their file names and move under output_dir
+    out = Path(output_dir)
+    storage = cfg.get("storage", {})
+    excel = Path(str(cfg.get("excel_path") or "jobpipeline_tracker.xlsx")).name
+    sqlite = Path(str(storage.get("sqlite_path") or "jobpipeline.sqlite")).name
+    return {
+        **cfg,
+        "output_dir": str(out),
+        "excel_path": str(out / excel),
+        "storage": {**storage, "sqlite_path": str(out / sqlite)},
+        "http_cache": {**cfg.get("http_cache", {}), "dir": str(out / "http_cache")},
+    }
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import re
+import string
+
+# "+", "#" and "/" are part of terms like c++, c# and tcp/ip
+_PUNCT = str.maketrans({c: " " for c in string.punctuation if c not in "+#/"})
 
 
 def normalize_ws(value: str) -> str:
@@ -18,3 +22,7 @@ def normalize_skill(value: str) -> str:
         "paloalto": "palo alto",
     }
     return synonyms.get(key, key)
+
+
+def word_tokens(value: str) -> list[str]:
+    return (value or "").lower().translate(_PUNCT).split()
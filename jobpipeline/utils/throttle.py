@@ -1,17 +1,185 @@
 from __future__ import annotations
 
+import asyncio
+import random
+import threading
 import time
-from collections import defaultdict
+from collections import deque
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+# latency samples kept per domain for the hedging percentile
+LATENCY_WINDOW = 200
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    # Retry-After is either delta-seconds or an HTTP date
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def jittered(seconds: float) -> float:
+    # "equal jitter": at least half the delay, so retries never pile up at zero
+    return seconds * random.uniform(0.5, 1.0)
+
+
+@dataclass(slots=True)
+class DomainMetrics:
+    requests: int = 0
+    waited_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    # 429/503 answers
+    throttled: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    p95_seconds: float | None = None
+
+
+@dataclass(slots=True)
+class _Domain:
+    # theoretical arrival time: when the bucket would be empty again
+    tat: float = 0.0
+    strikes: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    metrics: DomainMetrics = field(default_factory=DomainMetrics)
 
 
 class DomainThrottle:
-    def __init__(self, default_delay_seconds: float = 0.5) -> None:
-        self.default_delay_seconds = default_delay_seconds
-        self._last_hit: dict[str, float] = defaultdict(float)
-
-    def wait(self, domain: str) -> None:
-        now = time.monotonic()
-        elapsed = now - self._last_hit[domain]
-        if elapsed < self.default_delay_seconds:
-            time.sleep(self.default_delay_seconds - elapsed)
-        self._last_hit[domain] = time.monotonic()
+    # Per-domain token bucket: one token every interval_seconds, up to `burst` saved up.
+    # The bucket is kept as the time it next runs dry (GCRA), so a caller reserves its
+    # slot under the lock and then sleeps outside it; acquire() blocks the thread and
+    # acquire_async() awaits, and both share the same buckets. A 429/503 pushes the
+    # domain's bucket into the future for every caller, by Retry-After when the server
+    # sent one and by exponential backoff with jitter otherwise.
+    def __init__(
+        self,
+        interval_seconds: float = 0.5,
+        burst: int = 1,
+        backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 60.0,
+        max_retry_after_seconds: float = 120.0,
+        hedge_min_samples: int = 20,
+        hedge_budget: float = 0.1,
+    ) -> None:
+        self.interval = max(0.0, interval_seconds)
+        self.burst = max(1, burst)
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_retry_after_seconds = max_retry_after_seconds
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_budget = hedge_budget
+        self._domains: dict[str, _Domain] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, collector_cfg: dict[str, Any]) -> "DomainThrottle":
+        return cls(
+            interval_seconds=float(collector_cfg.get("throttle_seconds", 0)),
+            burst=int(collector_cfg.get("throttle_burst", 1)),
+            backoff_seconds=float(collector_cfg.get("backoff_seconds", 0.5)),
+            max_backoff_seconds=float(collector_cfg.get("max_backoff_seconds", 60)),
+            max_retry_after_seconds=float(collector_cfg.get("max_retry_after_seconds", 120)),
+            hedge_min_samples=int(collector_cfg.get("hedge_min_samples", 20)),
+            hedge_budget=float(collector_cfg.get("hedge_budget", 0.1)) if collector_cfg.get("hedge", True) else 0.0,
+        )
+
+    def _domain(self, domain: str) -> _Domain:
+        state = self._domains.get(domain)
+        if state is None:
+            state = self._domains[domain] = _Domain()
+        return state
+
+    def reserve(self, domain: str) -> float:
+        with self._lock:
+            now = time.monotonic()
+            state = self._domain(domain)
+            tat = max(state.tat, now)
+            delay = max(0.0, tat - (self.burst - 1) * self.interval - now)
+            state.tat = tat + self.interval
+            m = state.metrics
+            m.requests += 1
+            m.waited_seconds += delay
+            m.max_wait_seconds = max(m.max_wait_seconds, delay)
+        return delay
+
+    def acquire(self, domain: str) -> None:
+        delay = self.reserve(domain)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, domain: str) -> None:
+        delay = self.reserve(domain)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, domain: str, seconds: float) -> None:
+        with self._lock:
+            state = self._domain(domain)
+            state.strikes = 0
+            state.latencies.append(seconds)
+
+    def backoff(self, domain: str, retry_after: float | None = None) -> float | None:
+        # Blocks the domain and returns for how long; None when the server asked for a
+        # longer pause than max_retry_after_seconds and the caller should give up.
+        if retry_after is not None and retry_after > self.max_retry_after_seconds:
+            return None
+        with self._lock:
+            state = self._domain(domain)
+            state.metrics.throttled += 1
+            if retry_after is None:
+                retry_after = jittered(min(self.max_backoff_seconds, self.backoff_seconds * 2**state.strikes))
+            state.strikes += 1
+            # no saved-up burst once the pause is over
+            state.tat = max(state.tat, time.monotonic() + retry_after + (self.burst - 1) * self.interval)
+        return retry_after
+
+    def hedge_delay(self, domain: str) -> float | None:
+        # the domain's p95 time to response headers, once there are enough samples and
+        # hedges are still within their share of the domain's requests
+        with self._lock:
+            state = self._domains.get(domain)
+            if state is None or len(state.latencies) < self.hedge_min_samples:
+                return None
+            if state.metrics.hedged + 1 > self.hedge_budget * max(state.metrics.requests, 1):
+                return None
+            return _p95(state.latencies)
+
+    def hedge_started(self, domain: str) -> None:
+        with self._lock:
+            self._domain(domain).metrics.hedged += 1
+
+    def hedge_won(self, domain: str) -> None:
+        with self._lock:
+            self._domain(domain).metrics.hedge_wins += 1
+
+    def metrics(self) -> dict[str, DomainMetrics]:
+        with self._lock:
+            return {
+                domain: replace(state.metrics, p95_seconds=_p95(state.latencies))
+                for domain, state in self._domains.items()
+            }
+
+    def reset_metrics(self) -> None:
+        # counters only; buckets, backoff and latency samples carry over
+        with self._lock:
+            for state in self._domains.values():
+                state.metrics = DomainMetrics()
+
+
+def _p95(samples: deque) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
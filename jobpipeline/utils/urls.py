@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# never part of a posting's identity, on any host
+TRACKING_PARAMS = {"gh_src", "fbclid", "gclid", "mc_cid", "mc_eid", "trk", "trackingid"}
+TRACKING_PREFIXES = ("utm_", "lever-")
+# generic names some boards use as real parameters; dropped only on hosts where they are tracking
+GENERIC_TRACKING_PARAMS = {"ref", "referrer", "refid", "source", "src", "sid", "campaign"}
+GENERIC_TRACKING_HOSTS = ("greenhouse.io", "workable.com", "remotive.com", "arbeitnow.com")
+HOST_ALIASES = {
+    "job-boards.greenhouse.io": "boards.greenhouse.io",
+    "job-boards.eu.greenhouse.io": "boards.eu.greenhouse.io",
+    "remoteok.io": "remoteok.com",
+    "remotive.io": "remotive.com",
+}
+# path suffixes that lead to the same posting
+APPLY_SUFFIXES = ("/apply", "/application", "/apply/")
+
+_UUID = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+_GREENHOUSE_PATH = re.compile(r"^/([^/]+)/jobs/(\d+)")
+_LEVER_PATH = re.compile(rf"^/([^/]+)/({_UUID})", re.I)
+_ASHBY_PATH = re.compile(rf"^/([^/]+)/({_UUID})", re.I)
+_WORKABLE_PATH = re.compile(r"^/([^/]+)/j/([0-9A-F]+)", re.I)
+_TRAILING_ID = re.compile(r"-(\d{4,})$")
+
+
+@dataclass(frozen=True, slots=True)
+class CanonicalUrl:
+    url: str
+    key: str
+
+
+def _greenhouse(path: str, query: dict[str, str]) -> str | None:
+    m = _GREENHOUSE_PATH.match(path)
+    return f"greenhouse:{m.group(2)}" if m else None
+
+
+def _lever(path: str, query: dict[str, str]) -> str | None:
+    m = _LEVER_PATH.match(path)
+    return f"lever:{m.group(2).lower()}" if m else None
+
+
+def _ashby(path: str, query: dict[str, str]) -> str | None:
+    m = _ASHBY_PATH.match(path)
+    return f"ashby:{m.group(2).lower()}" if m else None
+
+
+def _workable(path: str, query: dict[str, str]) -> str | None:
+    m = _WORKABLE_PATH.match(path)
+    return f"workable:{m.group(2).upper()}" if m else None
+
+
+def _remoteok(path: str, query: dict[str, str]) -> str | None:
+    m = _TRAILING_ID.search(path)
+    return f"remoteok:{m.group(1)}" if m and path.startswith("/remote-jobs/") else None
+
+
+# ATS/source id extractors, matched on the host or its subdomains
+ID_RULES: list[tuple[str, Callable[[str, dict[str, str]], str | None]]] = [
+    ("greenhouse.io", _greenhouse),
+    ("lever.co", _lever),
+    ("ashbyhq.com", _ashby),
+    ("workable.com", _workable),
+    ("remoteok.com", _remoteok),
+]
+# hosts whose query string never identifies the posting
+DROP_QUERY_HOSTS = ("craigslist.org", "weworkremotely.com", "remoteok.com", "lever.co", "ashbyhq.com")
+
+
+def _on_host(host: str, domains: tuple[str, ...]) -> bool:
+    # a domain or one of its subdomains; "clever.co" is not on "lever.co"
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def _is_tracking(name: str, generic: bool) -> bool:
+    lowered = name.lower()
+    if lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES):
+        return True
+    return generic and lowered in GENERIC_TRACKING_PARAMS
+
+
+def canonicalize_url(url: str) -> CanonicalUrl:
+    raw = (url or "").strip()
+    parts = urlsplit(raw)
+    if not parts.scheme or not parts.netloc:
+        return CanonicalUrl(raw, raw)
+    host = parts.hostname or ""
+    if host.startswith("www."):
+        host = host[4:]
+    host = HOST_ALIASES.get(host, host)
+    if parts.port and parts.port not in {80, 443}:
+        host = f"{host}:{parts.port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    for suffix in APPLY_SUFFIXES:
+        if path.endswith(suffix) and _on_host(host, ("lever.co", "ashbyhq.com", "workable.com")):
+            path = path[: -len(suffix)]
+    if len(path) > 1:
+        path = path.rstrip("/")
+    if _on_host(host, DROP_QUERY_HOSTS):
+        query: list[tuple[str, str]] = []
+    else:
+        generic = _on_host(host, GENERIC_TRACKING_HOSTS)
+        query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=False) if not _is_tracking(k, generic))
+    params = dict(query)
+    canonical = urlunsplit(("https", host, path, urlencode(query), ""))
+    key = canonical
+    if "gh_jid" in params:
+        key = f"greenhouse:{params['gh_jid']}"
+    else:
+        for suffix, rule in ID_RULES:
+            if _on_host(host, (suffix,)):
+                key = rule(path, params) or canonical
+                break
+    return CanonicalUrl(canonical, key)
@@ -85,3 +85,210 @@ def test_stub_adapters_return_empty_when_disabled() -> None:
     adapters = build_adapters(cfg)
     for adapter in adapters:
         assert adapter.search(profile()) == []
+
+
+def test_async_search_runs_sources_concurrently_with_deadline() -> None:
+    import asyncio
+    import time
+
+    from jobpipeline.core.models import JobLink
+    from jobpipeline.sources.base import SourceAdapter
+
+    class Sleepy(SourceAdapter):
+        def __init__(self, name: str, delay: float) -> None:
+            super().__init__({"enabled": True})
+            self.name, self.domain, self.delay = name, f"{name}.test", delay
+
+        def search(self, profile: SearchProfile) -> list[JobLink]:
+            return []
+
+        async def search_async(self, profile: SearchProfile, client) -> list[JobLink]:
+            await asyncio.sleep(self.delay)
+            return [JobLink(f"https://{self.domain}/1", self.name, self.domain, {})]
+
+    manager = SourceManager({"collector": {"source_deadline_seconds": 0.5}})
+    manager.adapters = [Sleepy("a", 0.2), Sleepy("b", 0.2), Sleepy("c", 0.2), Sleepy("slow", 5)]
+    start = time.monotonic()
+    links = manager.search(profile())
+    assert time.monotonic() - start < 1.5
+    assert sorted(link.source_name for link in links) == ["a", "b", "c"]
+
+
+def test_shared_transport_retries_and_is_shared_by_adapters() -> None:
+    import httpx
+
+    from jobpipeline.sources.http import HttpTransport, RetryingTransport
+
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"jobs": [{"absolute_url": "https://boards.greenhouse.io/s/jobs/1"}]})
+
+    transport = HttpTransport({"retries": 1})
+    transport._client = httpx.Client(transport=RetryingTransport(httpx.MockTransport(handler), 1, 0))
+    adapters = build_adapters({"greenhouse_api": {"enabled": True, "boards": ["s"]}, "lever_api": {}}, transport)
+    assert all(a.transport is transport for a in adapters)
+    links = adapters[0].search(profile())
+    assert [link.job_url for link in links] == ["https://boards.greenhouse.io/s/jobs/1"]
+    assert calls == ["/v1/boards/s/jobs", "/v1/boards/s/jobs"]
+
+
+def test_conditional_get_skips_unchanged_feed(tmp_path) -> None:
+    import httpx
+
+    from jobpipeline.sources.cache import HttpCache
+    from jobpipeline.sources.http import HttpTransport
+
+    seen: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"jobs": [{"url": "https://remotive.com/x"}]}, headers={"ETag": '"v1"'})
+
+    transport = HttpTransport({}, cache=HttpCache(tmp_path))
+    transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+    adapter = RemotiveAdapter({"enabled": True}, transport)
+    assert len(adapter.search(profile())) == 1
+    assert adapter.search(profile()) == []
+    assert seen == [None, '"v1"']
+
+
+def test_body_cut_off_by_an_error_leaves_no_validators(tmp_path) -> None:
+    import httpx
+
+    from jobpipeline.sources.cache import HttpCache
+    from jobpipeline.sources.http import HttpTransport, cache_key
+
+    seen: list[str | None] = []
+
+    class CutOff(httpx.SyncByteStream):
+        def __iter__(self):
+            yield b'{"jobs": [{"url": "https://remotive.com/x"},'
+            raise httpx.ReadError("connection reset")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        if len(seen) == 1:
+            return httpx.Response(200, headers={"ETag": '"v1"'}, stream=CutOff())
+        return httpx.Response(200, json={"jobs": [{"url": "https://remotive.com/x"}]}, headers={"ETag": '"v1"'})
+
+    cache = HttpCache(tmp_path)
+    transport = HttpTransport({}, cache=cache)
+    transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+    adapter = RemotiveAdapter({"enabled": True}, transport)
+    assert adapter.search(profile()) == []
+    assert cache.lookup(cache_key(adapter.endpoint, adapter.filter_variant(profile()))) is None
+    assert len(adapter.search(profile())) == 1
+    assert seen == [None, None]
+
+
+def test_truncated_json_body_leaves_no_validators(tmp_path) -> None:
+    import httpx
+
+    from jobpipeline.sources.cache import HttpCache
+    from jobpipeline.sources.http import HttpTransport, cache_key
+
+    seen: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        return httpx.Response(200, content=b'{"jobs": [{"url": "https://remotive.com/x"}, {"url": "ht', headers={"ETag": '"v1"'})
+
+    cache = HttpCache(tmp_path)
+    transport = HttpTransport({}, cache=cache)
+    transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+    adapter = RemotiveAdapter({"enabled": True}, transport)
+    assert adapter.search(profile()) == []
+    assert cache.lookup(cache_key(adapter.endpoint, adapter.filter_variant(profile()))) is None
+    adapter.search(profile())
+    assert seen == [None, None]
+
+def test_malformed_feed_keeps_earlier_items_and_no_validators(tmp_path) -> None:
+    import httpx
+
+    from jobpipeline.sources.adapters import WeWorkRemotelyRssAdapter
+    from jobpipeline.sources.cache import HttpCache
+    from jobpipeline.sources.http import HttpTransport, cache_key
+
+    seen: list[str | None] = []
+    feed = (
+        b"<rss><channel><item><title>NOC</title><link>https://x.test/1</link></item>"
+        b"<item><title>Net&nbsp;Eng</title><link>https://x.test/2</link></item></channel></rss>"
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        return httpx.Response(200, content=feed, headers={"ETag": '"v1"'})
+
+    cache = HttpCache(tmp_path)
+    transport = HttpTransport({}, cache=cache)
+    transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+    adapter = WeWorkRemotelyRssAdapter({"enabled": True}, transport)
+    assert [link.job_url for link in adapter.search(profile())] == ["https://x.test/1"]
+    assert cache.lookup(cache_key(adapter.feed_url, adapter.filter_variant(profile()))) is None
+    adapter.search(profile())
+    assert seen == [None, None]
+
+
+def test_http_cache_evicts_least_recently_used(tmp_path) -> None:
+    from jobpipeline.sources.cache import HttpCache
+
+    cache = HttpCache(tmp_path, max_bytes=10)
+    cache.store("https://a", {"etag": "a"}, [b"123456"])
+    cache.store("https://b", {"etag": "b"}, [b"123456"])
+    assert cache.lookup("https://a") is None
+    assert cache.read_body("https://b") == b"123456"
+
+
+def test_json_array_stream_handles_chunk_boundaries() -> None:
+    import json
+
+    from jobpipeline.sources.jsonstream import iter_json_items
+
+    doc = {"legal": "x", "count": 12.5, "jobs": [{"url": "https://a/é"}, 12.75, None], "meta": {}}
+    raw = json.dumps(doc, ensure_ascii=False).encode()
+    for size in (1, 3, 64):
+        chunks = [raw[i : i + size] for i in range(0, len(raw), size)]
+        assert list(iter_json_items(chunks, "jobs")) == doc["jobs"]
+
+
+def test_streaming_adapter_prefilters_and_trims_items() -> None:
+    from datetime import datetime, timedelta
+
+    import httpx
+
+    from jobpipeline.sources.http import HttpTransport
+
+    fresh = datetime.utcnow().isoformat()
+    stale = (datetime.utcnow() - timedelta(days=5)).isoformat()
+    payload = {
+        "jobs": [
+            {"url": "https://remotive.com/1", "title": "NOC Engineer", "publication_date": fresh, "description": "x" * 1000},
+            {"url": "https://remotive.com/2", "title": "NOC Engineer", "publication_date": stale},
+            {"url": "https://remotive.com/3", "title": "Senior NOC Engineer", "publication_date": fresh},
+        ]
+    }
+    transport = HttpTransport()
+    transport._client = httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(200, json=payload)))
+    p = profile()
+    p.exclude_keywords = ["senior"]
+    links = RemotiveAdapter({"enabled": True}, transport).search(p)
+    assert [link.job_url for link in links] == ["https://remotive.com/1"]
+    assert "description" not in links[0].snippet_meta
+
+
+def test_streaming_adapter_without_parse_items_cannot_be_built() -> None:
+    import pytest
+
+    from jobpipeline.sources.adapters import StreamingJsonAdapter
+
+    class Incomplete(StreamingJsonAdapter):
+        name, domain = "incomplete", "example.com"
+
+    with pytest.raises(TypeError, match="parse_items"):
+        Incomplete({"enabled": True})
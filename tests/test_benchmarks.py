@@ -0,0 +1,28 @@
+from benchmarks import synthetic
+from benchmarks.standin import FEEDS, StandIn, StandInOptions
+from benchmarks.suite import BENCH_COLLECTOR, bench_profile, compare
+from jobpipeline.sources.manager import SourceManager
+
+
+def test_stand_in_serves_every_source_and_injected_errors_are_retried() -> None:
+    items = synthetic.postings(200, seed=1)
+    # seed 3 fails 5 of the first 10 requests and 12 of the first 60; Retry-After: 0 makes retries free
+    with StandIn(items, StandInOptions(error_rate=0.3, retry_after=0, seed=3)) as server:
+        collector = {**BENCH_COLLECTOR, "retries": 12}
+        manager = SourceManager({"sources": server.sources_config(), "collector": collector})
+        try:
+            links = manager.search(bench_profile())
+        finally:
+            manager.transport.close()
+        assert set(manager.last_origins.values()) == {key for key, *_ in FEEDS}
+        assert all(link.job_url.startswith(server.base_url + "/jobs/") for link in links)
+        assert server.served["error"] > 0
+        assert manager.transport.throttle.metrics()["127.0.0.1"].throttled == server.served["error"]
+
+
+def test_compare_flags_only_real_slowdowns() -> None:
+    def results(**medians: float) -> dict:
+        return {"results": [{"case": name, "size": 1000, "median_s": s} for name, s in medians.items()]}
+
+    rows = compare(results(a=2.0, b=0.004, c=1.0, d=1.0), results(a=1.0, b=0.001, c=1.2), tolerance=0.25)
+    assert [(r["case"], r["regression"]) for r in rows] == [("a", True), ("b", False), ("c", False)]
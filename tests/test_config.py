@@ -0,0 +1,35 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from jobpipeline.utils.config import load_config, output_paths
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_output_dir_moves_every_written_file(tmp_path) -> None:
+    cfg = load_config(ROOT / "config.yaml", output_dir=tmp_path)
+    assert (cfg["excel_path"], cfg["storage"]["sqlite_path"]) == (
+        str(tmp_path / "jobpipeline_tracker.xlsx"),
+        str(tmp_path / "jobpipeline.sqlite"),
+    )
+    assert all(Path(p).is_relative_to(tmp_path) for p in output_paths(cfg))
+    assert cfg["storage"]["description_codec"] == "zlib"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="drive paths are valid on Windows")
+def test_windows_paths_are_refused_elsewhere(monkeypatch) -> None:
+    monkeypatch.delenv("JOBPIPELINE_OUTPUT_DIR", raising=False)
+    with pytest.raises(ValueError, match="--output-dir"):
+        load_config(ROOT / "config.yaml")
+
+
+def test_cli_smoke_run_writes_only_to_output_dir(tmp_path, monkeypatch, capsys) -> None:
+    from jobpipeline.core.cli import main
+
+    monkeypatch.chdir(ROOT)
+    main(["--output-dir", str(tmp_path), "--search", "noc"])
+    assert capsys.readouterr().out.strip() == "0 results"
+    assert (tmp_path / "jobpipeline.sqlite").exists() and (tmp_path / "http_cache").is_dir()
+    assert not (ROOT / "C:").exists()
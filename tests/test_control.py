@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from jobpipeline.core.control import RunCancelled, RunControl
+from jobpipeline.core.models import JobLink
+from tests.test_adapters import profile
+from tests.test_pipeline import service
+
+
+def test_guard_cancels_in_flight_requests() -> None:
+    control = RunControl()
+
+    async def slow(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(30)
+        return httpx.Response(200)
+
+    async def fetch_all() -> None:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(slow)) as client:
+            await asyncio.gather(*(client.get(f"https://x.test/{n}") for n in range(5)))
+
+    async def main() -> None:
+        asyncio.get_running_loop().call_later(0.2, control.cancel)
+        await control.guard(fetch_all())
+
+    start = time.perf_counter()
+    with pytest.raises(RunCancelled):
+        asyncio.run(main())
+    assert time.perf_counter() - start < 5
+
+
+def test_run_reports_progress_and_cancel_leaves_no_writes(tmp_path) -> None:
+    links = [JobLink(f"https://x/{n}", "s", "x", {"position": "NOC Engineer"}) for n in range(3)]
+    svc = service(tmp_path, links)
+    events: list[tuple[str, dict]] = []
+    svc.run_profiles([profile()], control=RunControl(lambda kind, data: events.append((kind, data))))
+    kinds = [k for k, _ in events]
+    assert ("found", {"found": 3, "new": 3, "changed": 0, "unchanged": 0}) in events
+    assert kinds.index("found") < kinds.index("jobs")
+    assert set(svc.last_stats.timings) == {"search", "details", "parse", "dedupe", "score", "write", "export"}
+
+    links.append(JobLink("https://x/9", "s", "x", {"position": "NOC Engineer"}))
+    control = RunControl(lambda kind, data: control.cancel() if kind == "found" else None)
+    with pytest.raises(RunCancelled):
+        svc.run_profiles([profile()], control=control)
+    assert svc.repo.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 3
+
+
+def test_batches_are_saved_as_they_finish(tmp_path) -> None:
+    links = [JobLink(f"https://x/{n}", "s", "x", {"position": "NOC Engineer"}) for n in range(5)]
+    svc = service(tmp_path, links)
+    svc.cfg["collector"] = {"run_batch": 2}
+    count = "SELECT COUNT(*) FROM jobs"
+    saved: list[tuple[int, int]] = []
+
+    def on_event(kind: str, data: dict) -> None:
+        if kind == "jobs":
+            saved.append((data["written"], svc.repo.conn.execute(count).fetchone()[0]))
+            control.cancel()
+
+    control = RunControl(on_event)
+    with pytest.raises(RunCancelled):
+        svc.run_profiles([profile()], control=control)
+    assert saved == [(2, 2)]
+
+    # the next run only takes the links the cancelled one did not save
+    svc.run_profiles([profile()])
+    assert (svc.last_stats.new, svc.last_stats.unchanged) == (3, 2)
+    assert svc.repo.conn.execute(count).fetchone()[0] == 5
@@ -0,0 +1,42 @@
+from jobpipeline.core.models import JobLink, JobRecord
+from jobpipeline.dedupe.engine import NearDuplicateIndex, dedupe_jobs
+from jobpipeline.storage.sqlite_repo import SQLiteRepo
+
+DESCRIPTION = (
+    "We are hiring a network engineer to run our global backbone. You will configure routing and "
+    "switching, troubleshoot tcp/ip issues, manage palo alto firewalls and vpn tunnels, and join the "
+    "on-call rotation with the noc team. Two years of experience with bgp and ospf is required."
+)
+
+
+def job(url: str, source: str, company: str = "ACME Inc.", title: str = "Network Engineer", text: str = DESCRIPTION) -> JobRecord:
+    link = JobLink(url, source, "x", {})
+    return JobRecord.from_link(link, title=title, company=company, description_raw=text)
+
+
+def test_near_duplicates_across_sources_are_merged() -> None:
+    jobs = [
+        job("https://remoteok.com/1", "Remote OK API"),
+        job("https://remotive.com/2", "Remotive API", company="Acme", title="Network Engineer (Remote)",
+            text=DESCRIPTION + " Apply on our site."),
+        job("https://boards.greenhouse.io/acme/3", "Greenhouse:acme", title="Sr. Network Engineer"),
+        job("https://remotive.com/4", "Remotive API", company="Other Corp"),
+    ]
+    out = dedupe_jobs(jobs, NearDuplicateIndex())
+    assert [j.canonical_url for j in out] == ["https://remoteok.com/1", "https://boards.greenhouse.io/acme/3", "https://remotive.com/4"]
+    assert out[0].possible_duplicate and out[0].merged_from == [jobs[1].job_id]
+    assert out[0].source_name == "Remote OK API,Remotive API"
+
+
+def test_near_duplicate_of_an_earlier_run_reuses_stored_job_id(tmp_path) -> None:
+    repo = SQLiteRepo(str(tmp_path / "db.sqlite"))
+    index = NearDuplicateIndex(repo)
+    first = dedupe_jobs([job("https://remoteok.com/1", "Remote OK API")], index)
+    repo.upsert_jobs(first)
+    index.remember(first)
+
+    later = job("https://remotive.com/2", "Remotive API", company="ACME")
+    original_id = later.job_id
+    out = dedupe_jobs([later], NearDuplicateIndex(repo))
+    assert out[0].job_id == first[0].job_id
+    assert out[0].possible_duplicate and out[0].merged_from == [original_id]
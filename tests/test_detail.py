@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import httpx
+
+from jobpipeline.collectors.detail import DetailCollector, fill_from_snippet
+from jobpipeline.core.models import JobLink
+from jobpipeline.sources.http import HttpTransport
+from jobpipeline.utils.throttle import DomainThrottle
+
+
+def test_detail_collector_bounds_workers_and_records_failures() -> None:
+    active = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if request.url.path == "/gone":
+            return httpx.Response(404)
+        return httpx.Response(200, text=f"<h1>{request.url.host}{request.url.path}</h1>")
+
+    links = [JobLink(f"https://h{i % 4}.test/{i}", "s", "x") for i in range(12)]
+    links.append(JobLink("https://h0.test/gone", "s", "x"))
+    collector = DetailCollector(HttpTransport(), {"fetch_details": True, "detail_workers": 3, "throttle_seconds": 0})
+
+    async def run() -> list:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await collector.collect_async(links, client)
+
+    pages = asyncio.run(run())
+    assert [p.link for p in pages] == links
+    assert pages[5].html == "<h1>h1.test/5</h1>" and pages[5].fetch_status == "success"
+    assert (pages[-1].fetch_status, pages[-1].failure_reason) == ("failed", "http 404")
+    assert peak == 3
+
+
+def test_pages_cut_short_are_counted_without_content_length() -> None:
+    posting = b'<script type="application/ld+json">{"@type": "JobPosting", "title": "SRE"}</script>'
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        async def body():
+            yield posting
+            for _ in range(50):
+                yield b"<p>" + b"x" * 1000 + b"</p>"
+
+        # a streamed body with no Content-Length, so the bytes skipped are unknown
+        return httpx.Response(200, content=body())
+
+    collector = DetailCollector(HttpTransport(), {"fetch_details": True})
+    collector.transport.async_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    [page] = collector.collect([JobLink("https://ats.test/1", "s", "x")])
+    assert page.job_posting["title"] == "SRE"
+    assert collector.cut_short == {"ats.test": 1}
+    assert collector.bytes_read == {"ats.test": len(posting)}
+    assert sum(collector.bytes_saved.values()) == 0
+
+def test_throttle_spaces_concurrent_waiters_per_domain() -> None:
+    throttle = DomainThrottle(0.05)
+
+    async def run() -> list[float]:
+        start = time.monotonic()
+
+        async def hit(domain: str) -> float:
+            await throttle.acquire_async(domain)
+            return time.monotonic() - start
+
+        return await asyncio.gather(*(hit(d) for d in ["a", "a", "a", "b"]))
+
+    a1, a2, a3, b = asyncio.run(run())
+    assert a2 - a1 >= 0.045 and a3 - a2 >= 0.045
+    assert b < 0.04
+
+
+def test_snippet_fills_fields_the_page_lacks() -> None:
+    link = JobLink("https://x/1", "s", "x", {"position": "NOC Engineer", "company": "ACME", "date": 1700000000})
+    parsed = fill_from_snippet({"title": "", "company": "Page Co", "posted_date": None}, link)
+    assert (parsed["title"], parsed["company"], parsed["posted_date"]) == ("NOC Engineer", "Page Co", "2023-11-14T22:13:20")
+
+
+def test_jsonld_scanner_handles_split_tags() -> None:
+    from jobpipeline.collectors.fetch import JsonLdScanner
+
+    html = '<head><script>x</script><SCRIPT type="application/ld+json">{"a": 1}</script><p>'
+    scanner = JsonLdScanner()
+    blocks = [b for i in range(0, len(html), 7) for b in scanner.feed(html[i : i + 7])]
+    assert blocks == ['{"a": 1}']
+
+
+def test_fetch_page_stops_after_job_posting_and_at_byte_cap() -> None:
+    from jobpipeline.collectors.fetch import fetch_page
+
+    posting = '{"@type": "JobPosting", "title": "SRE", "description": "&lt;p&gt;Run bgp&lt;/p&gt;"}'
+    head = f'<html><head><script type="application/ld+json">{posting}</script></head><body>'.encode()
+    served: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        plain = request.url.path == "/plain"
+        chunks = ([] if plain else [head]) + [b"<p>" + b"x" * 1000 + b"</p>"] * 50
+
+        async def body():
+            for i, chunk in enumerate(chunks):
+                served.append(i)
+                yield chunk
+
+        return httpx.Response(200, headers={"content-length": str(sum(map(len, chunks)))}, content=body())
+
+    async def run(path: str, cap: int):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_page(client, f"https://ats.test{path}", byte_cap=cap)
+
+    page = asyncio.run(run("/job", 1 << 20))
+    assert page.truncated and page.job_posting["title"] == "SRE" and len(served) == 1
+    assert page.bytes_saved == 50 * 1007
+
+    served.clear()
+    capped = asyncio.run(run("/plain", 5000))
+    assert capped.truncated and capped.job_posting is None and len(served) < 10
+    assert capped.bytes_read + capped.bytes_saved == 50 * 1007
@@ -0,0 +1,47 @@
+from openpyxl import load_workbook
+
+from jobpipeline.core.models import JobLink, JobRecord
+from jobpipeline.export.excel_sync import ExcelIndex, export_values, rebuild_excel, sync_workbook
+
+
+def job(n: int, title: str = "NOC Engineer") -> JobRecord:
+    return JobRecord.from_link(JobLink(f"https://x/{n}", "s", "x", {}), title=title, company="ACME")
+
+
+def test_incremental_sync_writes_only_changed_rows_and_keeps_user_columns(tmp_path) -> None:
+    path = tmp_path / "tracker.xlsx"
+    jobs = [job(1), job(2)]
+    assert sync_workbook(str(path), {"Jobs": jobs}) == 2
+
+    wb = load_workbook(path)
+    wb["Jobs"]["O2"].value, wb["Jobs"]["P2"].value = "Applied", "phone screen"
+    wb.save(path)
+    # the user's save invalidates the sidecar; the sheet is scanned once and nothing differs
+    assert sync_workbook(str(path), {"Jobs": jobs}) == 0
+    stamp = ExcelIndex.stamp_of(path)
+    assert sync_workbook(str(path), {"Jobs": jobs}) == 0
+    assert ExcelIndex.stamp_of(path) == stamp
+
+    jobs[0].title = "Senior NOC Engineer"
+    assert sync_workbook(str(path), {"Jobs": jobs + [job(3)]}) == 2
+    ws = load_workbook(path)["Jobs"]
+    assert [c.value for c in ws[2]][4:] == ["Senior NOC Engineer"] + [c.value for c in ws[2]][5:14] + ["Applied", "phone screen"]
+    assert ws.max_row == 4 and ws["H4"].hyperlink.target == "https://x/3"
+
+
+def test_rebuild_streams_rows_and_merges_user_edits(tmp_path) -> None:
+    path = tmp_path / "tracker.xlsx"
+    jobs = [job(1), job(2)]
+    sync_workbook(str(path), {"Jobs": jobs})
+    wb = load_workbook(path)
+    wb["Jobs"]["O3"].value = "Rejected"
+    wb.create_sheet("Mine").append(["keep", 1])
+    wb.save(path)
+
+    assert rebuild_excel(str(path), {"Jobs": iter([export_values(j) for j in reversed(jobs)])}) == 2
+    wb = load_workbook(path)
+    ws = wb["Jobs"]
+    assert wb.sheetnames == ["Jobs", "Mine"] and list(wb["Mine"].values) == [("keep", 1)]
+    assert [(ws.cell(r, 1).value, ws.cell(r, 15).value) for r in (2, 3)] == [(jobs[1].job_id, "Rejected"), (jobs[0].job_id, "New")]
+    assert ws["A1"].font.b and ws["H2"].hyperlink.target == "https://x/2"
+    assert sync_workbook(str(path), {"Jobs": jobs}) == 0
@@ -0,0 +1,52 @@
+import csv
+import json
+
+import pytest
+
+from jobpipeline.core.models import JobLink, JobRecord
+from jobpipeline.export.stream import export_jobs
+from jobpipeline.storage.filters import JobFilter
+from jobpipeline.storage.sqlite_repo import SQLiteRepo
+
+
+def repo_with_jobs(tmp_path) -> SQLiteRepo:
+    repo = SQLiteRepo(str(tmp_path / "db.sqlite"))
+    jobs = []
+    for n, (grade, source, seen) in enumerate([("A", "Remotive API", "2026-01-02T00:00:00"),
+                                                ("C", "Remote OK API", "2026-01-02T00:00:00"),
+                                                ("A", "Remote OK API", "2025-06-01T00:00:00")]):
+        job = JobRecord.from_link(JobLink(f"https://x/{n}", source, "x.com", {}), title=f"NOC {n}", description_raw=f"body {n}")
+        job.fit_grade, job.last_seen = grade, seen
+        jobs.append(job)
+    repo.upsert_jobs(jobs)
+    return repo
+
+
+def test_csv_and_jsonl_exports_apply_filters_in_batches(tmp_path) -> None:
+    repo = repo_with_jobs(tmp_path)
+    flt = JobFilter(grades=["A"], sources=["Remote OK API"])
+    assert export_jobs(repo, str(tmp_path / "a.csv"), flt=flt, batch_size=1) == 1
+    with (tmp_path / "a.csv").open(newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    assert [r["title"] for r in rows] == ["NOC 2"]
+
+    since = JobFilter(since_hours=24 * 30)
+    since_params = since.where()[1]
+    assert since_params and since_params[0] > "2025-06-01"
+    out = tmp_path / "recent.jsonl"
+    count = export_jobs(repo, str(out), flt=JobFilter(grades=["A", "C"]), include_description=True, batch_size=2)
+    lines = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert count == 3 and [line["description_raw"] for line in lines] == ["body 0", "body 1", "body 2"]
+
+
+def test_parquet_export_round_trips(tmp_path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    repo = repo_with_jobs(tmp_path)
+    assert export_jobs(repo, str(tmp_path / "jobs.parquet"), batch_size=2) == 3
+    table = pq.read_table(tmp_path / "jobs.parquet")
+    assert table.num_rows == 3 and table.column("fit_grade").to_pylist() == ["A", "C", "A"]
+
+
+def test_unknown_export_format_is_rejected(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        export_jobs(repo_with_jobs(tmp_path), str(tmp_path / "jobs.xml"))
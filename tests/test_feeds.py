@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+
+from jobpipeline.core.models import JobLink
+from jobpipeline.sources.adapters import apply_time_window
+from jobpipeline.sources.feeds import FeedStreamParser, iter_feed_items
+from tests.test_adapters import profile
+
+
+def chunked(data: bytes, size: int = 7) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def rss_item(n: int, posted: datetime) -> str:
+    return (
+        f"<item><title>Job {n}</title><link><![CDATA[https://x.test/{n}]]></link>"
+        f"<pubDate>{format_datetime(posted)}</pubDate></item>"
+    )
+
+
+def test_rss_items_stream_with_cdata_links_and_pubdate() -> None:
+    now = datetime.utcnow()
+    feed = f"<rss><channel><title>t</title>{rss_item(1, now)}{rss_item(2, now)}</channel></rss>".encode()
+    items = list(iter_feed_items(chunked(feed)))
+    assert [i["link"] for i in items] == ["https://x.test/1", "https://x.test/2"]
+    assert "pubDate" in items[0]
+
+
+def test_atom_entries_use_alternate_href() -> None:
+    feed = (
+        b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>A</title>'
+        b'<link rel="alternate" href="https://x.test/a"/><updated>2024-01-01T00:00:00Z</updated>'
+        b"</entry></feed>"
+    )
+    items = list(iter_feed_items(chunked(feed)))
+    assert items == [{"title": "A", "link": "https://x.test/a", "updated": "2024-01-01T00:00:00Z"}]
+
+
+def test_parser_stops_once_items_fall_outside_window() -> None:
+    now = datetime.utcnow()
+    old = now - timedelta(days=3)
+    body = rss_item(1, now) + "".join(rss_item(n, old) for n in range(2, 6)) + rss_item(9, now)
+    parser = FeedStreamParser(cutoff=now - timedelta(hours=24))
+    items = parser.feed(f"<rss><channel>{body}</channel></rss>".encode())
+    assert [i["link"] for i in items] == ["https://x.test/1"]
+    assert parser.done
+
+
+def test_time_window_reads_rss_pubdate() -> None:
+    stale = format_datetime(datetime.utcnow() - timedelta(days=3))
+    links = [JobLink("https://x.test/1", "s", "d", {"pubDate": stale}), JobLink("https://x.test/2", "s", "d", {})]
+    assert [link.job_url for link in apply_time_window(links, profile())] == ["https://x.test/2"]
+
+
+def test_parser_stops_at_malformed_markup() -> None:
+    now = datetime.utcnow()
+    feed = f"<rss><channel>{rss_item(1, now)}<item><title>a&nbsp;b</title></item>{rss_item(3, now)}</channel></rss>"
+    parser = FeedStreamParser()
+    items = [item for chunk in chunked(feed.encode()) for item in parser.feed(chunk)]
+    assert [i["link"] for i in items] == ["https://x.test/1"]
+    assert parser.done and parser.error is not None
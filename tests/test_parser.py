@@ -0,0 +1,81 @@
+import pytest
+
+from jobpipeline.collectors.parser import (
+    BACKENDS,
+    parse_job_html,
+    parse_job_html_batch,
+    parse_job_html_bs4,
+    parse_job_html_stdlib,
+)
+
+PAGES = [
+    "",
+    "<html><body><h1>NOC Engineer</h1><p>Apply via Lever &amp; friends&nbsp;&#65;&#x42;</p></body></html>",
+    "<!DOCTYPE html><title>Jobs</title><script>var greenhouse = 1;</script><style>p{}</style>"
+    "<template><p>workday</p></template><p>Powered by Ashby<br>and <img src=x>Workable</br></p>",
+    '<p>x</p><script type="application/ld+json">[{"@type": "Org"}, {"@type": "JobPosting", "title": "SRE",'
+    ' "hiringOrganization": {"name": "ACME"}, "datePosted": "2024-01-02", "url": "https://a"}]</script>',
+    '<script type="application/ld+json">not json</script><p>broken &bogus; &#12ab; <![CDATA[ cdata ]]> <unclosed',
+    "<div>" + "word " * 6000 + "</div><p>greenhouse</p>",
+    "<p>&#0;&#1;&#128;&#129;&#150;&#xD800;&#x110000;&#xFFFE;&#9731; &eacute;&notin;&NotNestedLessLess;</p>",
+    "<p>a</p><p>b</b>c<li>d",
+]
+XHTML = (
+    '<?xml version="1.0" encoding="utf-8"?><html xmlns="http://www.w3.org/1999/xhtml">'
+    "<body><h1>Ingénieur réseau</h1><p>Apply via Lever</p></body></html>"
+)
+
+
+@pytest.mark.parametrize("html", PAGES)
+def test_stdlib_scanner_matches_bs4(html: str) -> None:
+    assert parse_job_html_stdlib(html) == parse_job_html_bs4(html)
+
+
+def test_lxml_matches_bs4_on_well_formed_pages() -> None:
+    if "lxml" not in BACKENDS:
+        pytest.skip("lxml not installed")
+    for html in PAGES[:4] + PAGES[5:6]:
+        assert BACKENDS["lxml"](html) == parse_job_html_bs4(html)
+
+
+def test_stdlib_scanner_does_not_import_bs4() -> None:
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    code = (
+        "import sys\n"
+        "from jobpipeline.collectors.parser import parse_job_html_stdlib\n"
+        "parse_job_html_stdlib('<p>&eacute;&#150;</p>')\n"
+        "print(type(sys.modules.get('bs4')).__name__)"
+    )
+    root = Path(__file__).resolve().parents[1]
+    proc = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert proc.stdout.strip() != "module"
+
+
+def test_lxml_accepts_xhtml_encoding_declaration() -> None:
+    if "lxml" not in BACKENDS:
+        pytest.skip("lxml not installed")
+    assert BACKENDS["lxml"](XHTML) == parse_job_html_bs4(XHTML)
+
+
+@pytest.mark.parametrize("html", [XHTML, PAGES[-1]])
+def test_auto_backend_matches_bs4(html: str) -> None:
+    assert parse_job_html(html, backend="auto") == parse_job_html_bs4(html)
+
+
+def test_batch_keeps_page_order() -> None:
+    pages = [f"<h1>Job {i}</h1>" for i in range(120)]
+    expected = [parse_job_html_bs4(p) for p in pages]
+    assert parse_job_html_batch(pages, backend="stdlib") == expected
+    assert parse_job_html_batch(pages, workers=2, backend="stdlib", chunksize=8) == expected
+
+
+def test_scanner_tag_tables_match_bs4() -> None:
+    from bs4.builder import HTMLTreeBuilder
+
+    from jobpipeline.collectors.parser import _CONTAINERS, _VOID
+
+    assert _CONTAINERS == set(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+    assert _VOID == set(HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS)
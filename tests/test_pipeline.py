@@ -0,0 +1,192 @@
+from jobpipeline.core.models import JobLink
+from jobpipeline.core.pipeline import PipelineService
+from tests.test_adapters import profile
+
+
+def service(tmp_path, links: list[JobLink]) -> PipelineService:
+    cfg = {
+        "storage": {"sqlite_path": str(tmp_path / "db.sqlite")},
+        "excel_path": str(tmp_path / "tracker.xlsx"),
+        "sources": {},
+    }
+    svc = PipelineService(cfg)
+    svc.sources.search = lambda p, control=None, only=None: list(links)
+    return svc
+
+
+def test_incremental_run_skips_unchanged_links(tmp_path) -> None:
+    links = [
+        JobLink("https://x/1", "s", "x", {"position": "Network Engineer"}),
+        JobLink("https://x/2", "s", "x", {"position": "NOC Engineer"}),
+    ]
+    svc = service(tmp_path, links)
+    assert len(svc.run(profile())) == 2
+    assert (svc.last_stats.new, svc.last_stats.changed, svc.last_stats.unchanged) == (2, 0, 0)
+
+    links[1] = JobLink("https://x/2", "s", "x", {"position": "Senior NOC Engineer"})
+    jobs = svc.run(profile())
+    assert [j.job_url for j in jobs] == ["https://x/2"]
+    assert (svc.last_stats.new, svc.last_stats.changed, svc.last_stats.unchanged) == (0, 1, 1)
+
+    reposts = "SELECT job_url, repost_count FROM jobs ORDER BY job_url"
+    assert svc.repo.conn.execute(reposts).fetchall() == [("https://x/1", 0), ("https://x/2", 1)]
+    assert len(svc.run(profile(), incremental=False)) == 2
+    # a --full re-run sees the same postings again, not reposts
+    assert svc.repo.conn.execute(reposts).fetchall() == [("https://x/1", 0), ("https://x/2", 1)]
+
+
+def test_url_variants_resolve_to_the_stored_job(tmp_path) -> None:
+    links = [JobLink("https://boards.greenhouse.io/acme/jobs/7?utm_source=x", "s", "x", {"position": "NOC Engineer"})]
+    svc = service(tmp_path, links)
+    [first] = svc.run(profile())
+
+    links[:] = [
+        JobLink("https://job-boards.greenhouse.io/acme/jobs/7/", "s", "x", {"position": "NOC Engineer"}),
+        JobLink("https://acme.com/careers?gh_jid=7", "s", "x", {"position": "NOC Engineer II"}),
+    ]
+    jobs = svc.run(profile())
+    assert svc.last_stats.unchanged == 1 and svc.last_stats.changed == 1
+    assert [j.job_id for j in jobs] == [first.job_id]
+    assert svc.repo.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 1
+
+
+def test_multi_profile_run_fetches_once_and_scores_each_profile(tmp_path) -> None:
+    from openpyxl import load_workbook
+
+    links = [
+        JobLink("https://x/1", "s", "x", {"position": "Network Engineer"}),
+        JobLink("https://x/2", "s", "x", {"position": "Senior NOC Engineer"}),
+    ]
+    svc = service(tmp_path, links)
+    calls = []
+    svc.sources.search = lambda p, control=None, only=None: calls.append(p) or list(links)
+    net = profile()
+    net.exclude_keywords = ["senior"]
+    noc = profile()
+    noc.name, noc.must_have_keywords = "NOC", []
+
+    views = svc.run_profiles([net, noc])
+    assert len(calls) == 1 and calls[0].exclude_keywords == []
+    assert [j.job_url for j in views[net.name]] == ["https://x/1"]
+    assert [j.job_url for j in views["NOC"]] == ["https://x/1", "https://x/2"]
+    assert (views[net.name][0].missing_must_have, views["NOC"][0].missing_must_have) == (["tcp/ip"], [])
+    assert len(svc.repo.profile_scores("NOC")) == 2
+    assert load_workbook(tmp_path / "tracker.xlsx").sheetnames == ["Jobs", net.name, "NOC"]
+
+
+def test_failed_detail_fetches_are_recorded(tmp_path) -> None:
+    from jobpipeline.collectors.detail import DetailPage
+
+    links = [
+        JobLink("https://x.test/1", "s", "aggregator.test", {"position": "NOC Engineer"}),
+        JobLink("https://x.test/2", "s", "aggregator.test", {"position": "Network Engineer"}),
+    ]
+    svc = service(tmp_path, links)
+    svc.details.collect = lambda ls, control=None, *progress: [
+        DetailPage(ls[0], "<p>Full description with bgp</p>", "success"),
+        DetailPage(ls[1], None, "failed", "ConnectTimeout: timed out"),
+    ]
+    ok, failed = svc.run(profile())
+    assert (ok.title, ok.description_raw, ok.fetch_status) == ("NOC Engineer", "Full description with bgp", "success")
+    assert (failed.fetch_status, failed.failure_reason) == ("failed", "ConnectTimeout: timed out")
+    assert svc.last_stats.failed == 1
+    assert svc.repo.conn.execute("SELECT domain, reason FROM run_errors").fetchall() == [
+        ("x.test", "ConnectTimeout: timed out")
+    ]
+
+    requested: list[str] = []
+    svc.details.collect = lambda ls, control=None, *progress: [
+        requested.append(link.job_url) or DetailPage(link, "<p>Network Engineer, bgp</p>", "success") for link in ls
+    ]
+    [retried] = svc.run(profile())
+    assert requested == ["https://x.test/2"]
+    assert (retried.job_id, retried.fetch_status) == (failed.job_id, "success")
+    assert svc.repo.conn.execute("SELECT fetch_status FROM jobs WHERE job_id=?", (failed.job_id,)).fetchone() == ("success",)
+
+
+def test_http_cache_keeps_validators_until_the_jobs_are_saved(tmp_path) -> None:
+    import httpx
+    import pytest
+
+    sent: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        jobs = [
+            {"url": "https://remotive.com/1", "title": "Network Engineer"},
+            {"url": "https://remotive.com/2", "title": "Senior NOC Engineer"},
+        ]
+        return httpx.Response(200, json={"jobs": jobs}, headers={"ETag": '"v1"'})
+
+    cfg = {
+        "storage": {"sqlite_path": str(tmp_path / "db.sqlite")},
+        "excel_path": str(tmp_path / "tracker.xlsx"),
+        "http_cache": {"enabled": True, "dir": str(tmp_path / "http_cache")},
+        "sources": {"remotive_api": {"enabled": True}},
+    }
+    svc = PipelineService(cfg)
+    svc.transport.async_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    save = svc.repo.upsert_jobs
+
+    def fail(batch):
+        raise OSError("disk full")
+
+    svc.repo.upsert_jobs = fail
+    with pytest.raises(OSError):
+        svc.run(profile())
+    # the failed run's ETag was never stored, so the retry reads the feed again
+    svc.repo.upsert_jobs = save
+    assert len(svc.run(profile())) == 2
+    assert sent == [None, None]
+
+    assert svc.run(profile()) == []
+    assert sent[-1] == '"v1"'
+
+    # another exclude filter is another cache entry
+    picky = profile()
+    picky.exclude_keywords = ["senior"]
+    svc.run(picky)
+    assert sent[-1] is None
+    svc.close()
+
+
+def test_failed_pages_are_retried_when_the_feed_is_unchanged(tmp_path) -> None:
+    import httpx
+
+    pages: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "remotive.com":
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            jobs = [{"url": f"https://jobs.test/{n}", "title": "Network Engineer"} for n in (1, 2)]
+            return httpx.Response(200, json={"jobs": jobs}, headers={"ETag": '"v1"'})
+        pages.append(request.url.path)
+        if request.url.path == "/2" and pages.count("/2") == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, text="<p>Network Engineer, bgp</p>")
+
+    cfg = {
+        "storage": {"sqlite_path": str(tmp_path / "db.sqlite")},
+        "excel_path": str(tmp_path / "tracker.xlsx"),
+        "http_cache": {"enabled": True, "dir": str(tmp_path / "http_cache")},
+        "collector": {"fetch_details": True, "retries": 0, "throttle_seconds": 0},
+        "sources": {"remotive_api": {"enabled": True}},
+    }
+    svc = PipelineService(cfg)
+    svc.transport.async_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    svc.run(profile())
+    assert svc.last_stats.failed == 1
+    assert [row[0] for row in svc.repo.failed_links()] == ["https://jobs.test/2"]
+
+    # the feed answers 304, yet the failed page is fetched again
+    [job] = svc.run(profile())
+    assert (job.job_url, job.fetch_status) == ("https://jobs.test/2", "success")
+    assert (svc.last_stats.found, svc.last_stats.retried, svc.last_stats.failed) == (0, 1, 0)
+    assert svc.repo.failed_links() == []
+
+    assert svc.run(profile()) == []
+    assert sorted(pages) == ["/1", "/2", "/2"]
+    svc.close()
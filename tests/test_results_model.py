@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QModelIndex, Qt  # noqa: E402
+
+from jobpipeline.app.results_model import JobsTableModel  # noqa: E402
+from jobpipeline.core.models import JobLink, JobRecord  # noqa: E402
+from jobpipeline.storage.sqlite_repo import SQLiteRepo  # noqa: E402
+
+
+def test_model_pages_sorts_and_filters_in_sql(tmp_path) -> None:
+    repo = SQLiteRepo(str(tmp_path / "db.sqlite"))
+    jobs = []
+    for n in range(45):
+        job = JobRecord.from_link(JobLink(f"https://x/{n}", "s", "x", {}), title=f"NOC {n}", company="ACME" if n % 3 else "Initech")
+        job.fit_score = None if n == 0 else n % 7
+        jobs.append(job)
+    repo.upsert_jobs(jobs)
+
+    model = JobsTableModel(repo, page_size=20)
+    model.reload()
+    assert model.rowCount() == 20 and model.total == 45 and model.canFetchMore(QModelIndex())
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+    assert model.rowCount() == 45
+    scores = [int(model.data(model.index(r, 3)) or -1) for r in range(45)]
+    assert scores == sorted(scores, reverse=True) and len({model.job_id(r) for r in range(45)}) == 45
+
+    model.sort(1, Qt.SortOrder.AscendingOrder)
+    assert model.rowCount() == 20 and model.data(model.index(0, 1)) == "NOC 0"
+    model.set_search("initech")
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+    assert model.rowCount() == model.total == 15
+    assert model.job_url(0) == "https://x/0" and model.headerData(5, Qt.Orientation.Horizontal) == "Link"
+
+
+def test_saved_rows_are_added_without_a_reset(tmp_path) -> None:
+    repo = SQLiteRepo(str(tmp_path / "db.sqlite"))
+
+    def job(n: int, score: int) -> JobRecord:
+        record = JobRecord.from_link(JobLink(f"https://x/{n}", "s", "x", {}), title=f"NOC {n}", company="ACME")
+        record.fit_score = score
+        return record
+
+    repo.upsert_jobs([job(n, 50 + n) for n in range(30)])
+    model = JobsTableModel(repo, page_size=10)
+    model.reload()
+    resets: list[bool] = []
+    model.modelReset.connect(lambda: resets.append(True))
+    top = model.job_id(0)
+
+    best, worst = job(100, 99), job(101, 1)
+    moved = job(25, 98)
+    repo.upsert_jobs([best, worst, moved])
+    model.add_jobs([best.job_id, worst.job_id, moved.job_id])
+    assert not resets and model.total == 32
+    # the low score sorts past the loaded page and arrives with fetchMore
+    assert [model.job_id(r) for r in range(3)] == [best.job_id, moved.job_id, top]
+    assert model.rowCount() == 11
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+    ids = [model.job_id(r) for r in range(model.rowCount())]
+    assert len(ids) == len(set(ids)) == 32 and ids[-1] == worst.job_id
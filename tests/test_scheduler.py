@@ -0,0 +1,56 @@
+from jobpipeline.core.models import JobLink
+from jobpipeline.core.scheduler import PollPolicy, Scheduler, SourceSchedule
+from tests.test_adapters import profile
+from tests.test_pipeline import service
+
+
+def test_policy_shrinks_for_busy_sources_and_backs_off_quiet_ones() -> None:
+    policy = PollPolicy(min_seconds=60, max_seconds=3600, backoff=2.0)
+    busy, quiet = SourceSchedule("busy", 600), SourceSchedule("quiet", 600)
+    for s in (busy, quiet):
+        policy.observe(s, 50, 0)
+    # the first poll is the backlog and leaves the interval alone
+    assert (busy.interval, quiet.interval) == (600, 600)
+    policy.observe(busy, 5, 600)
+    policy.observe(quiet, 0, 600)
+    assert busy.interval == 120 and quiet.interval == 1200
+    for t in (2000, 5000, 9000):
+        policy.observe(quiet, 0, t)
+    assert quiet.interval == 3600 and quiet.next_due == 12600
+
+
+def test_scheduler_coalesces_due_sources_and_resumes_after_restart(tmp_path) -> None:
+    links = [JobLink("https://x/1", "a", "x", {"position": "NOC Engineer"})]
+    svc = service(tmp_path, [])
+    calls: list[list[str]] = []
+
+    def search(p, control=None, only=None):
+        calls.append(list(only))
+        batch = [link for link in links if link.source_name in only]
+        svc.sources.last_origins = {id(link): link.source_name for link in batch}
+        return batch
+
+    svc.sources.search = search
+    svc.sources.enabled_names = lambda: ["a", "b", "c"]
+    clock = [1000.0]
+    policy = PollPolicy(min_seconds=100, max_seconds=1000)
+    scheduler = Scheduler(svc, [profile()], policy, coalesce_seconds=30, clock=lambda: clock[0])
+    scheduler.load()
+    scheduler.schedules["c"].next_due = 1020  # due within the coalesce window
+    assert scheduler.run_due() == ["a", "b", "c"]
+    assert calls == [["a", "b", "c"]]
+
+    links.append(JobLink("https://x/2", "a", "x", {"position": "Network Engineer"}))
+    clock[0] = 1100.0
+    assert scheduler.run_due() == ["a", "b", "c"]
+    assert svc.last_stats.new_by_source == {"a": 1}
+    assert scheduler.schedules["a"].interval == 100 and scheduler.schedules["b"].interval == 150
+
+    clock[0] = 1210.0
+    assert scheduler.run_due() == ["a"]
+    assert scheduler.run_due() == []
+
+    restarted = Scheduler(svc, [profile()], policy, coalesce_seconds=30, clock=lambda: clock[0])
+    restarted.load()
+    assert {n: s.row() for n, s in restarted.schedules.items()} == {n: s.row() for n, s in scheduler.schedules.items()}
+    assert restarted.due(1210.0) == []
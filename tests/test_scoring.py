@@ -1,7 +1,9 @@
 from datetime import datetime
 
+import pytest
+
 from jobpipeline.core.models import JobLink, JobRecord, SearchProfile
-from jobpipeline.scoring.engine import score_job
+from jobpipeline.scoring.engine import score_job, score_jobs
 
 
 def test_freshness_and_flags() -> None:
@@ -18,3 +20,61 @@ def test_freshness_and_flags() -> None:
     j = score_job(j, p)
     assert "clearance" in j.flags
     assert j.fit_grade in {"C", "D"}
+
+
+def test_score_jobs_matches_score_job() -> None:
+    p = SearchProfile(
+        "d", ["Network Engineer"], ["NOC"], "Remote", None, None, "1-3",
+        ["TCP IP", "bgp", "", "ospf"], ["paloalto", "python", "ad"], [], 24,
+    )
+    descriptions = [
+        "bgp and ospf, python. 5+ years required",
+        "tcp/ip, palo alto, contract c2c, on-site; 2 years",
+        "US Citizen only with Top Secret clearance, active directory",
+        "",
+    ]
+    rows = [
+        ("Senior Network Engineer", d, loc, posted)
+        for d in descriptions
+        for loc in ("Remote - US", "Austin, TX")
+        for posted in (None, datetime.utcnow().isoformat(), "2001-01-01T00:00:00Z", "not a date")
+    ]
+
+    def make(row):
+        title, desc, loc, posted = row
+        return JobRecord.from_link(
+            JobLink("https://x", "s", "d", {}), title=title, description_raw=desc, location_text=loc, posted_date=posted
+        )
+
+    fields = lambda j: (j.fit_score, j.fit_grade, j.missing_must_have, j.flags, j.fit_notes)
+    expected = [fields(score_job(make(r), p)) for r in rows]
+    assert [fields(j) for j in score_jobs([make(r) for r in rows], p)] == expected
+
+
+def test_relevance_blend_and_incremental_idf(tmp_path) -> None:
+    pytest.importorskip("numpy")
+    from jobpipeline.scoring.relevance import RelevanceScorer
+    from jobpipeline.storage.sqlite_repo import SQLiteRepo
+
+    p = SearchProfile("d", ["Network Engineer"], [], "Remote", None, None, "1-3", ["bgp"], ["ospf"], [], 24)
+    make = lambda i, title, desc: JobRecord.from_link(
+        JobLink(f"https://x/{i}", "s", "d", {}), title=title, description_raw=desc
+    )
+    jobs = [
+        make(1, "Network Engineer", "bgp ospf routing for our backbone network"),
+        make(2, "Pastry Chef", "laminated doughs and croissants every morning"),
+    ]
+    repo = SQLiteRepo(str(tmp_path / "db.sqlite"))
+    scorer = RelevanceScorer(repo, weight=0.5)
+    sims = scorer.similarities(scorer.matrix(jobs), p)
+    assert sims[0] > 0.3 and sims[1] == 0
+    assert repo.document_frequencies(["bgp", "pastry"]) == (2, {"bgp": 1, "pastry": 1})
+
+    scorer.matrix(jobs + [make(3, "NOC Engineer", "bgp on call")])
+    assert repo.document_frequencies(["bgp"]) == (3, {"bgp": 2})
+
+    for j in jobs:
+        j.fit_score, j.flags = 60, []
+    scorer.blend(jobs, sims)
+    assert jobs[0].fit_score > jobs[1].fit_score == 30
+    assert "relevance=" in jobs[0].fit_notes
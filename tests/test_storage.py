@@ -0,0 +1,139 @@
+import pytest
+
+from jobpipeline.core.models import JobLink, JobRecord
+from jobpipeline.storage.sqlite_repo import SQLiteRepo
+
+
+def job(title: str = "Network Engineer", source: str = "Remote OK API") -> JobRecord:
+    return JobRecord.from_link(JobLink("https://x/1", source, "remoteok.com", {}), title=title, company="ACME")
+
+
+def test_bulk_upsert_preserves_user_columns_and_counts_reposts(tmp_path) -> None:
+    repo = SQLiteRepo(str(tmp_path / "db.sqlite"))
+    first = job()
+    assert repo.upsert_jobs([first]) == 1
+    repo.conn.execute("UPDATE jobs SET user_status='Applied', user_notes='called', first_seen='2020-01-01'")
+    repo.conn.commit()
+
+    again = job(source="Remote OK API,Remotive API")
+    again.fit_score = 77
+    repo.upsert_jobs([again])
+    row = repo.conn.execute(
+        "SELECT user_status, user_notes, first_seen, repost_count, fit_score FROM jobs WHERE job_id=?", (first.job_id,)
+    ).fetchone()
+    assert row == ("Applied", "called", "2020-01-01", 0, 77)
+    sources = repo.conn.execute("SELECT source_name FROM job_sources_seen ORDER BY source_name").fetchall()
+    assert sources == [("Remote OK API",), ("Remotive API",)]
+    assert repo.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    # the same posting twice in a batch or on a --full re-run is not a repost
+    repo.upsert_jobs([job(), job()])
+    repo.upsert_jobs([job()])
+    count = "SELECT repost_count FROM jobs WHERE job_id=?"
+    assert repo.conn.execute(count, (first.job_id,)).fetchone() == (0,)
+
+    reposted = job()
+    reposted.posted_date, reposted.last_seen = "2030-01-01T00:00:00", "2030-01-01T00:00:00"
+    repo.upsert_jobs([reposted, reposted])
+    assert repo.conn.execute(count, (first.job_id,)).fetchone() == (1,)
+
+
+def test_descriptions_are_shared_compressed_blobs(tmp_path) -> None:
+    repo = SQLiteRepo(str(tmp_path / "db.sqlite"))
+    text = "Run BGP and OSPF across the backbone. " * 200
+    a = JobRecord.from_link(JobLink("https://x/1", "A", "a.com", {}), title="NOC", description_raw=text)
+    b = JobRecord.from_link(JobLink("https://y/2", "B", "b.com", {}), title="NOC", description_raw=text)
+    repo.upsert_jobs([a, b])
+    assert repo.conn.execute("SELECT refs, raw_size > length(body) FROM description_blobs").fetchall() == [(2, 1)]
+    assert repo.descriptions([a.job_id, b.job_id]) == {a.job_id: text, b.job_id: text}
+
+    b.description_raw = "Updated posting"
+    repo.upsert_jobs([b])
+    repo.upsert_jobs([b])
+    assert sorted(r[0] for r in repo.conn.execute("SELECT refs FROM description_blobs")) == [1, 1]
+    a.description_raw = ""
+    repo.upsert_jobs([a])
+    assert repo.conn.execute("SELECT COUNT(*) FROM description_blobs").fetchone()[0] == 1
+    assert repo.description(a.job_id) == "" and repo.description(b.job_id) == "Updated posting"
+
+
+def test_inline_descriptions_move_to_blobs_on_open(tmp_path) -> None:
+    path = str(tmp_path / "db.sqlite")
+    repo = SQLiteRepo(path)
+    repo.upsert_jobs([job()])
+    repo.conn.execute("UPDATE jobs SET description_hash=NULL, description_raw='old inline text'")
+    repo.conn.commit()
+    repo.close()
+
+    reopened = SQLiteRepo(path)
+    assert reopened.conn.execute("SELECT description_raw FROM jobs").fetchone() == (None,)
+    assert reopened.description(job().job_id) == "old inline text"
+
+
+def test_blobs_default_to_zlib_and_record_utf8_sizes(tmp_path) -> None:
+    text = "Ingénieur réseau – São Paulo"
+    repo = SQLiteRepo.from_config({"storage": {"sqlite_path": str(tmp_path / "db.sqlite")}})
+    repo.upsert_jobs([JobRecord.from_link(JobLink("https://x/1", "A", "a.com", {}), title="NOC", description_raw=text)])
+    assert repo.conn.execute("SELECT codec, raw_size FROM description_blobs").fetchall() == [("zlib", len(text.encode()))]
+    with pytest.raises(ValueError, match="unknown blob codec"):
+        SQLiteRepo.from_config({"storage": {"sqlite_path": str(tmp_path / "other.sqlite"), "description_codec": "lz4"}})
+
+
+def test_full_text_search_ranks_highlights_and_follows_updates(tmp_path) -> None:
+    from jobpipeline.storage.filters import JobFilter
+    from jobpipeline.storage.sqlite_repo import fts_query
+
+    path = str(tmp_path / "db.sqlite")
+    repo = SQLiteRepo(path)
+    title_hit = JobRecord.from_link(JobLink("https://x/1", "A", "a.com", {}), title="Network Engineer", company="ACME",
+                                    description_raw="Keep the lights on.")
+    body_hit = JobRecord.from_link(JobLink("https://x/2", "A", "a.com", {}), title="Support Analyst", company="Initech",
+                                   description_raw="Some network troubleshooting with BGP and OSPF on call.")
+    body_hit.fit_grade = "B"
+    repo.upsert_jobs([title_hit, body_hit])
+
+    hits = repo.search("network")
+    assert [h.job_id for h in hits] == [title_hit.job_id, body_hit.job_id]
+    assert hits[0].title_marked == "[Network] Engineer" and "[network]" in hits[1].snippet
+    assert [h.job_id for h in repo.search("netw", JobFilter(grades=["B"]))] == [body_hit.job_id]
+    assert fts_query("noc eng") == '"noc" "eng"*'
+    assert fts_query('c++ "exact phrase"', syntax=True) == 'c++ "exact phrase"'
+
+    body_hit.description_raw = "Now a pure helpdesk role."
+    repo.upsert_jobs([body_hit])
+    assert [h.job_id for h in repo.search("ospf")] == [] and len(repo.search("helpdesk")) == 1
+
+    repo.conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('delete-all')")
+    repo.conn.commit()
+    repo.close()
+    assert len(SQLiteRepo(path).search("helpdesk OR engineer", syntax=True)) == 2
+
+
+@pytest.mark.parametrize("text", ["Portland, OR", "c++ (senior)", "engineer:", '"unterminated', "NOT", "*", "a AND"])
+def test_search_input_is_never_parsed_as_fts_syntax(tmp_path, text: str) -> None:
+    repo = SQLiteRepo(str(tmp_path / "db.sqlite"))
+    link = JobLink("https://x/1", "A", "a.com", {})
+    repo.upsert_jobs([JobRecord.from_link(link, title="Senior C++ Engineer", location_text="Portland, OR")])
+    repo.search(text)
+    repo.page_jobs(["title"], search=text)
+    assert repo.count_jobs(text) == len(repo.page_jobs(["title"], search=text))
+
+
+def test_fts_syntax_errors_are_reported(tmp_path) -> None:
+    repo = SQLiteRepo(str(tmp_path / "db.sqlite"))
+    link = JobLink("https://x/1", "A", "a.com", {})
+    repo.upsert_jobs([JobRecord.from_link(link, title="NOC Engineer", location_text="Portland, OR")])
+    assert [h.title for h in repo.search("Portland, OR")] == ["NOC Engineer"]
+    with pytest.raises(ValueError, match="invalid full-text query"):
+        repo.search('"unterminated', syntax=True)
+
+
+def test_failed_links_are_given_up_after_max_attempts(tmp_path) -> None:
+    repo = SQLiteRepo(str(tmp_path / "db.sqlite"))
+    row = ("https://x/1", "Remote OK API", "remoteok.com", "{}", "remoteok_api")
+    for _ in range(2):
+        repo.remember_failed([row], "2024-01-01", max_attempts=3)
+    assert repo.failed_links(["remoteok_api"]) == [row]
+    assert repo.failed_links(["remotive_api"]) == []
+    repo.remember_failed([row], "2024-01-02", max_attempts=3)
+    assert repo.failed_links() == []
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from jobpipeline.sources.http import RetryingTransport
+from jobpipeline.utils.throttle import DomainThrottle, retry_after_seconds
+
+
+def test_bucket_allows_a_burst_then_paces_and_backs_off() -> None:
+    throttle = DomainThrottle(0.1, burst=3)
+    delays = [throttle.reserve("a") for _ in range(4)]
+    assert delays[:3] == [0.0, 0.0, 0.0] and 0.09 < delays[3] <= 0.1
+    assert throttle.reserve("b") == 0.0
+
+    assert throttle.backoff("a", retry_after=2.0) == 2.0
+    assert throttle.backoff("a", retry_after=600) is None
+    # the pause is followed by paced requests, not a fresh burst
+    first, second = throttle.reserve("a"), throttle.reserve("a")
+    assert 1.9 < first <= 2.0 and second - first > 0.09
+    m = throttle.metrics()["a"]
+    assert (m.requests, m.throttled) == (6, 1) and m.max_wait_seconds == second
+
+
+def test_retry_after_accepts_seconds_and_http_dates() -> None:
+    assert retry_after_seconds("7") == 7.0
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < retry_after_seconds(later) <= 30
+    assert retry_after_seconds("soon") is None and retry_after_seconds(None) is None
+
+
+def test_429_backs_off_the_domain_and_gives_up_on_long_retry_after() -> None:
+    answers = [httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200, text="ok")]
+    throttle = DomainThrottle(0)
+    transport = RetryingTransport(httpx.MockTransport(lambda r: answers.pop(0)), 2, 0, throttle)
+
+    async def get(url: str) -> httpx.Response:
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.get(url)
+
+    assert asyncio.run(get("https://x.test/1")).status_code == 200
+    assert throttle.metrics()["x.test"].throttled == 1
+
+    answers[:] = [httpx.Response(503, headers={"Retry-After": "3600"}), httpx.Response(200)]
+    assert asyncio.run(get("https://x.test/2")).status_code == 503
+    assert len(answers) == 1
+
+
+def test_slow_request_is_hedged_past_the_domain_p95() -> None:
+    throttle = DomainThrottle(0, hedge_min_samples=5, hedge_budget=1.0)
+    for _ in range(5):
+        throttle.record("x.test", 0.02)
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, text=str(calls))
+
+    async def get() -> httpx.Response:
+        transport = RetryingTransport(httpx.MockTransport(handler), 0, 0, throttle)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.get("https://x.test/slow")
+
+    start = time.perf_counter()
+    response = asyncio.run(get())
+    assert time.perf_counter() - start < 1
+    assert response.text == "2"
+    m = throttle.metrics()["x.test"]
+    assert (m.hedged, m.hedge_wins) == (1, 1)
+
+
+def test_time_queued_on_the_bucket_is_neither_latency_nor_a_hedge_trigger() -> None:
+    throttle = DomainThrottle(0.3, hedge_min_samples=5, hedge_budget=1.0)
+    for _ in range(5):
+        throttle.record("x.test", 0.02)
+    throttle.reserve("x.test")
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200)
+
+    async def get() -> httpx.Response:
+        transport = RetryingTransport(httpx.MockTransport(handler), 0, 0, throttle)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.get("https://x.test/queued")
+
+    assert asyncio.run(get()).status_code == 200
+    m = throttle.metrics()["x.test"]
+    assert calls == 1 and m.hedged == 0 and m.waited_seconds > 0.25
+    assert m.p95_seconds < 0.1
+
+
+def test_hedges_wait_for_a_per_host_slot() -> None:
+    from jobpipeline.sources.http import DomainLimitedTransport, HostSlots
+
+    throttle = DomainThrottle(0, hedge_min_samples=5, hedge_budget=1.0)
+    for _ in range(5):
+        throttle.record("x.test", 0.02)
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.3)
+        return httpx.Response(200, text=str(calls))
+
+    async def get() -> httpx.Response:
+        slots = HostSlots(1)
+        retrying = RetryingTransport(httpx.MockTransport(handler), 0, 0, throttle, slots)
+        async with httpx.AsyncClient(transport=DomainLimitedTransport(retrying, slots)) as client:
+            return await client.get("https://x.test/one-slot")
+
+    assert asyncio.run(get()).text == "1"
+    m = throttle.metrics()["x.test"]
+    assert calls == 1 and (m.hedged, m.hedge_wins) == (1, 0)
@@ -0,0 +1,39 @@
+from jobpipeline.utils.urls import canonicalize_url
+
+
+def test_tracking_params_and_trailing_slash_are_dropped() -> None:
+    a = canonicalize_url("http://www.example.com/jobs/42/?utm_source=x&fbclid=y&b=2&a=1")
+    b = canonicalize_url("https://example.com/jobs/42?a=1&b=2#apply")
+    assert a == b
+    assert a.url == "https://example.com/jobs/42?a=1&b=2"
+
+
+def test_generic_params_are_kept_outside_known_tracking_hosts() -> None:
+    board = "https://jobs.example.com/view?source=acme&sid=17"
+    assert canonicalize_url(board).url == "https://jobs.example.com/view?sid=17&source=acme"
+    assert canonicalize_url(board).key != canonicalize_url("https://jobs.example.com/view?source=globex&sid=17").key
+    assert canonicalize_url("https://apply.workable.com/acme/j/AB12CD/?ref=feed&source=x").url == (
+        "https://apply.workable.com/acme/j/AB12CD"
+    )
+
+
+def test_ats_job_ids_become_keys() -> None:
+    greenhouse = [
+        "https://boards.greenhouse.io/acme/jobs/123?gh_src=li",
+        "https://job-boards.greenhouse.io/acme/jobs/123/",
+        "https://careers.acme.com/open-roles?gh_jid=123",
+    ]
+    assert {canonicalize_url(u).key for u in greenhouse} == {"greenhouse:123"}
+    lever = "https://jobs.lever.co/acme/1B2C3D4E-1111-2222-3333-444455556666"
+    assert canonicalize_url(lever + "/apply?lever-source=LinkedIn").url == lever
+    assert canonicalize_url(lever).key == "lever:1b2c3d4e-1111-2222-3333-444455556666"
+    assert canonicalize_url("https://remoteok.com/remote-jobs/noc-engineer-acme-104233?ref=rss").key == "remoteok:104233"
+
+
+def test_look_alike_hosts_get_no_host_rules() -> None:
+    uuid = "1B2C3D4E-1111-2222-3333-444455556666"
+    clever = canonicalize_url(f"https://clever.co/acme/{uuid}/apply?team=noc")
+    assert clever.url == f"https://clever.co/acme/{uuid}/apply?team=noc"
+    assert clever.key == clever.url
+    assert canonicalize_url("https://notremoteok.com/remote-jobs/noc-104233?page=2").key.endswith("?page=2")
+    assert canonicalize_url("https://myworkable.com/view?source=acme").url == "https://myworkable.com/view?source=acme"